@@ -0,0 +1,150 @@
+"""Deteksi halaman kosong dan duplikat untuk hasil scan.
+
+Setiap halaman dirender kecil (ANALYSIS_DPI, grayscale) di proses worker lalu diringkas
+dengan NumPy menjadi dua nilai murah:
+
+- cakupan tinta: bagian piksel (di luar tepi kertas) yang jelas lebih gelap dari warna kertas;
+  halaman di bawah BLANK_INK dianggap kosong.
+- dua hash perseptual (pHash): tanda koefisien DCT frekuensi rendah terhadap mediannya.
+  Hash kasar (144 bit, grid 32x32) menangkap tata letak halaman; hash detail (1023 bit,
+  grid 128x128) membedakan halaman yang tata letaknya sama tetapi isinya lain (mis. dua
+  halaman teks penuh). Dua scan dari lembar yang sama hanya berbeda sedikit bit walau
+  noise, kompresi dan posisinya sedikit berbeda.
+
+Hash kasar semua pasangan halaman dibandingkan dengan XOR + popcount pada kata uint64
+(10.000 halaman = 50 juta pasangan, sekitar satu detik); hanya pasangan yang dekat yang
+hash detailnya diperiksa. Pasangan dianggap duplikat bila kedua hash dekat.
+"""
+import numpy as np
+
+import fitz  # PyMuPDF
+
+from pdf_render import get_worker_document
+
+ANALYSIS_DPI = 36
+EDGE_MARGIN = 0.05      # Bagian tepi halaman yang diabaikan (bayangan/tepi scanner)
+INK_CONTRAST = 48       # Piksel dihitung tinta bila lebih gelap sebanyak ini dari warna kertas
+BLANK_INK = 0.002       # Cakupan tinta maksimum halaman kosong
+HASH_GRID, HASH_SIZE = 32, 12        # Hash kasar: grid rata-rata blok dan koefisien DCT HASH_SIZE x HASH_SIZE (tanpa DC)
+DETAIL_GRID, DETAIL_SIZE = 128, 32   # Hash detail
+DUPLICATE_BITS = 24     # Jarak Hamming maksimum hash kasar dua halaman duplikat (dari 144 bit)
+DETAIL_BITS = 220       # Jarak Hamming maksimum hash detail dua halaman duplikat (dari 1024 bit)
+COMPARE_BLOCK = 256     # Baris hash kasar yang dibandingkan dengan semua halaman sekaligus
+VERIFY_CHUNK = 65536    # Kandidat yang hash detailnya diperiksa sekaligus
+CHUNK_PAGES = 128       # Halaman per tugas analisis yang dikirim ke satu worker
+MEMORY_CHUNK_PAGES = 8  # Halaman per tugas di thread dokumen; render memegang GIL, jadi thread Tk menunggu selama satu tugas
+
+_BITS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _dct_matrix(grid, size):
+    k = np.arange(grid)
+    return np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * grid))[:size]
+
+
+_DCT = _dct_matrix(HASH_GRID, HASH_SIZE)
+_DETAIL_DCT = _dct_matrix(DETAIL_GRID, DETAIL_SIZE)
+
+
+def _block_means(gray, rows, cols):
+    """Rata-rata kecerahan per blok grid rows x cols (ukuran blok boleh tidak sama)."""
+    scale = -(-max(rows, cols) // max(1, min(gray.shape)))
+    if scale > 1: gray = gray.repeat(scale, axis=0).repeat(scale, axis=1)
+    r = np.linspace(0, gray.shape[0], rows + 1).astype(int)
+    c = np.linspace(0, gray.shape[1], cols + 1).astype(int)
+    sums = np.add.reduceat(np.add.reduceat(gray.astype(np.int64), r[:-1], axis=0), c[:-1], axis=1)
+    return sums / np.outer(np.diff(r), np.diff(c))
+
+
+def ink_coverage(gray):
+    h, w = gray.shape
+    my, mx = int(h * EDGE_MARGIN), int(w * EDGE_MARGIN)
+    inner = gray[my:h - my or None, mx:w - mx or None]
+    paper = np.percentile(inner, 90)
+    return float(np.count_nonzero(inner < paper - INK_CONTRAST)) / inner.size
+
+
+def phash(gray, dct=_DCT):
+    """Koefisien DCT frekuensi rendah di atas median sebagai bit (tanpa DC, bit terakhir selalu 0)."""
+    grid = dct.shape[1]
+    coefficients = (dct @ _block_means(gray, grid, grid) @ dct.T).ravel()[1:]
+    return np.packbits(np.r_[coefficients > np.median(coefficients), False]).tobytes()
+
+
+def page_signature(page):
+    """(cakupan tinta, hash kasar, hash detail) sebuah halaman."""
+    zoom = ANALYSIS_DPI / 72
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+    gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+    return ink_coverage(gray), phash(gray), phash(gray, _DETAIL_DCT)
+
+
+def analyze_pages(path, tasks):
+    """Dijalankan di proses worker. `tasks` berisi (pno, rotation); hasil: signature per tugas, None bila gagal."""
+    doc = get_worker_document(path)
+    results = []
+    for pno, rotation in tasks:
+        try:
+            page = doc[pno]
+            if page.rotation != rotation: page.set_rotation(rotation)
+            results.append(page_signature(page))
+        except Exception as e:
+            print(f"Gagal menganalisis halaman {pno + 1}: {e}")
+            results.append(None)
+    return results
+
+
+def _popcount(words):
+    if hasattr(np, "bitwise_count"): return np.bitwise_count(words)  # NumPy >= 2.0
+    return _BITS[words.view(np.uint8)].reshape(words.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+def _as_words(hashes):
+    """Hash (bytes) sebagai matriks uint64, satu baris per halaman; sisa byte diisi nol."""
+    size = -(-max(len(h) for h in hashes) // 8) * 8
+    return np.frombuffer(b"".join(h.ljust(size, b"\0") for h in hashes), dtype=np.uint64).reshape(len(hashes), -1)
+
+
+def _duplicate_pairs(coarse, detail, max_bits, detail_bits):
+    """Semua pasangan (a, b), a < b, yang jarak hash kasar <= max_bits dan hash detail <= detail_bits.
+
+    Dibandingkan per blok baris, dan hash detail per potongan kandidat, agar memori tetap terbatas
+    walau hampir semua halaman mirip (mis. ribuan halaman teks penuh).
+    """
+    n = len(coarse)
+    found_a, found_b = [], []
+    for start in range(0, n, COMPARE_BLOCK):
+        rows = coarse[start:start + COMPARE_BLOCK]
+        distance = _popcount(rows[:, None, 0] ^ coarse[None, start:, 0]).astype(np.uint16)
+        for k in range(1, coarse.shape[1]): distance += _popcount(rows[:, None, k] ^ coarse[None, start:, k])
+        a, b = np.nonzero(distance <= max_bits)
+        above = a < b  # Diagonal dan pasangan terbalik di dalam blok
+        a, b = a[above] + start, b[above] + start
+        for first in range(0, len(a), VERIFY_CHUNK):
+            ca, cb = a[first:first + VERIFY_CHUNK], b[first:first + VERIFY_CHUNK]
+            close = _popcount(detail[ca] ^ detail[cb]).sum(axis=1) <= detail_bits
+            found_a.append(ca[close])
+            found_b.append(cb[close])
+    if not found_a: return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(found_a), np.concatenate(found_b)
+
+
+def find_blank_and_duplicates(signatures, blank_ink=BLANK_INK, max_bits=DUPLICATE_BITS, detail_bits=DETAIL_BITS):
+    """Mengelompokkan halaman dari daftar signature (None = tidak dianalisis).
+
+    Mengembalikan (kosong, duplikat): daftar index halaman kosong dan dict index duplikat ->
+    index halaman pertama yang isinya sama. Halaman kosong tidak ikut dibandingkan.
+    """
+    valid = np.array([i for i, signature in enumerate(signatures) if signature is not None], dtype=np.int64)
+    if not len(valid): return [], {}
+    inks = np.array([signatures[i][0] for i in valid])
+    blank_mask = inks < blank_ink
+    blank = valid[blank_mask].tolist()
+    content = valid[~blank_mask]
+    duplicates = {}
+    if len(content) < 2: return blank, duplicates
+    a, b = _duplicate_pairs(_as_words([signatures[i][1] for i in content]), _as_words([signatures[i][2] for i in content]), max_bits, detail_bits)
+    # Urut menurut halaman kedua agar setiap duplikat menunjuk ke halaman pertama di kelompoknya.
+    for j, i in sorted(zip(content[b].tolist(), content[a].tolist())):
+        if j not in duplicates: duplicates[j] = duplicates.get(i, i)
+    return blank, duplicates
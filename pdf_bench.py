@@ -0,0 +1,295 @@
+"""Benchmark jalur utama PDF Editor Pro tanpa GUI.
+
+Contoh:
+    python pdf_bench.py                                   # teks/vektor/gambar, 10-1000 halaman
+    python pdf_bench.py --sizes 10 10000 --kinds text -o hasil.json
+    python pdf_bench.py --baseline baseline.json --tolerance 0.15
+
+PDF sintetis (teks padat, grafik vektor, halaman hasil scan) dibuat secara deterministik
+di folder kerja dan dipakai ulang antar-run. Setiap operasi dijalankan di proses baru agar
+puncak RSS yang dicatat hanya milik operasi itu. Operasi memakai fungsi yang sama dengan
+GUI: buka dokumen (`open_pdf`), render thumbnail, impor gambar (`add_pages_from_images`),
+hapus rentang + urungkan, putar, pindah, dan simpan penuh maupun inkremental (`_save_worker`).
+
+Hasil (halaman/s, persentil latensi, puncak RSS) ditulis ke JSON. Dengan --baseline,
+hasil dibandingkan dengan file JSON sebelumnya dan exit code 1 bila ada regresi.
+"""
+import io
+import os
+import math
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import multiprocessing
+
+import fitz  # PyMuPDF
+from PIL import Image, ImageDraw, ImageFilter
+
+import pdf_core
+from pdf_model import PageModel
+from pdf_history import MovePages, RemovePages, RotatePages
+from pdf_memory import peak_process_memory
+from pdf_render import THUMB_SIZE, render_thumbnail
+
+GENERATOR_VERSION = 1
+KINDS = ("text", "vector", "image")
+DEFAULT_SIZES = (10, 100, 1000)
+OPERATIONS = ("open", "render", "images", "delete", "undo_delete", "rotate", "move", "save", "save_incremental")
+RENDER_SAMPLE = 60       # Halaman yang dirender per dokumen, diambil merata dari seluruh dokumen
+IMAGE_COUNT = 8          # Gambar yang diimpor per run operasi "images"
+IMAGE_POOL = 12          # Gambar scan berbeda yang dipakai bergantian di PDF "image"
+WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore "
+         "et dolore magna aliqua faktur tanggal jumlah harga pelanggan nomor alamat total pajak").split()
+
+
+def _scan_image(rng, size=(1240, 1754)):
+    """Gambar mirip hasil scan (kertas keabuan, blok teks, noda) sebagai JPEG."""
+    img = Image.new("L", size, rng.randint(225, 245))
+    draw = ImageDraw.Draw(img)
+    for _ in range(rng.randint(30, 60)):
+        x, y = rng.randint(80, size[0] - 400), rng.randint(80, size[1] - 40)
+        draw.rectangle((x, y, x + rng.randint(100, 380), y + rng.randint(6, 14)), fill=rng.randint(20, 90))
+    img = img.filter(ImageFilter.GaussianBlur(1))
+    out = io.BytesIO()
+    img.convert("RGB").save(out, "JPEG", quality=80)
+    return out.getvalue()
+
+
+def _text_page(page, rng):
+    lines = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 14))) for _ in range(55)]
+    page.insert_textbox(page.rect + (50, 50, -50, -50), "\n".join(lines), fontsize=9, fontname="helv")
+
+
+def _vector_page(page, rng):
+    shape = page.new_shape()
+    w, h = page.rect.width, page.rect.height
+    for _ in range(250):
+        p1, p2 = fitz.Point(rng.uniform(0, w), rng.uniform(0, h)), fitz.Point(rng.uniform(0, w), rng.uniform(0, h))
+        if rng.random() < 0.5: shape.draw_line(p1, p2)
+        else: shape.draw_bezier(p1, fitz.Point(rng.uniform(0, w), rng.uniform(0, h)), fitz.Point(rng.uniform(0, w), rng.uniform(0, h)), p2)
+        shape.finish(color=(rng.random(), rng.random(), rng.random()), width=rng.uniform(0.3, 2))
+    shape.commit()
+
+
+def generate_pdf(kind, pages, path, seed=0):
+    """Membuat PDF sintetis `kind` dengan `pages` halaman A4. Isi ditentukan oleh seed, jadi hasilnya sama tiap run."""
+    rng = random.Random(f"{kind}:{pages}:{seed}")
+    with fitz.open() as doc:
+        xrefs = []
+        images = [_scan_image(rng) for _ in range(IMAGE_POOL)] if kind == "image" else []
+        for i in range(pages):
+            page = doc.new_page(width=pdf_core.PAPER_SIZES["A4"][0], height=pdf_core.PAPER_SIZES["A4"][1])
+            if kind == "text": _text_page(page, rng)
+            elif kind == "vector": _vector_page(page, rng)
+            elif len(xrefs) < len(images): xrefs.append(page.insert_image(page.rect, stream=images[len(xrefs)]))
+            else: page.insert_image(page.rect, xref=xrefs[i % len(xrefs)])  # Stream gambar dipakai bersama agar file tetap kecil
+        doc.save(path, garbage=1, deflate=True)
+
+
+def fixture(workdir, kind, pages):
+    """Path PDF sintetis di folder kerja; dibuat sekali lalu dipakai ulang."""
+    path = os.path.join(workdir, f"{kind}_{pages}_v{GENERATOR_VERSION}.pdf")
+    if not os.path.exists(path):
+        tmp_path = path + ".tmp"
+        generate_pdf(kind, pages, tmp_path)
+        os.replace(tmp_path, path)
+    return path
+
+
+def image_fixtures(workdir):
+    paths = []
+    rng = random.Random(f"images:{GENERATOR_VERSION}")
+    for i in range(IMAGE_COUNT):
+        path = os.path.join(workdir, f"foto_{i}_v{GENERATOR_VERSION}.jpg")
+        if not os.path.exists(path):
+            with open(path, "wb") as f: f.write(_scan_image(rng, (2480, 3508)))
+        paths.append(path)
+    return paths
+
+
+def percentile(values, q):
+    """Persentil nearest-rank dari daftar nilai (q dalam 0-100)."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def _open_with_model(path):
+    doc = pdf_core.open_document(path)
+    return doc, PageModel([(path, i, doc.page_xref(i)) for i in range(len(doc))])
+
+
+def _bench_open(path, workdir):
+    started = time.perf_counter()
+    doc, _ = _open_with_model(path)
+    seconds = time.perf_counter() - started
+    pages = len(doc)
+    doc.close()
+    return pages, [seconds]
+
+
+def _bench_render(path, workdir):
+    with pdf_core.open_document(path) as doc:
+        step = max(1, len(doc) // RENDER_SAMPLE)
+        latencies = [_timed(render_thumbnail, doc[i], THUMB_SIZE) for i in range(0, len(doc), step)[:RENDER_SAMPLE]]
+    return len(latencies), latencies
+
+
+def _bench_images(path, workdir):
+    paths = image_fixtures(workdir)
+    dpi, quality = pdf_core.IMAGE_QUALITY_PRESETS[pdf_core.DEFAULT_IMAGE_QUALITY]
+    latencies = []
+    with pdf_core.open_document(path) as doc:
+        for img_path in paths:
+            started = time.perf_counter()
+            prepared = pdf_core.prepare_image(img_path, pdf_core.PAPER_SIZES["A4"], dpi, quality)
+            pdf_core.insert_prepared_image(doc, len(doc), prepared)
+            latencies.append(time.perf_counter() - started)
+    return len(paths), latencies
+
+
+def _edit_op(doc):
+    count = len(doc)
+    return {"delete": RemovePages(range(count // 4, count // 4 + max(1, count // 2))),
+            "rotate": RotatePages(range(count), 90),
+            "move": MovePages(0, max(1, count // 2), count - max(1, count // 2))}
+
+
+def _bench_edit(name):
+    def bench(path, workdir):
+        doc, pages = _open_with_model(path)
+        with doc, fitz.open() as stash:
+            op = _edit_op(doc)["delete" if name == "undo_delete" else name]
+            items = len(op.indices) if hasattr(op, "indices") else op.count
+            started = time.perf_counter()
+            inverse, _ = op.apply(doc, stash, pages)
+            if name == "undo_delete":
+                started = time.perf_counter()
+                inverse.apply(doc, stash, pages)
+            return items, [time.perf_counter() - started]
+    return bench
+
+
+def _bench_save(path, workdir):
+    out_path = os.path.join(workdir, "simpan_penuh.pdf")
+    with pdf_core.open_document(path) as doc:
+        pdf_core.rotate_pages(doc, [0], 90)
+        seconds = _timed(pdf_core.save_document, doc, out_path)
+        pages = len(doc)
+    size = os.path.getsize(out_path)
+    os.remove(out_path)
+    return pages, [seconds], size
+
+
+def _bench_save_incremental(path, workdir):
+    copy_path = os.path.join(workdir, "simpan_inkremental.pdf")
+    shutil.copyfile(path, copy_path)
+    with pdf_core.open_document(copy_path) as doc:
+        pdf_core.rotate_pages(doc, [0], 90)
+        seconds = _timed(pdf_core.save_document, doc, copy_path)
+        pages = len(doc)
+    size = os.path.getsize(copy_path) - os.path.getsize(path)
+    os.remove(copy_path)
+    return pages, [seconds], size
+
+
+BENCHMARKS = {"open": _bench_open, "render": _bench_render, "images": _bench_images,
+              "delete": _bench_edit("delete"), "undo_delete": _bench_edit("undo_delete"),
+              "rotate": _bench_edit("rotate"), "move": _bench_edit("move"),
+              "save": _bench_save, "save_incremental": _bench_save_incremental}
+
+
+def run_case(kind, pages, op, workdir, repeat):
+    """Dijalankan di proses baru: mengukur satu operasi `repeat` kali pada satu PDF sintetis."""
+    path = fixture(workdir, kind, pages)
+    items = written = 0
+    latencies, total = [], 0.0
+    for _ in range(repeat):
+        result = BENCHMARKS[op](path, workdir)
+        items += result[0]
+        latencies += result[1]
+        total += sum(result[1])
+        if len(result) > 2: written += result[2]
+    total = max(total, 1e-9)
+    record = {"kind": kind, "pages": pages, "op": op, "repeat": repeat, "items": items, "seconds": round(total, 6),
+              "items_per_s": round(items / total, 2),
+              "p50_ms": round(percentile(latencies, 50) * 1000, 3), "p90_ms": round(percentile(latencies, 90) * 1000, 3),
+              "p99_ms": round(percentile(latencies, 99) * 1000, 3)}
+    if written: record["mb_per_s"] = round(written / 1e6 / total, 2)
+    peak = peak_process_memory()
+    if peak is not None: record["peak_rss_mb"] = round(peak / 1e6, 1)
+    return record
+
+
+def compare(results, baseline, tolerance):
+    """Membandingkan throughput dan puncak RSS dengan baseline; mengembalikan daftar regresi (teks)."""
+    previous = {(r["kind"], r["pages"], r["op"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        old = previous.get((r["kind"], r["pages"], r["op"]))
+        if not old: continue
+        name = f"{r['op']} {r['kind']}/{r['pages']}"
+        ratio = r["items_per_s"] / max(old["items_per_s"], 1e-9)
+        print(f"  {name:32s} {old['items_per_s']:10.1f} -> {r['items_per_s']:10.1f} /s  ({(ratio - 1) * 100:+6.1f}%)")
+        if ratio < 1 - tolerance: regressions.append(f"{name}: throughput turun {(1 - ratio) * 100:.1f}%")
+        if "peak_rss_mb" in r and "peak_rss_mb" in old and r["peak_rss_mb"] > old["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(f"{name}: puncak RSS naik {old['peak_rss_mb']:.0f} -> {r['peak_rss_mb']:.0f} MB")
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="PDF Editor Pro - benchmark jalur buka, render, edit dan simpan")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Jumlah halaman PDF sintetis (default: 10 100 1000)")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS), help="Jenis isi PDF sintetis")
+    parser.add_argument("--ops", nargs="+", choices=OPERATIONS, default=list(OPERATIONS), help="Operasi yang diukur")
+    parser.add_argument("--repeat", type=int, default=3, help="Pengulangan tiap operasi (default: 3)")
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "pdf_editor_bench"), help="Folder PDF sintetis (dipakai ulang antar-run)")
+    parser.add_argument("-o", "--output", default="bench_results.json", help="File JSON hasil (default: bench_results.json)")
+    parser.add_argument("--baseline", help="File JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Batas penurunan yang masih diterima, 0.10 = 10%% (default)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    os.makedirs(args.workdir, exist_ok=True)
+    for kind in args.kinds:
+        for pages in args.sizes: fixture(args.workdir, kind, pages)
+    results = []
+    # Proses spawn baru per operasi: puncak RSS tidak terbawa dari operasi sebelumnya dan tidak ada cache hangat.
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for kind in args.kinds:
+            for pages in args.sizes:
+                for op in args.ops:
+                    r = pool.apply(run_case, (kind, pages, op, args.workdir, max(1, args.repeat)))
+                    results.append(r)
+                    print(f"{op:17s} {kind:6s} {pages:6d} hal.  {r['items_per_s']:10.1f} /s  p50 {r['p50_ms']:9.2f} ms  "
+                          f"p99 {r['p99_ms']:9.2f} ms  RSS {r.get('peak_rss_mb', 0):7.1f} MB")
+    meta = {"python": platform.python_version(), "pymupdf": fitz.VersionBind, "platform": platform.platform(),
+            "cpu_count": os.cpu_count(), "generator": GENERATOR_VERSION, "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=1)
+    print(f"Hasil ditulis ke {args.output}")
+    if not args.baseline: return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"Perbandingan dengan {args.baseline}:")
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions: print(f"REGRESI  {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
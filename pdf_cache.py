@@ -0,0 +1,189 @@
+"""Cache thumbnail persisten di disk.
+
+Semua thumbnail disimpan berurutan di satu file pack (`thumbs.pack`) yang dibaca
+lewat mmap, dengan indeks JSON kecil (`thumbs.idx`) yang mencatat offset, ukuran dan
+urutan LRU tiap entri. Kunci entri dibentuk dari sidik jari isi file sumber, xref
+halaman, rotasi dan ukuran render, sehingga dokumen yang sama tetap dikenali walau
+dipindah atau diganti nama.
+
+Satu pack hanya dipakai satu instance aplikasi: pack dikunci lewat file .lock selama
+dipakai, dan instance kedua memakai slot berikutnya (`thumbs1.pack`, ...). Pemadatan
+pack yang menulis ulang file jadi tidak bisa merusak offset milik instance lain.
+"""
+import os
+import json
+import mmap
+import zlib
+import hashlib
+import threading
+from collections import OrderedDict
+
+INDEX_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+FINGERPRINT_SAMPLE = 1 << 20   # Byte yang dibaca dari awal, tengah dan akhir file
+COMPACT_MIN_BYTES = 16 * 1024 * 1024
+MAX_SLOTS = 4                  # Instance aplikasi yang bisa memakai cache bersamaan
+
+
+def default_cache_dir():
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "PDFEditorPro", "thumbs")
+
+
+def file_fingerprint(path):
+    """Sidik jari isi file: ukuran ditambah hash sampel di awal, tengah dan akhir file."""
+    size = os.path.getsize(path)
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    offsets = sorted({0, max(0, size // 2 - FINGERPRINT_SAMPLE // 2), max(0, size - FINGERPRINT_SAMPLE)})
+    with open(path, "rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            digest.update(f.read(FINGERPRINT_SAMPLE))
+    return digest.hexdigest()
+
+
+def thumbnail_key(fingerprint, xref, rotation, size, colorspace="rgb"):
+    return f"{fingerprint}:{xref}:{rotation}:{size[0]}x{size[1]}:{colorspace}"
+
+
+def _try_lock(f):
+    """Mengunci file terbuka secara eksklusif tanpa menunggu; False bila sudah dikunci proses lain."""
+    try:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+class ThumbnailCache:
+    """Cache LRU berukuran terbatas untuk buffer RGB thumbnail. Aman dipakai dari beberapa thread."""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self._slot_lock = None
+        for slot in range(MAX_SLOTS):
+            name = f"thumbs{slot or ''}"
+            lock = open(os.path.join(self.directory, name + ".lock"), "a+b")
+            if _try_lock(lock):
+                self._slot_lock = lock
+                break
+            lock.close()
+        if self._slot_lock is None: raise OSError("Semua slot cache thumbnail sedang dipakai")
+        self.pack_path = os.path.join(self.directory, name + ".pack")
+        self.index_path = os.path.join(self.directory, name + ".idx")
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> [offset, length, width, height]
+        self._live_bytes = 0
+        self._dirty = False
+        self._map = None
+        self._pack = open(self.pack_path, "a+b")
+        self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        if data.get("version") != INDEX_VERSION: return
+        pack_size = os.path.getsize(self.pack_path)
+        for key, offset, length, width, height in data.get("entries", []):
+            # Entri yang menunjuk ke luar file pack (mis. setelah crash) diabaikan.
+            if offset + length <= pack_size:
+                self._entries[key] = [offset, length, width, height]
+                self._live_bytes += length
+
+    def get(self, key):
+        """Mengembalikan (width, height, samples) atau None bila tidak ada di cache."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None: return None
+            self._entries.move_to_end(key)
+            self._dirty = True
+            offset, length, width, height = entry
+            data = self._read(offset, length)
+        try:
+            return width, height, zlib.decompress(data)
+        except zlib.error:
+            self._discard(key, entry)  # Entri rusak (mis. pack terpotong) dianggap tidak ada
+            return None
+
+    def put(self, key, width, height, samples):
+        data = zlib.compress(samples, 1)
+        with self._lock:
+            if self._pack is None or key in self._entries: return
+            self._pack.seek(0, os.SEEK_END)
+            offset = self._pack.tell()
+            self._pack.write(data)
+            self._entries[key] = [offset, len(data), width, height]
+            self._live_bytes += len(data)
+            self._dirty = True
+            self._evict()
+
+    def _discard(self, key, entry):
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+                self._live_bytes -= entry[1]
+                self._dirty = True
+
+    def flush(self):
+        """Menulis indeks ke disk bila ada perubahan."""
+        with self._lock:
+            if not self._dirty or self._pack is None: return
+            self._pack.flush()
+            self._write_index()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._map: self._map.close()
+            if self._pack: self._pack.close()
+            if self._slot_lock: self._slot_lock.close()  # Menutup file juga melepas kuncinya
+            self._map = self._pack = self._slot_lock = None
+
+    def _read(self, offset, length):
+        if self._map is None or offset + length > len(self._map):
+            self._pack.flush()
+            if self._map: self._map.close()
+            self._map = mmap.mmap(self._pack.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map[offset:offset + length]
+
+    def _evict(self):
+        while self._live_bytes > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._live_bytes -= entry[1]
+        pack_size = self._pack.tell()
+        if pack_size > COMPACT_MIN_BYTES and pack_size > 2 * self._live_bytes:
+            self._compact()
+
+    def _compact(self):
+        """Menulis ulang file pack hanya dengan entri yang masih hidup."""
+        tmp_path = self.pack_path + ".tmp"
+        with open(tmp_path, "wb") as out:
+            for entry in self._entries.values():
+                data = self._read(entry[0], entry[1])
+                entry[0] = out.tell()
+                out.write(data)
+        if self._map: self._map.close()
+        self._pack.close()
+        self._map = None
+        os.replace(tmp_path, self.pack_path)
+        self._pack = open(self.pack_path, "a+b")
+        self._write_index()
+
+    def _write_index(self):
+        entries = [[key] + entry for key, entry in self._entries.items()]
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "entries": entries}, f)
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
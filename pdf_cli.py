@@ -0,0 +1,181 @@
+"""Pemrosesan batch PDF tanpa GUI.
+
+Contoh:
+    python pdf_cli.py scan/*.pdf --rotate 90:1-3 --delete 5 --append sampul.pdf -o hasil/
+    python pdf_cli.py *.pdf --keep 1-10 --jobs 8 --suffix _ringkas
+    python pdf_cli.py scan.pdf --split-every 10 -o per_pelanggan/
+    python pdf_cli.py scan.pdf --rotate 270:2,4    # atau --rotate=-90:2,4 (sudut negatif perlu "=")
+
+Operasi dijalankan berurutan sesuai urutan opsi di baris perintah, untuk setiap file
+input secara paralel di process pool. Waktu proses tiap file dilaporkan setelah selesai.
+Mode pisah (--split*) menulis banyak file hasil per input; bagian-bagiannya dibagi ke
+beberapa worker yang masing-masing membuka file sumber sendiri. --optimize juga berlaku
+untuk setiap file hasil pemisahan.
+"""
+import os
+import sys
+import time
+import glob
+import argparse
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pdf_core
+import pdf_optimize
+
+
+class _Operation(argparse.Action):
+    """Menyimpan setiap opsi operasi ke daftar `ops` yang sama agar urutannya terjaga."""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        ops = getattr(namespace, "ops", None) or []
+        ops.append((self.dest, values))
+        namespace.ops = ops
+
+
+def apply_operation(doc, name, value, options):
+    if name == "rotate":
+        angle, _, spec = value.partition(":")
+        if int(angle) % 90: raise ValueError(f"Sudut rotasi harus kelipatan 90: {angle}")
+        indices = pdf_core.parse_page_ranges(spec, len(doc)) if spec else range(len(doc))
+        pdf_core.rotate_pages(doc, indices, int(angle))
+    elif name == "delete":
+        removed = set(pdf_core.parse_page_ranges(value, len(doc)))
+        pdf_core.keep_pages(doc, [i for i in range(len(doc)) if i not in removed])
+    elif name == "keep":
+        pdf_core.keep_pages(doc, pdf_core.parse_page_ranges(value, len(doc)))
+    elif name == "append":
+        pdf_core.insert_pdf(doc, value)
+    elif name == "prepend":
+        pdf_core.insert_pdf(doc, value, 0)
+    elif name == "images":
+        pdf_core.insert_images(doc, value, page_dim=pdf_core.PAPER_SIZES["A4"], dpi=options.get("image_dpi"), quality=options.get("jpeg_quality", 85))
+
+
+def process_file(path, ops, out_path, options=None):
+    """Dijalankan di proses worker: membuka path, menerapkan ops, lalu menyimpan ke out_path.
+
+    Mengembalikan (path, out_path, jumlah halaman, detik).
+    """
+    started = time.perf_counter()
+    with pdf_core.open_document(path) as doc:
+        for name, value in ops: apply_operation(doc, name, value, options or {})
+        if len(doc) == 0: raise ValueError("Semua halaman terhapus, tidak ada yang disimpan")
+        options = options or {}
+        if options.get("optimize"):
+            pages = len(doc)
+            pdf_optimize.optimize_document(doc, out_path, options.get("optimize_dpi"), options.get("jpeg_quality", pdf_optimize.DEFAULT_QUALITY))
+        else:
+            pages = pdf_core.save_document(doc, out_path)
+    return path, out_path, pages, time.perf_counter() - started
+
+
+def output_path(path, output_dir, suffix):
+    name, ext = os.path.splitext(os.path.basename(path))
+    return os.path.join(output_dir or os.path.dirname(path), f"{name}{suffix}{ext or '.pdf'}")
+
+
+def plan_split(path, args):
+    """Rencana file hasil pemisahan untuk satu input: daftar (indices, out_path)."""
+    with pdf_core.open_document(path) as doc:
+        if args.split_every: plan = pdf_core.split_every(len(doc), args.split_every)
+        elif args.split_bookmarks: plan = pdf_core.split_at_bookmarks(doc, args.split_bookmarks)
+        else: plan = pdf_core.split_by_ranges(args.split, len(doc))
+    return [(indices, output_path(path, args.output_dir, f"{args.suffix}_{label}")) for indices, label in plan]
+
+
+def run_split(paths, args, options):
+    """Menjalankan pemisahan semua input paralel dan melaporkan throughput gabungan."""
+    started = time.perf_counter()
+    failed = total_pages = total_bytes = files = 0
+    save = None
+    if options["optimize"]:
+        save = functools.partial(pdf_optimize.optimize_document, dpi=options["optimize_dpi"],
+                                 quality=options.get("jpeg_quality", pdf_optimize.DEFAULT_QUALITY))
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = {}
+        for path in paths:
+            try:
+                parts = plan_split(path, args)
+            except Exception as e:
+                failed += 1
+                print(f"GAGAL  {path}: {e}", file=sys.stderr)
+                continue
+            for chunk in pdf_core.chunk_parts(parts, max(1, args.jobs)):
+                futures[pool.submit(pdf_core.export_parts, path, chunk, False, save)] = path
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"GAGAL  {futures[future]}: {e}", file=sys.stderr)
+                continue
+            for out_path, pages, size in results:
+                files += 1
+                total_pages += pages
+                total_bytes += size
+                print(f"{pages:6d} hal.  {size / 1e6:8.2f} MB  {out_path}")
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(f"Selesai: {files} file, {total_pages} halaman dalam {elapsed:.2f} s "
+          f"({total_pages / elapsed:.1f} hal/s, {total_bytes / 1e6 / elapsed:.1f} MB/s)")
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="PDF Editor Pro - pemrosesan batch tanpa GUI")
+    parser.add_argument("inputs", nargs="+", help="File PDF input (pola glob diperbolehkan)")
+    parser.add_argument("-o", "--output-dir", help="Folder hasil (default: folder file input)")
+    parser.add_argument("--suffix", default="_edit", help="Akhiran nama file hasil (default: _edit)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Jumlah proses paralel")
+    parser.add_argument("--image-dpi", type=int, default=150, help="DPI maksimum gambar yang ditambahkan, 0 = file asli (default: 150)")
+    parser.add_argument("--jpeg-quality", type=int, default=85, help="Kualitas JPEG gambar yang ditambahkan (default: 85)")
+    parser.add_argument("--optimize", action="store_true", help="Optimasi ukuran: perkecil dan kompres ulang gambar, gabungkan duplikat (lebih lambat)")
+    parser.add_argument("--optimize-dpi", type=int, default=pdf_optimize.DEFAULT_DPI, help="DPI maksimum gambar saat --optimize, 0 = tidak diperkecil (default: 150)")
+    split = parser.add_argument_group("pisah (tidak bisa digabung dengan operasi)").add_mutually_exclusive_group()
+    split.add_argument("--split-every", type=int, metavar="N", help="Pisah menjadi file berisi N halaman")
+    split.add_argument("--split-bookmarks", type=int, nargs="?", const=1, metavar="LEVEL", help="Pisah di setiap bookmark (default level 1)")
+    split.add_argument("--split", action="append", metavar="HAL", help="Satu file hasil per rentang, mis. --split 1-3 --split 4-9,12")
+    ops = parser.add_argument_group("operasi (dijalankan sesuai urutan)")
+    ops.add_argument("--rotate", action=_Operation, metavar="SUDUT[:HAL]", help="Putar halaman searah jarum jam, mis. 90 atau 270:1-3,5; sudut negatif ditulis --rotate=-90:1-3")
+    ops.add_argument("--delete", action=_Operation, metavar="HAL", help="Hapus halaman, mis. 2,4-6")
+    ops.add_argument("--keep", action=_Operation, metavar="HAL", help="Sisakan hanya halaman ini (juga mengurutkan ulang)")
+    ops.add_argument("--append", action=_Operation, metavar="PDF", help="Tambahkan PDF lain di akhir")
+    ops.add_argument("--prepend", action=_Operation, metavar="PDF", help="Tambahkan PDF lain di awal")
+    ops.add_argument("--images", action=_Operation, nargs="+", metavar="GAMBAR", help="Tambahkan gambar sebagai halaman A4 di akhir")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    ops = getattr(args, "ops", None) or []
+    splitting = args.split_every or args.split_bookmarks or args.split
+    if splitting and ops: parser.error("opsi --split* tidak bisa digabung dengan operasi halaman")
+    options = {"image_dpi": args.image_dpi or None, "jpeg_quality": args.jpeg_quality, "optimize": args.optimize,
+               "optimize_dpi": args.optimize_dpi or None}
+    paths = [p for pattern in args.inputs for p in (sorted(glob.glob(pattern)) or [pattern])]
+    if args.output_dir: os.makedirs(args.output_dir, exist_ok=True)
+    if splitting: return run_split(paths, args, options)
+    started = time.perf_counter()
+    failed = total_pages = 0
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = {pool.submit(process_file, p, ops, output_path(p, args.output_dir, args.suffix), options): p for p in paths}
+        for future in as_completed(futures):
+            try:
+                path, out_path, pages, seconds = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"GAGAL  {futures[future]}: {e}", file=sys.stderr)
+                continue
+            total_pages += pages
+            sizes = f"  {os.path.getsize(path) / 1e6:.2f} MB -> {os.path.getsize(out_path) / 1e6:.2f} MB" if args.optimize else ""
+            print(f"{seconds:8.2f} s  {pages:6d} hal.  {path} -> {out_path}{sizes}")
+    elapsed = time.perf_counter() - started
+    print(f"Selesai: {len(paths) - failed}/{len(paths)} file, {total_pages} halaman dalam {elapsed:.2f} s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
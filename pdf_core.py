@@ -0,0 +1,250 @@
+"""Operasi dokumen PDF Editor Pro yang tidak bergantung pada GUI.
+
+Semua fungsi bekerja langsung pada `fitz.Document` dan memakai index halaman berbasis 0,
+sehingga bisa dipakai oleh aplikasi Tk maupun oleh `pdf_cli` untuk pemrosesan batch
+tanpa display. Error dilempar ke pemanggil; GUI menampilkannya lewat messagebox,
+CLI mencatatnya per file.
+"""
+import io
+import os
+
+import fitz  # PyMuPDF
+from PIL import Image, ImageOps
+
+PAPER_SIZES = {
+    "A4": (595, 842), "Letter": (612, 792), "Legal": (612, 1008),
+    "A3": (842, 1191), "Ukuran Asli Gambar": None
+}
+IMAGE_MARGIN = 0.95   # Bagian halaman yang boleh ditempati gambar saat ukuran kertas ditentukan
+# Kualitas impor gambar: (DPI target, kualitas JPEG). None = file asli disematkan apa adanya.
+IMAGE_QUALITY_PRESETS = {
+    "Tinggi (200 DPI)": (200, 90), "Sedang (150 DPI)": (150, 85),
+    "Rendah (96 DPI)": (96, 75), "Asli (tanpa kompresi ulang)": None
+}
+DEFAULT_IMAGE_QUALITY = "Sedang (150 DPI)"
+EXIF_ORIENTATION = 0x0112
+
+
+def open_document(path=None):
+    """Membuka file PDF, atau dokumen kosong baru bila path None."""
+    return fitz.open(path) if path else fitz.open()
+
+
+def parse_page_ranges(spec, page_count):
+    """Mengubah teks seperti "1-3,5,8-" (nomor halaman berbasis 1) menjadi daftar index berbasis 0."""
+    indices = []
+    for part in spec.replace(" ", "").split(","):
+        if not part: continue
+        start, sep, end = part.partition("-")
+        first = int(start) if start else 1
+        last = (int(end) if end else page_count) if sep else first
+        if not (1 <= first <= last <= page_count):
+            raise ValueError(f"Rentang halaman tidak valid: {part} (1-{page_count})")
+        indices.extend(range(first - 1, last))
+    return indices
+
+
+def insert_pdf(doc, src_path, insert_at=None):
+    """Menyisipkan semua halaman src_path pada posisi insert_at (default: di akhir).
+
+    Mengembalikan sumber tiap halaman baru sebagai (path, pno, xref).
+    """
+    if insert_at is None: insert_at = len(doc)
+    with fitz.open(src_path) as src:
+        return insert_pdf_pages(doc, src, src_path, 0, len(src) - 1, insert_at)
+
+
+def insert_pdf_pages(doc, src, src_path, first, last, insert_at):
+    """Menyisipkan halaman first..last dari dokumen src yang sudah terbuka; mengembalikan sumber tiap halaman.
+
+    Pemanggilan berulang untuk src yang sama berbagi graft map, jadi font dan gambar bersama tidak diduplikasi.
+    """
+    doc.insert_pdf(src, from_page=first, to_page=last, start_at=insert_at)
+    return [(src_path, i, src.page_xref(i)) for i in range(first, last + 1)]
+
+
+def image_rect(page_dim, image_size):
+    """Ukuran halaman dan kotak gambar: dipusatkan dan diperkecil proporsional bila page_dim diisi."""
+    iw, ih = image_size
+    if not page_dim: return (iw, ih), fitz.Rect(0, 0, iw, ih)
+    pw, ph = page_dim
+    if iw / ih > pw / ph:
+        rw, rh = pw * IMAGE_MARGIN, pw * IMAGE_MARGIN * ih / iw
+    else:
+        rw, rh = ph * IMAGE_MARGIN * iw / ih, ph * IMAGE_MARGIN
+    x, y = (pw - rw) / 2, (ph - rh) / 2
+    return page_dim, fitz.Rect(x, y, x + rw, y + rh)
+
+
+def prepare_image(img_path, page_dim=None, dpi=None, quality=85):
+    """Mendekode dan memperkecil satu gambar agar siap disisipkan; aman dijalankan di proses worker.
+
+    Gambar diperkecil hingga paling banyak `dpi` piksel per inci pada ukuran cetaknya lalu
+    dikodekan sebagai JPEG (PNG untuk gambar hitam-putih). JPEG yang sudah cukup kecil
+    dipakai apa adanya. dpi=None menyematkan file asli tanpa dekode.
+    Hasil: ((lebar, tinggi) halaman, kotak gambar, byte gambar).
+    """
+    with Image.open(img_path) as img:
+        orientation = img.getexif().get(EXIF_ORIENTATION, 1)
+        size = img.size[::-1] if dpi is not None and orientation in (5, 6, 7, 8) else img.size
+        page_size, rect = image_rect(page_dim, size)
+        if dpi is None or (img.format == "JPEG" and orientation == 1 and img.mode in ("RGB", "L")
+                           and img.width <= rect.width / 72 * dpi):
+            with open(img_path, "rb") as f: return page_size, tuple(rect), f.read()
+        target = (max(1, round(rect.width / 72 * dpi)), max(1, round(rect.height / 72 * dpi)))
+        # Dekoder JPEG bisa langsung memperkecil 1/2-1/8 saat dekode, jauh lebih murah dari resize penuh.
+        if img.format == "JPEG": img.draft("RGB", (max(target), max(target)))
+        bilevel = img.mode == "1"
+        img = ImageOps.exif_transpose(img)
+        if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+            img = img.convert("RGBA")
+            background = Image.new("RGB", img.size, (255, 255, 255))
+            background.paste(img, (0, 0), img)
+            img = background
+        elif img.mode not in ("RGB", "L", "1"):
+            img = img.convert("RGB")
+        if img.width > target[0]: img = img.resize(target, Image.LANCZOS, reducing_gap=3.0)
+        out = io.BytesIO()
+        if bilevel: img.convert("1").save(out, "PNG", optimize=True)
+        else: img.save(out, "JPEG", quality=quality, optimize=True)
+    return page_size, tuple(rect), out.getvalue()
+
+
+def insert_prepared_image(doc, pno, prepared):
+    """Menyisipkan hasil prepare_image sebagai halaman baru di pno; stream gambar disematkan sekali."""
+    (pw, ph), rect, data = prepared
+    page = doc.new_page(pno=pno, width=pw, height=ph)
+    page.insert_image(fitz.Rect(rect), stream=data)
+
+
+def insert_images(doc, image_paths, insert_at=None, page_dim=None, dpi=None, quality=85):
+    """Menyisipkan satu halaman per gambar mulai dari insert_at; mengembalikan jumlah halaman baru."""
+    if insert_at is None: insert_at = len(doc)
+    for i, img_path in enumerate(image_paths):
+        insert_prepared_image(doc, insert_at + i, prepare_image(img_path, page_dim, dpi, quality))
+    return len(image_paths)
+
+
+def rotate_pages(doc, indices, angle):
+    """Memutar halaman-halaman sebesar angle (kelipatan 90) relatif terhadap rotasinya sekarang."""
+    for index in indices:
+        page = doc[index]
+        page.set_rotation((page.rotation + angle) % 360)
+
+
+def delete_pages(doc, start, end):
+    """Menghapus halaman start..end (index berbasis 0, inklusif); mengembalikan jumlah yang dihapus."""
+    doc.delete_pages(range(start, end + 1))
+    return end - start + 1
+
+
+def delete_page_set(doc, indices):
+    """Menghapus sekumpulan halaman sembarang dengan satu panggilan delete_pages."""
+    indices = sorted(set(indices))
+    doc.delete_pages(indices)
+    return len(indices)
+
+
+def move_pages(doc, start, count, to):
+    """Memindahkan blok count halaman mulai dari start dengan satu panggilan select.
+
+    `to` adalah posisi awal blok pada urutan setelah blok dikeluarkan (sama dengan PageModel.move).
+    """
+    order = list(range(start)) + list(range(start + count, len(doc)))
+    order[to:to] = range(start, start + count)
+    doc.select(order)
+
+
+def keep_pages(doc, indices):
+    """Menyisakan hanya halaman indices, dalam urutan yang diberikan."""
+    doc.select(list(indices))
+
+
+def can_save_incrementally(doc, save_path):
+    """True bila save_path adalah file asal dokumen dan perubahan bisa ditambahkan di akhir file itu."""
+    return bool(doc.name) and same_path(save_path, doc.name) and bool(doc.can_save_incrementally())
+
+
+def same_path(a, b):
+    return os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b))
+
+
+def save_document(doc, save_path, start=None, end=None, optimize=False):
+    """Menyimpan seluruh dokumen, atau hanya halaman start..end (index berbasis 0, inklusif).
+
+    Tanpa optimize, penyimpanan ke file asal dilakukan inkremental: hanya objek yang berubah
+    ditambahkan di akhir file, sehingga waktunya sebanding dengan besar perubahan. Ke file
+    lain, stream yang sudah terkompresi disalin apa adanya. optimize=True menjalankan
+    garbage collection penuh, kompresi ulang dan pembersihan content stream (lambat).
+    Mengembalikan jumlah halaman yang disimpan.
+    """
+    options = dict(garbage=4, deflate=True, clean=True) if optimize else dict(garbage=1, deflate=True)
+    if start is None:
+        if not optimize and can_save_incrementally(doc, save_path):
+            doc.save(doc.name, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+        elif doc.name and same_path(save_path, doc.name):
+            raise ValueError("File yang sedang dibuka tidak bisa ditulis ulang penuh; simpan ke file lain.")
+        else:
+            doc.save(save_path, **options)
+        return len(doc)
+    with fitz.open() as new_doc:
+        new_doc.insert_pdf(doc, from_page=start, to_page=end)
+        new_doc.save(save_path, **options)
+    return end - start + 1
+
+
+def split_every(page_count, n):
+    """Rencana pemisahan tiap n halaman: daftar (indices, label)."""
+    return [(list(range(s, min(s + n, page_count))), f"{s // n + 1:03d}") for s in range(0, page_count, n)]
+
+
+def split_at_bookmarks(doc, level=1):
+    """Rencana pemisahan di setiap bookmark sampai kedalaman level; halaman sebelum bookmark pertama jadi bagian sendiri."""
+    marks = {}
+    for lvl, title, page in doc.get_toc(simple=True):
+        if lvl <= level and 1 <= page <= len(doc): marks.setdefault(page - 1, title)
+    bounds = sorted(set(marks) | {0}) + [len(doc)]
+    return [(list(range(a, b)), f"{i + 1:03d}_{_safe_name(marks.get(a, ''))}".rstrip("_"))
+            for i, (a, b) in enumerate(zip(bounds, bounds[1:])) if b > a]
+
+
+def split_by_ranges(specs, page_count):
+    """Rencana pemisahan dari daftar teks rentang, satu file hasil per teks (mis. ["1-3", "4-9,12"])."""
+    return [(parse_page_ranges(spec, page_count), f"{i + 1:03d}") for i, spec in enumerate(specs)]
+
+
+def _safe_name(text, limit=40):
+    return "".join(c if c.isalnum() or c in " -_" else "_" for c in text).strip()[:limit]
+
+
+def page_runs(indices):
+    """Mengelompokkan index menjadi rentang berurutan (awal, akhir) agar insert_pdf dipanggil sesedikit mungkin."""
+    runs = []
+    for i in indices:
+        if runs and i == runs[-1][1] + 1: runs[-1][1] = i
+        else: runs.append([i, i])
+    return runs
+
+
+def export_parts(src_path, parts, optimize=False, save=None):
+    """Dijalankan di proses worker: membuka src_path sekali lalu menulis setiap (indices, out_path).
+
+    save(doc, out_path), bila diberikan, menggantikan save_document (mis. pdf_optimize.optimize_document).
+    Mengembalikan daftar (out_path, jumlah halaman, ukuran file dalam byte).
+    """
+    results = []
+    with fitz.open(src_path) as src:
+        for indices, out_path in parts:
+            with fitz.open() as new_doc:
+                for start, end in page_runs(indices): new_doc.insert_pdf(src, from_page=start, to_page=end)
+                if save: save(new_doc, out_path)
+                else: save_document(new_doc, out_path, optimize=optimize)
+            results.append((out_path, len(indices), os.path.getsize(out_path)))
+    return results
+
+
+def chunk_parts(parts, workers, per_worker=4):
+    """Membagi daftar bagian menjadi beberapa tugas agar tiap worker membuka sumber sesedikit mungkin
+    tetapi pekerjaan tetap terbagi rata."""
+    size = max(1, -(-len(parts) // (workers * per_worker)))
+    return [parts[i:i + size] for i in range(0, len(parts), size)]
@@ -0,0 +1,183 @@
+"""Riwayat urungkan/ulangi berbasis log operasi.
+
+Riwayat tidak menyimpan salinan dokumen. Setiap entri adalah operasi kecil yang bisa
+diterapkan ke dokumen dan mengembalikan operasi kebalikannya:
+
+- `RotatePages`: daftar index + sudut.
+- `MovePages`: blok halaman dan posisi tujuannya.
+- `RemovePages`: sekumpulan index halaman yang dihapus (tidak harus berurutan).
+- `RestorePages`: cara membuat ulang halaman yang dihapus. Halaman yang berasal dari file
+  dicatat sebagai referensi (path, nomor halaman, rotasi); hanya halaman yang tidak punya
+  file sumber (mis. hasil impor gambar) yang disalin ke dokumen `stash` kecil. Sebelum
+  sebuah file ditimpa (mis. simpan cepat ke file asal), halaman yang masih dirujuk dari
+  file itu disalin ke stash lewat `History.detach_file`.
+
+`apply()` mengembalikan (kebalikan, perubahan). Perubahan dipakai GUI untuk memperbarui
+pratinjau: ("rotated", indices, angle), ("moved", start, count, to), ("removed", [(start, count), ...])
+atau ("inserted", [(start, sources), ...]); daftar blok diurutkan naik menurut posisi asal.
+Semua operasi sebanding dengan jumlah halaman yang disentuh, bukan ukuran dokumen.
+"""
+import os
+import itertools
+from collections import deque
+
+import fitz  # PyMuPDF
+
+import pdf_core
+
+HISTORY_LIMIT = 500
+
+
+def _file_stat(path):
+    try:
+        st = os.stat(path)
+        return st.st_mtime, st.st_size
+    except OSError:
+        return None
+
+
+class RotatePages:
+    def __init__(self, indices, angle):
+        self.indices, self.angle = list(indices), angle
+
+    def apply(self, doc, stash, pages):
+        pdf_core.rotate_pages(doc, self.indices, self.angle)
+        return RotatePages(self.indices, -self.angle), ("rotated", self.indices, self.angle)
+
+
+class MovePages:
+    def __init__(self, start, count, to):
+        self.start, self.count, self.to = start, count, to
+
+    def apply(self, doc, stash, pages):
+        pdf_core.move_pages(doc, self.start, self.count, self.to)
+        return MovePages(self.to, self.count, self.start), ("moved", self.start, self.count, self.to)
+
+
+class RemovePages:
+    def __init__(self, indices):
+        self.indices = sorted(set(indices))
+
+    def apply(self, doc, stash, pages):
+        """Mencatat cara membuat ulang halaman yang akan dihapus, lalu menghapus semuanya sekaligus."""
+        blocks = pdf_core.page_runs(self.indices)
+        groups = [(first, self._capture(doc, stash, pages, first, last)) for first, last in blocks]
+        pdf_core.delete_page_set(doc, self.indices)
+        return RestorePages(groups), ("removed", [(first, last - first + 1) for first, last in blocks])
+
+    @staticmethod
+    def _capture(doc, stash, pages, first, last):
+        runs = []  # [jenis, path, stat, nomor pertama, jumlah, rotasi per halaman]
+        stat_cache = {}
+        for index in range(first, last + 1):
+            source, rotation = pages.source(index), doc[index].rotation
+            if source:
+                path, pno = source[0], source[1]
+                if path not in stat_cache: stat_cache[path] = _file_stat(path)
+                last_run = runs[-1] if runs else None
+                if last_run and last_run[0] == "file" and last_run[1] == path and last_run[3] + last_run[4] == pno:
+                    last_run[4] += 1
+                    last_run[5].append(rotation)
+                else:
+                    runs.append(["file", path, stat_cache[path], pno, 1, [rotation]])
+            else:
+                stash.insert_pdf(doc, from_page=index, to_page=index)
+                last_run = runs[-1] if runs else None
+                if last_run and last_run[0] == "stash" and last_run[3] + last_run[4] == len(stash) - 1:
+                    last_run[4] += 1
+                    last_run[5].append(rotation)
+                else:
+                    runs.append(["stash", None, None, len(stash) - 1, 1, [rotation]])
+        return runs
+
+
+class RestorePages:
+    """Membuat ulang kelompok halaman di posisi asalnya; kelompok diurutkan naik menurut posisi."""
+
+    def __init__(self, groups):
+        self.groups = groups
+
+    def apply(self, doc, stash, pages):
+        # Semua file sumber diperiksa dulu agar pemulihan tidak berhenti di tengah jalan.
+        for _, runs in self.groups:
+            for kind, path, stat, *_ in runs:
+                if kind == "file" and _file_stat(path) != stat:
+                    raise ValueError(f"File sumber sudah berubah atau hilang: {os.path.basename(path)}")
+        inserted, restored, opened = [], [], {}
+        try:
+            for start, runs in self.groups:
+                position, sources = start, []
+                for kind, path, _, first, count, rotations in runs:
+                    if kind == "file":
+                        src = opened.get(path) or opened.setdefault(path, fitz.open(path))
+                        sources += [(path, pno, src.page_xref(pno)) for pno in range(first, first + count)]
+                    else:
+                        src = stash
+                        sources += [None] * count
+                    doc.insert_pdf(src, from_page=first, to_page=first + count - 1, start_at=position)
+                    for offset, rotation in enumerate(rotations): doc[position + offset].set_rotation(rotation)
+                    position += count
+                inserted.append((start, sources))
+                restored.extend(range(start, position))
+        finally:
+            for src in opened.values(): src.close()
+        return RemovePages(restored), ("inserted", inserted)
+
+    def detach(self, path, stash):
+        """Menyalin halaman yang dirujuk dari path ke stash, agar tetap bisa dipulihkan setelah path ditulis ulang."""
+        src = None
+        try:
+            for _, runs in self.groups:
+                for run in runs:
+                    kind, run_path, stat, first, count, _ = run
+                    # File yang sudah berubah sebelumnya tidak bisa lagi memberi halaman yang benar.
+                    if kind != "file" or not pdf_core.same_path(run_path, path) or _file_stat(run_path) != stat: continue
+                    if src is None: src = fitz.open(path)
+                    stash.insert_pdf(src, from_page=first, to_page=first + count - 1)
+                    run[:4] = ["stash", None, None, len(stash) - count]
+        finally:
+            if src is not None: src.close()
+
+
+class History:
+    """Dua tumpukan operasi: `undo` berisi kebalikan dari aksi pengguna, `redo` kebalikan dari undo."""
+
+    def __init__(self, limit=HISTORY_LIMIT):
+        self._undo = deque(maxlen=limit)
+        self._redo = deque(maxlen=limit)
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+
+    def record(self, inverse):
+        """Mencatat kebalikan dari aksi yang baru saja dilakukan pengguna."""
+        self._undo.append(inverse)
+        self._redo.clear()
+
+    def detach_file(self, path, stash):
+        """Dipanggil sebelum path ditimpa: semua operasi yang merujuk path beralih ke salinan di stash."""
+        for op in itertools.chain(self._undo, self._redo):
+            if isinstance(op, RestorePages): op.detach(path, stash)
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo(self, doc, stash, pages):
+        return self._step(self._undo, self._redo, doc, stash, pages)
+
+    def redo(self, doc, stash, pages):
+        return self._step(self._redo, self._undo, doc, stash, pages)
+
+    def _step(self, source, target, doc, stash, pages):
+        op = source.pop()
+        try:
+            inverse, change = op.apply(doc, stash, pages)
+        except Exception:
+            source.append(op)
+            raise
+        target.append(inverse)
+        return change
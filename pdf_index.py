@@ -0,0 +1,81 @@
+"""Indeks teks halaman untuk pencarian cepat.
+
+Teks setiap halaman diekstrak paralel di proses worker (`extract_words`), lalu disusun
+menjadi indeks terbalik kata -> nomor halaman per file sumber. Indeks disimpan di disk
+dengan kunci sidik jari isi file (`pdf_cache.file_fingerprint`), jadi dokumen yang sama
+tidak perlu diindeks ulang walau dipindah atau diganti nama.
+
+Pencarian mencocokkan awalan kata: "fakt 2023" menemukan halaman yang memuat kata
+berawalan "fakt" dan kata berawalan "2023".
+"""
+import os
+import re
+import json
+import zlib
+from bisect import bisect_left
+
+from pdf_cache import default_cache_dir
+from pdf_render import get_worker_document
+
+INDEX_VERSION = 1
+CHUNK_PAGES = 64     # Halaman per tugas ekstraksi yang dikirim ke satu worker
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return _WORD.findall(text.casefold())
+
+
+def default_index_dir():
+    return os.path.join(os.path.dirname(default_cache_dir()), "text")
+
+
+def extract_words(path, first, last):
+    """Dijalankan di proses worker: kata-kata halaman first..last (inklusif), satu string per halaman."""
+    doc = get_worker_document(path)
+    return [" ".join(tokenize(doc[pno].get_text("text"))) for pno in range(first, last + 1)]
+
+
+def page_chunks(page_count, size=CHUNK_PAGES):
+    """Membagi halaman menjadi rentang (awal, akhir) untuk dikirim ke worker."""
+    return [(start, min(start + size, page_count) - 1) for start in range(0, page_count, size)]
+
+
+class TextIndex:
+    """Indeks terbalik untuk satu file sumber; `pages` berisi kata-kata tiap halaman (dipisah spasi)."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self._postings = {}
+        for pno, words in enumerate(pages):
+            for word in set(words.split()): self._postings.setdefault(word, []).append(pno)
+        self._vocabulary = sorted(self._postings)
+
+    def search(self, query):
+        """Nomor halaman (berbasis 0, urut naik) yang memuat semua kata query sebagai awalan kata."""
+        result = None
+        for term in tokenize(query):
+            matched = set()
+            i = bisect_left(self._vocabulary, term)
+            while i < len(self._vocabulary) and self._vocabulary[i].startswith(term):
+                matched.update(self._postings[self._vocabulary[i]])
+                i += 1
+            result = matched if result is None else result & matched
+            if not result: return []
+        return sorted(result or ())
+
+    def save(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(zlib.compress(json.dumps({"version": INDEX_VERSION, "pages": self.pages}).encode("utf-8"), 3))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Memuat indeks dari disk; None bila tidak ada, rusak atau versinya lain."""
+        try:
+            with open(path, "rb") as f:
+                data = json.loads(zlib.decompress(f.read()))
+        except (OSError, ValueError, zlib.error):
+            return None
+        return cls(data["pages"]) if data.get("version") == INDEX_VERSION else None
@@ -0,0 +1,210 @@
+"""Penjadwal pekerjaan latar belakang untuk PDF Editor Pro.
+
+Semua pekerjaan berat (render halaman, simpan, impor) dijalankan lewat `JobScheduler`:
+di thread pool, di process pool untuk pekerjaan CPU murni, atau di satu thread dokumen
+untuk pekerjaan yang memakai dokumen fitz yang sedang terbuka. Dokumen fitz tidak aman
+dipakai lintas thread: pekerjaan dokumen berjalan satu per satu sambil memegang
+`document_lock`, dan thread Tk memegang lock yang sama setiap kali mengubah dokumen. Setiap pekerjaan diberi ID generasi dokumen; begitu generasi
+berganti (dokumen dibuka/diubah), hasil pekerjaan lama dibuang tanpa menyentuh UI.
+
+Hasil, progres dan error dikirim kembali ke thread Tk oleh satu loop dispatch yang
+hanya berjalan selama masih ada pekerjaan aktif. Setiap putaran loop memproses event
+sebanyak mungkin dalam anggaran waktu `budget_ms`, lalu memanggil listener akhir-batch
+sekali saja sehingga pembaruan UI seperti progress bar tidak dilakukan per event.
+
+Setiap pekerjaan dicatat ke `pdf_trace.tracer`: waktu tunggu di antrean, waktu jalan di
+worker, dan waktu callback-nya di thread Tk.
+"""
+import os
+import time
+import queue
+import itertools
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+
+from pdf_trace import tracer
+
+DONE, ERROR, PROGRESS, CANCELLED = "done", "error", "progress", "cancelled"
+
+
+class Job:
+    """Handle sebuah pekerjaan. Fungsi thread menerima objek ini sebagai argumen pertama."""
+
+    def __init__(self, scheduler, fn, args, priority, generation, on_done, on_error, on_progress):
+        self.scheduler = scheduler
+        self.fn, self.args = fn, args
+        self.priority = priority
+        self.generation = generation
+        self.on_done, self.on_error, self.on_progress = on_done, on_error, on_progress
+        self.future = None
+        self.submitted = time.perf_counter()
+        self._cancelled = False
+
+    @property
+    def name(self):
+        return getattr(self.fn, "__name__", "job")
+
+    @property
+    def cancelled(self):
+        """True bila dibatalkan secara eksplisit atau generasinya sudah digantikan."""
+        return self._cancelled or (self.generation is not None and self.generation != self.scheduler.generation)
+
+    def cancel(self):
+        self._cancelled = True
+        if self.future is not None: self.future.cancel()
+
+    def report(self, *payload):
+        """Mengirim progres ke callback on_progress di thread Tk (aman dipanggil dari worker)."""
+        if not self.cancelled: self.scheduler._post(self, PROGRESS, payload)
+
+
+class JobScheduler:
+    def __init__(self, root, thread_workers=2, process_workers=None, tick_ms=15, budget_ms=12):
+        self.root = root
+        self.tick_ms = tick_ms
+        self.budget_ms = budget_ms
+        self.process_workers = process_workers or os.cpu_count() or 1
+        self.generation = 0
+        self._jobs = queue.PriorityQueue()
+        self._document_jobs = queue.PriorityQueue()
+        self.document_lock = threading.RLock()
+        self._events = queue.Queue()
+        self._counter = itertools.count()
+        self._executor = None
+        self.processes_ready = False     # True setelah worker process pertama menyelesaikan pekerjaan
+        self._process_jobs = set()
+        self._process_lock = threading.Lock()  # _process_jobs juga diubah dari thread callback executor
+        self._batch_listeners = []
+        self._active = 0
+        self._armed = False
+        self._stopped = False
+        for _ in range(thread_workers):
+            threading.Thread(target=self._thread_worker, args=(self._jobs,), daemon=True).start()
+        threading.Thread(target=self._thread_worker, args=(self._document_jobs, self.document_lock), daemon=True).start()
+
+    def new_generation(self):
+        """Memulai generasi dokumen baru; pekerjaan bertanda generasi lama otomatis batal."""
+        self.generation += 1
+        # Pekerjaan process yang belum mulai dibatalkan agar worker tidak membuang waktu.
+        with self._process_lock: jobs = list(self._process_jobs)
+        for job in jobs:
+            if job.cancelled: job.future.cancel()
+        return self.generation
+
+    def submit(self, fn, *args, priority=0, process=False, document=False, generation=..., on_done=None, on_error=None, on_progress=None):
+        """Menjadwalkan fn. Harus dipanggil dari thread Tk.
+
+        Pekerjaan thread dipanggil sebagai fn(job, *args); pekerjaan process sebagai fn(*args)
+        sehingga fn dan argumennya harus bisa di-pickle. document=True untuk pekerjaan yang membaca
+        dokumen yang sedang terbuka: dijalankan di thread dokumen sambil memegang document_lock. generation=None berarti pekerjaan
+        tidak terikat dokumen (mis. menyimpan) dan tidak ikut batal saat generasi berganti.
+        """
+        if generation is ...: generation = self.generation
+        job = Job(self, fn, args, priority, generation, on_done, on_error, on_progress)
+        self._active += 1
+        if process:
+            if self._executor is None: self._executor = ProcessPoolExecutor(max_workers=self.process_workers)
+            job.future = self._executor.submit(_timed_call, fn, args)
+            with self._process_lock: self._process_jobs.add(job)
+            job.future.add_done_callback(lambda f, j=job: self._on_future_done(j, f))
+        else:
+            (self._document_jobs if document else self._jobs).put((priority, next(self._counter), job))
+        self._arm()
+        return job
+
+    def warm_up(self):
+        """Menyalakan process pool sekarang, bukan saat pekerjaan process pertama.
+
+        Di Windows setiap worker di-spawn dan mengimpor ulang modul utama, jadi pekerjaan kosong
+        dikirim ke setiap worker selagi pengguna belum membutuhkannya.
+        """
+        if self._executor is not None: return
+        for _ in range(self.process_workers): self.submit(os.getpid, process=True, generation=None)
+
+    def on_batch_end(self, callback):
+        """Mendaftarkan callback yang dipanggil sekali setelah setiap batch event diproses."""
+        self._batch_listeners.append(callback)
+
+    def shutdown(self):
+        self._stopped = True
+        self.generation += 1
+        if self._executor: self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    def _thread_worker(self, jobs, lock=None):
+        while not self._stopped:
+            _, _, job = jobs.get()
+            with lock or nullcontext():
+                # Diperiksa setelah lock didapat: dokumen bisa saja ditutup selama menunggu.
+                if job.cancelled:
+                    self._post(job, CANCELLED, None)
+                    continue
+                started = time.perf_counter()
+                try:
+                    result = job.fn(job, *job.args)
+                except Exception as e:
+                    self._post(job, ERROR, e)
+                else:
+                    self._post(job, DONE, result)
+                finally:
+                    tracer.add(job.name, started, time.perf_counter() - started, "job", wait_ms=round((started - job.submitted) * 1000, 2))
+
+    def _on_future_done(self, job, future):
+        with self._process_lock: self._process_jobs.discard(job)
+        if future.cancelled():
+            self._post(job, CANCELLED, None)
+        elif future.exception() is not None:
+            self._post(job, ERROR, future.exception())
+        else:
+            pid, started, seconds, result = future.result()
+            self.processes_ready = True
+            tracer.add(job.name, started, seconds, "job", pid=pid, wait_ms=round((started - job.submitted) * 1000, 2))
+            self._post(job, DONE, result)
+
+    def _post(self, job, kind, payload):
+        self._events.put((job, kind, payload))
+
+    def _arm(self):
+        if not self._armed and not self._stopped:
+            self._armed = True
+            self.root.after(self.tick_ms, self._dispatch)
+
+    def _dispatch(self):
+        """Loop dispatch di thread Tk: meneruskan event ke callback dan berhenti saat tidak ada pekerjaan."""
+        self._armed = False
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        handled = 0
+        while time.perf_counter() < deadline:
+            try:
+                job, kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            handled += 1
+            if kind != PROGRESS: self._active -= 1
+            if job.cancelled or kind == CANCELLED: continue
+            started = time.perf_counter()
+            try:
+                if kind == DONE and job.on_done: job.on_done(payload)
+                elif kind == ERROR and job.on_error: job.on_error(payload)
+                elif kind == ERROR: print(f"Pekerjaan latar belakang gagal: {payload}")
+                elif kind == PROGRESS and job.on_progress: job.on_progress(*payload)
+            except Exception as e:
+                print(f"Callback pekerjaan gagal: {e}")
+            tracer.add(f"tk:{job.name}", started, time.perf_counter() - started, "tk", event=kind)
+        if handled:
+            for callback in self._batch_listeners:
+                with tracer.span(f"tk:{callback.__name__}", "tk"): callback()
+        if not self._events.empty() and not self._armed and not self._stopped:
+            # Anggaran habis: sisa event diproses segera setelah Tk sempat menggambar ulang.
+            self._armed = True
+            self.root.after(1, self._dispatch)
+        elif self._active > 0:
+            self._arm()
+
+
+def _timed_call(fn, args):
+    """Dijalankan di proses worker: memanggil fn dan mengembalikan (pid, mulai, durasi, hasil) untuk tracer."""
+    started = time.perf_counter()
+    result = fn(*args)
+    return os.getpid(), started, time.perf_counter() - started, result
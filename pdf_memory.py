@@ -0,0 +1,136 @@
+"""Anggaran memori PDF Editor Pro.
+
+Thumbnail di memori dicatat per byte (samples mentah + PhotoImage Tk), bukan per jumlah,
+sehingga zoom besar dan dokumen berhalaman banyak tetap berada di bawah batas yang sama.
+Pemakaian memori proses dibaca berkala; bila melewati anggaran, cache dekode MuPDF
+(gambar dan font halaman yang pernah dirender atau digabung) dikosongkan sebagian dan
+thumbnail yang paling lama tidak dilihat dibuang. Thumbnail yang terbuang dirender ulang
+atau dimuat dari cache disk saat terlihat lagi.
+
+Anggaran default bisa diubah lewat variabel lingkungan PDF_EDITOR_MEMORY_MB.
+"""
+import os
+import sys
+from collections import OrderedDict
+
+import fitz  # PyMuPDF
+
+DEFAULT_BUDGET_MB = 512
+PHOTO_BYTES_PER_PIXEL = 4   # Tk menyimpan PhotoImage sebagai RGBA
+
+
+def budget_bytes():
+    """Anggaran memori total dalam byte (PDF_EDITOR_MEMORY_MB, default DEFAULT_BUDGET_MB)."""
+    try:
+        megabytes = int(os.environ.get("PDF_EDITOR_MEMORY_MB", DEFAULT_BUDGET_MB))
+    except ValueError:
+        megabytes = DEFAULT_BUDGET_MB
+    return max(64, megabytes) * 1024 * 1024
+
+
+def _windows_counters():
+    import ctypes
+    from ctypes import wintypes
+
+    class _Counters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+            (name, ctypes.c_size_t) for name in ("PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                                                 "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage",
+                                                 "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+
+    counters = _Counters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb): raise OSError("GetProcessMemoryInfo gagal")
+    return counters
+
+
+def process_memory():
+    """Working set / RSS proses ini dalam byte, atau None bila tidak bisa dibaca."""
+    try:
+        if sys.platform == "win32": return _windows_counters().WorkingSetSize
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, AttributeError, ValueError):
+        return None
+
+
+def peak_process_memory():
+    """Puncak working set / RSS proses ini sejak dimulai dalam byte, atau None bila tidak bisa dibaca."""
+    try:
+        if sys.platform == "win32": return _windows_counters().PeakWorkingSetSize
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (OSError, AttributeError, ValueError, ImportError):
+        return None
+
+
+def shrink_decode_cache(percent=50):
+    """Membebaskan sebagian cache dekode MuPDF (gambar dan font yang sudah diurai) di proses ini."""
+    fitz.TOOLS.store_shrink(percent)
+
+
+def format_bytes(size):
+    return f"{size / (1024 * 1024):.0f} MB"
+
+
+class BudgetedCache:
+    """Cache LRU yang dibatasi total byte; ukuran tiap entri dihitung oleh `sizeof` saat disimpan."""
+
+    def __init__(self, limit, sizeof):
+        self.limit = limit
+        self.used = 0
+        self._sizeof = sizeof
+        self._entries = OrderedDict()  # key -> (value, ukuran)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __getitem__(self, key):
+        return self._entries[key][0]
+
+    def __setitem__(self, key, value):
+        self.pop(key)
+        size = self._sizeof(value)
+        self._entries[key] = (value, size)
+        self.used += size
+
+    def get(self, key, default=None):
+        item = self._entries.get(key)
+        return item[0] if item else default
+
+    def touch(self, key):
+        """Menandai entri baru saja dilihat."""
+        if key in self._entries: self._entries.move_to_end(key)
+
+    def pop(self, key, default=None):
+        item = self._entries.pop(key, None)
+        if item is None: return default
+        self.used -= item[1]
+        return item[0]
+
+    def clear(self):
+        self._entries.clear()
+        self.used = 0
+
+    def evict(self, keep=(), target=None):
+        """Membuang entri yang paling lama tidak dilihat sampai pemakaian <= target (default: limit).
+
+        Kunci di `keep` (mis. thumbnail yang sedang tampil) tidak pernah dibuang. Mengembalikan jumlah byte yang dibebaskan.
+        """
+        target = self.limit if target is None else target
+        freed = 0
+        for key in list(self._entries):
+            if self.used <= target: break
+            if key in keep: continue
+            size = self._entries.pop(key)[1]
+            self.used -= size
+            freed += size
+        return freed
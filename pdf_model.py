@@ -0,0 +1,65 @@
+"""Model urutan halaman untuk PDF Editor Pro.
+
+Setiap halaman diberi ID stabil (uid) yang tidak berubah walau halaman lain disisipkan,
+dihapus atau dipindah. Thumbnail, tugas render dan slot pratinjau dikunci dengan uid,
+sehingga perubahan struktur cukup memperbarui daftar urutan tanpa melabeli ulang atau
+merender ulang halaman yang tidak tersentuh.
+"""
+import itertools
+
+
+class PageModel:
+    def __init__(self, sources=()):
+        self._counter = itertools.count(1)
+        self._order = []     # index -> uid
+        self._sources = {}   # uid -> (path, pno, xref) atau None bila halaman hanya ada di memori
+        self._index = None   # uid -> index, dibangun ulang hanya saat dibutuhkan
+        self.reset(sources)
+
+    def __len__(self):
+        return len(self._order)
+
+    def reset(self, sources=()):
+        self._order.clear()
+        self._sources.clear()
+        self.insert(0, sources)
+
+    def uid(self, index):
+        return self._order[index]
+
+    def source(self, index):
+        return self._sources[self._order[index]]
+
+    def index_of(self, uid):
+        """Posisi halaman saat ini, atau None bila halaman sudah dihapus."""
+        if self._index is None:
+            self._index = {uid: index for index, uid in enumerate(self._order)}
+        return self._index.get(uid)
+
+    def set_sources(self, sources):
+        """Mengganti sumber semua halaman tanpa mengubah uid (mis. setelah dokumen disimpan ke file asalnya)."""
+        self._sources = dict(zip(self._order, sources))
+
+    def insert(self, index, sources):
+        """Menyisipkan halaman baru di index; mengembalikan uid-nya."""
+        uids = [next(self._counter) for _ in sources]
+        self._sources.update(zip(uids, sources))
+        self._order[index:index] = uids
+        self._index = None
+        return uids
+
+    def delete(self, start, count=1):
+        """Menghapus count halaman mulai dari start; mengembalikan uid yang dihapus."""
+        removed = self._order[start:start + count]
+        del self._order[start:start + count]
+        for uid in removed: del self._sources[uid]
+        self._index = None
+        return removed
+
+    def move(self, start, count, to):
+        """Memindahkan blok count halaman mulai dari start; `to` adalah posisi awal blok
+        pada urutan setelah blok itu dikeluarkan."""
+        block = self._order[start:start + count]
+        del self._order[start:start + count]
+        self._order[to:to] = block
+        self._index = None
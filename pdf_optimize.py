@@ -0,0 +1,201 @@
+"""Optimasi ukuran file saat menyimpan.
+
+Tiga tahap, dua di antaranya paralel di proses worker:
+
+1. `measure_pages`: ukuran tampil terbesar setiap gambar (dalam point) dikumpulkan dari
+   semua halaman, termasuk gambar di dalam form XObject.
+2. `recompress_images`: setiap gambar didekode sekali. Gambar yang resolusinya jauh di
+   atas DPI target diperkecil dan dikodekan ulang sebagai JPEG; gambar hitam-putih (hasil
+   scan) dikodekan sebagai CCITT G4 atau Flate 1-bit, mana yang lebih kecil. Hasil hanya
+   dipakai bila memang lebih kecil dari stream aslinya. Hash piksel hasil dekode dicatat
+   untuk mencari gambar yang sama dari sumber berbeda walau kodenya lain.
+3. `apply_results` (proses utama): stream diganti, referensi gambar duplikat diarahkan ke
+   satu salinan, lalu `SAVE_OPTIONS` (garbage=4) menggabungkan objek/stream identik lain
+   (font yang sama dari beberapa PDF gabungan) dan membuang yang tidak terpakai.
+
+Encoder JBIG2 tidak tersedia di PyMuPDF/Pillow, jadi gambar bilevel memakai CCITT G4
+(libtiff lewat Pillow) yang juga dirancang untuk scan dokumen.
+"""
+import io
+import math
+import zlib
+import hashlib
+
+import numpy as np
+import fitz  # PyMuPDF
+from PIL import Image
+
+DEFAULT_DPI = 150
+DEFAULT_QUALITY = 80
+# Pilihan di dialog simpan: DPI target gambar, None = gambar tidak diperkecil.
+DPI_PRESETS = {"150 DPI (layar / arsip)": 150, "200 DPI": 200, "300 DPI (cetak)": 300, "Tanpa memperkecil gambar": None}
+BILEVEL_DPI = 300          # Gambar hitam-putih tidak diperkecil di bawah ini agar teks tetap tajam
+DOWNSAMPLE_MARGIN = 1.25   # Gambar baru diperkecil bila lebih besar dari ini kali ukuran target
+BILEVEL_MIDTONES = 0.01    # Bagian piksel abu-abu maksimum agar gambar grayscale dianggap hitam-putih
+MIN_SAVING = 0.9           # Hasil kode ulang dipakai hanya bila <= ini kali ukuran stream asli
+MEASURE_CHUNK = 64         # Halaman per tugas pengukuran
+RECOMPRESS_CHUNK = 16      # Gambar per tugas kode ulang
+SAVE_OPTIONS = dict(garbage=4, deflate=True, deflate_images=True, deflate_fonts=True, clean=True, use_objstms=1)
+_BILEVEL_FILTERS = ("CCITTFaxDecode", "JBIG2Decode")
+
+
+def measure_images(doc, first, last):
+    """{xref: (lebar, tinggi)} ukuran tampil terbesar (point) setiap gambar di halaman first..last."""
+    sizes = {}
+    for pno in range(first, last + 1):
+        for info in doc[pno].get_image_info(xrefs=True):
+            xref = info.get("xref")
+            if not xref: continue  # Gambar inline tidak punya objek sendiri
+            a, b, c, d = info["transform"][:4]
+            width, height = math.hypot(a, b), math.hypot(c, d)
+            old = sizes.get(xref, (0, 0))
+            sizes[xref] = (max(old[0], width), max(old[1], height))
+    return sizes
+
+
+def merge_measurements(total, part):
+    for xref, (width, height) in part.items():
+        old = total.get(xref, (0, 0))
+        total[xref] = (max(old[0], width), max(old[1], height))
+    return total
+
+
+def measure_pages(path, first, last):
+    """Dijalankan di proses worker. File dibuka per tugas (bukan lewat cache worker) agar snapshot
+    sementara bisa dihapus setelah selesai, juga di Windows."""
+    with fitz.open(path) as doc:
+        return measure_images(doc, first, last)
+
+
+def _encode_bilevel(image):
+    """Gambar mode "1" sebagai (data, filter, DecodeParms): CCITT G4 atau Flate, mana yang lebih kecil."""
+    flate = zlib.compress(image.tobytes(), 9)
+    try:
+        tiff = io.BytesIO()
+        image.save(tiff, "TIFF", compression="group4", tiffinfo={278: image.height})  # Satu strip
+        tags = Image.open(io.BytesIO(tiff.getvalue())).tag_v2
+        offsets, counts = tags[273], tags[279]
+        if len(offsets) == 1 and counts[0] < len(flate):
+            data = tiff.getvalue()[offsets[0]:offsets[0] + counts[0]]
+            return data, "/CCITTFaxDecode", f"<</K -1/Columns {image.width}/Rows {image.height}/BlackIs1 true>>"
+    except (OSError, KeyError) as e:
+        print(f"Gagal mengodekan CCITT G4, memakai Flate: {e}")
+    return flate, "/FlateDecode", "null"
+
+
+def recompress_image(doc, xref, size, dpi=DEFAULT_DPI, quality=DEFAULT_QUALITY):
+    """Mendekode gambar xref dan, bila menguntungkan, mengodekannya ulang.
+
+    `size` adalah ukuran tampil terbesar (point). Hasil: (xref, hash piksel atau None,
+    pengganti atau None) dengan pengganti = (data, filter, DecodeParms, lebar, tinggi, bpc, colorspace).
+    """
+    if doc.xref_get_key(xref, "ImageMask")[1] == "true" or doc.xref_get_key(xref, "Decode")[0] != "null":
+        return xref, None, None  # Stencil mask dan array Decode tidak dipetakan ulang
+    raw_size = len(doc.xref_stream_raw(xref) or b"")
+    source_filter = doc.xref_get_key(xref, "Filter")[1].lstrip("/")
+    bilevel_source = doc.xref_get_key(xref, "BitsPerComponent")[1] == "1"
+    pix = fitz.Pixmap(doc, xref)
+    if pix.alpha: pix = fitz.Pixmap(pix, 0)
+    if pix.n not in (1, 3): pix = fitz.Pixmap(fitz.csRGB, pix)
+    has_mask = doc.xref_get_key(xref, "SMask")[0] != "null"
+    digest = None if has_mask else hashlib.sha1(b"%dx%dx%d" % (pix.width, pix.height, pix.n) + pix.samples).hexdigest()
+    image = Image.frombytes("L" if pix.n == 1 else "RGB", (pix.width, pix.height), pix.samples)
+    bilevel = bilevel_source
+    if not bilevel and pix.n == 1:
+        gray = np.frombuffer(pix.samples, dtype=np.uint8)
+        bilevel = np.count_nonzero((gray > 32) & (gray < 224)) <= gray.size * BILEVEL_MIDTONES
+    target_dpi = max(dpi, BILEVEL_DPI) if bilevel and dpi else dpi
+    downsample = None
+    if target_dpi:
+        scale = max(size[0] / 72 * target_dpi / pix.width, size[1] / 72 * target_dpi / pix.height)
+        if scale * DOWNSAMPLE_MARGIN < 1: downsample = (max(1, round(pix.width * scale)), max(1, round(pix.height * scale)))
+    if downsample is None and not (bilevel and source_filter not in _BILEVEL_FILTERS):
+        return xref, digest, None
+    if downsample: image = image.resize(downsample, Image.LANCZOS, reducing_gap=3.0)
+    if bilevel:
+        data, filter_name, parms = _encode_bilevel(image.point(lambda v: 255 if v >= 128 else 0).convert("1"))
+        bpc, colorspace = 1, "/DeviceGray"
+    else:
+        out = io.BytesIO()
+        image.save(out, "JPEG", quality=quality, optimize=True)
+        data, filter_name, parms = out.getvalue(), "/DCTDecode", "null"
+        bpc, colorspace = 8, "/DeviceGray" if image.mode == "L" else "/DeviceRGB"
+    if raw_size and len(data) > raw_size * MIN_SAVING: return xref, digest, None
+    return xref, digest, (data, filter_name, parms, image.width, image.height, bpc, colorspace)
+
+
+def recompress_images(path, tasks, dpi=DEFAULT_DPI, quality=DEFAULT_QUALITY):
+    """Dijalankan di proses worker; lihat measure_pages."""
+    with fitz.open(path) as doc:
+        return recompress_all(doc, tasks, dpi, quality)
+
+
+def recompress_all(doc, tasks, dpi=DEFAULT_DPI, quality=DEFAULT_QUALITY):
+    """recompress_image untuk setiap (xref, ukuran tampil) di tasks; gambar yang gagal dilewati."""
+    results = []
+    for xref, size in tasks:
+        try:
+            results.append(recompress_image(doc, xref, size, dpi, quality))
+        except Exception as e:
+            print(f"Gagal memproses gambar xref {xref}: {e}")
+            results.append((xref, None, None))
+    return results
+
+
+def _direct_key(doc, xref, path):
+    """(xref, key) tempat path seperti "Resources/XObject/Im0" benar-benar disimpan.
+
+    xref_set_key tidak bisa menembus referensi tidak langsung di tengah path.
+    """
+    parts = path.split("/")
+    keys = []
+    for part in parts[:-1]:
+        kind, value = doc.xref_get_key(xref, "/".join(keys + [part]))
+        if kind == "xref": xref, keys = int(value.split()[0]), []
+        else: keys.append(part)
+    return xref, "/".join(keys + parts[-1:])
+
+
+def apply_results(doc, results):
+    """Menerapkan hasil recompress_images ke doc; mengembalikan statistik perubahan."""
+    stats = {"images": len(results), "recompressed": 0, "bilevel": 0, "duplicates": 0, "saved": 0}
+    keep = {}
+    duplicate_of = {}
+    for xref, digest, replacement in sorted(results):
+        if digest is not None:
+            if digest in keep:
+                duplicate_of[xref] = keep[digest]
+                continue
+            keep[digest] = xref
+        if replacement is None: continue
+        data, filter_name, parms, width, height, bpc, colorspace = replacement
+        stats["saved"] += len(doc.xref_stream_raw(xref) or b"") - len(data)
+        doc.update_stream(xref, data, compress=False)
+        for key, value in (("Filter", filter_name), ("DecodeParms", parms), ("Width", str(width)), ("Height", str(height)),
+                           ("BitsPerComponent", str(bpc)), ("ColorSpace", colorspace)):
+            doc.xref_set_key(xref, key, value)
+        stats["recompressed"] += 1
+        stats["bilevel"] += bpc == 1
+    if duplicate_of:
+        referencers = set()
+        for page in doc:
+            for xref, _, _, _, _, _, _, name, _, referencer in page.get_images(full=True):
+                if xref in duplicate_of and (referencer or page.xref, name) not in referencers:
+                    referencers.add((referencer or page.xref, name))
+                    owner, key = _direct_key(doc, referencer or page.xref, f"Resources/XObject/{name}")
+                    doc.xref_set_key(owner, key, f"{duplicate_of[xref]} 0 R")
+        stats["duplicates"] = len(duplicate_of)
+    return stats
+
+
+def image_tasks(sizes, chunk=RECOMPRESS_CHUNK):
+    """Membagi {xref: ukuran} menjadi daftar tugas untuk recompress_images."""
+    items = sorted(sizes.items())
+    return [items[i:i + chunk] for i in range(0, len(items), chunk)]
+
+
+def optimize_document(doc, out_path, dpi=DEFAULT_DPI, quality=DEFAULT_QUALITY):
+    """Versi berurutan untuk satu proses (mis. worker pdf_cli): mengubah doc lalu menyimpannya ke out_path."""
+    stats = apply_results(doc, recompress_all(doc, sorted(measure_images(doc, 0, len(doc) - 1).items()), dpi, quality))
+    doc.save(out_path, **SAVE_OPTIONS)
+    return stats
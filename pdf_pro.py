@@ -1,17 +1,43 @@
+import pdf_startup
+pdf_startup.install_lazy_modules()  # fitz dan modul NumPy baru dimuat saat pertama dipakai
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from PIL import Image, ImageTk
-import fitz  # PyMuPDF
 import os
-import threading
-import queue
+import time
+import itertools
+import argparse
+import tempfile
+import multiprocessing
+from pdf_render import ThumbnailEngine, render_thumbnail, rotate_thumbnail, blank_thumbnail, ppm_data
+from pdf_cache import ThumbnailCache, file_fingerprint, thumbnail_key
+from pdf_jobs import JobScheduler
+from pdf_model import PageModel
+from pdf_history import History, MovePages, RemovePages, RotatePages
+from pdf_trace import tracer
+from pdf_index import TextIndex, default_index_dir, extract_words, page_chunks
+import pdf_analysis
+import pdf_optimize
+from pdf_memory import BudgetedCache, PHOTO_BYTES_PER_PIXEL, budget_bytes, format_bytes, process_memory, shrink_decode_cache
+import pdf_core
+import pdf_stream
+from pdf_core import PAPER_SIZES
 
-PAPER_SIZES = {
-    "A4": (595, 842), "Letter": (612, 792), "Legal": (612, 1008),
-    "A3": (842, 1191), "Ukuran Asli Gambar": None
-}
+# Geometri grid pratinjau virtual. Ukuran slot = kotak thumbnail + SLOT_PADDING (bingkai, label, tombol).
+ZOOM_LEVELS = {"Kecil": (140, 190), "Sedang": (280, 380), "Besar": (560, 760)}
+DEFAULT_ZOOM = "Sedang"
+SLOT_PADDING, SLOT_GAP = (80, 120), 24
+PREVIEW_OVERSCAN = 1      # Baris ekstra di atas/bawah viewport yang tetap disiapkan
+DRAFT, FULL = 0, 1        # Level thumbnail: draf resolusi rendah lalu kualitas penuh
+DRAFT_FACTOR = 4          # Draf dirender pada 1/DRAFT_FACTOR ukuran kotak
+THUMB_MEMORY_SHARE = 0.25 # Bagian anggaran memori untuk thumbnail di memori (samples + PhotoImage)
+MEMORY_POLL_MS = 1000     # Interval pembaruan label memori dan pemeriksaan anggaran
+ROTATION_RERENDER = True  # Setelah thumbnail diputar di memori, render ulang presisi tetap dijadwalkan
+MERGE_BUDGET_MS = 30      # Waktu maksimum per tugas penggabungan PDF di thread dokumen
+MERGE_MAX_CHUNK = 256     # Batas halaman per panggilan insert_pdf
+DRAG_THRESHOLD = 8        # Jarak geser (piksel) sebelum klik dianggap drag
+DRAG_SCROLL_MARGIN = 40   # Jarak dari tepi canvas yang memicu scroll otomatis saat drag
 
 class PDFEditorApp:
     def __init__(self, root):
@@ -21,16 +47,51 @@ class PDFEditorApp:
         self.root.minsize(800, 600)
         self.pdf_document = None
         self.file_path = None
-        self.previews = []
-        self.preview_frames = []
-        self.selected_page_index = None
+        self.streaming = False           # Dokumen besar/jaringan: halaman dibaca saat ditampilkan (lihat pdf_stream)
+        self.read_ahead = pdf_stream.read_ahead_pages()
+        self._scroll_forward = True
+        self._window_start = 0
+        self.pages = PageModel()         # Urutan halaman sebagai uid stabil + file sumber tiap halaman
+        self.memory_budget = budget_bytes()
+        # uid halaman -> (level, PhotoImage, samples, basi); LRU yang dibatasi byte, bukan jumlah
+        self.thumbnails = BudgetedCache(int(self.memory_budget * THUMB_MEMORY_SHARE), self._thumbnail_bytes)
+        self.preview_slots = []          # Pool widget pratinjau yang didaur ulang
+        self._free_slots = []
+        self._bound_slots = {}           # uid halaman -> slot yang sedang menampilkannya
+        self._slot_by_frame = {}         # widget bingkai -> slot, untuk lookup O(1) dari event
+        self.selection = set()           # uid halaman yang dipilih
+        self._anchor_uid = None          # Halaman jangkar untuk Shift+klik (klik terakhir)
+        self.history = History()         # Log operasi untuk urungkan/ulangi
+        self.stash = None                # Dokumen kecil berisi halaman terhapus yang tidak punya file sumber
         
-        self.image_queue = queue.Queue()
-        self.save_queue = queue.Queue() # Untuk status penyimpanan
+        self.jobs = JobScheduler(self.root)  # Semua pekerjaan latar belakang (render, simpan, impor)
+        self.jobs.on_batch_end(self._on_jobs_batch_end)
+        self.jobs.on_batch_end(self._flush_image_import)
+        self.thumb_cache = self._open_thumbnail_cache()
+        self.render_engine = ThumbnailEngine(self.jobs, self._on_thumbnail_rendered, cache=self.thumb_cache)
+        self._fingerprints = {}          # path sumber -> sidik jari untuk kunci cache; False selagi dihitung, None bila gagal
+        self._render_pending = {}        # (uid, level) -> token permintaan yang sedang dirender atau dibaca dari cache
+        self._render_tokens = itertools.count(1)
+        self._memory_jobs = {}           # (uid, level) -> Job thread: render dari dokumen di memori atau baca cache disk
+        self._initial_pages = set()
+        self._preview_status_dirty = False
+        self._refresh_scheduled = False
+        self._slot_size, self._row_height, self._columns = (0, 0), 1, 1
         
         self.loading_frame = None
         self.saving_dialog = None # Untuk dialog 'Menyimpan...'
         self.is_loading = False
+        self._image_import = None        # Status impor gambar latar belakang yang sedang berjalan
+        self._merge = None               # Status penggabungan PDF bertahap yang sedang berjalan
+        self._editing_locked = False
+        self._drag = None                # Status drag-and-drop halaman: index asal, posisi awal, aktif
+        self._drop_marker = None
+        self._memory_poll = None
+        self._diagnostics = None         # Jendela panel diagnostik bila sedang terbuka
+        self.text_indexes = {}           # path file sumber -> ((mtime, size), TextIndex)
+        self._indexing = {}              # path -> status pengindeksan teks yang sedang berjalan
+        self._search = None              # [query, index halaman yang cocok, posisi hasil saat ini]
+        self._startup = None             # Pengukuran startup yang belum selesai (lihat startup())
         
         self.root.configure(bg="#f8f9fa")
         try:
@@ -38,7 +99,22 @@ class PDFEditorApp:
             if os.path.exists(icon_path): self.root.iconbitmap(icon_path)
         except Exception as e: print(f"Gagal mengatur ikon: {e}")
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         self.display_previews()
+        self._poll_memory()
+
+    def _on_close(self):
+        if self._memory_poll: self.root.after_cancel(self._memory_poll)
+        self.jobs.shutdown()
+        if self.thumb_cache: self.thumb_cache.close()
+        self.root.destroy()
+
+    def _open_thumbnail_cache(self):
+        try:
+            return ThumbnailCache()
+        except OSError as e:
+            print(f"Cache thumbnail tidak tersedia: {e}")
+            return None
 
     # --- Bagian Setup UI (Tidak Ada Perubahan) ---
     def setup_ui(self):
@@ -58,8 +134,16 @@ class PDFEditorApp:
         self.btn_open.pack(side=LEFT, padx=(0, 8))
         self.btn_new = ttk.Button(file_ops_frame, text="📄 PDF Baru", command=self.new_empty_pdf, bootstyle="info", width=15)
         self.btn_new.pack(side=LEFT, padx=8)
+        self.btn_undo = ttk.Button(file_ops_frame, text="↶ Urungkan", state=DISABLED, command=self.undo, bootstyle="secondary-outline", width=12)
+        self.btn_undo.pack(side=LEFT, padx=8)
+        self.btn_redo = ttk.Button(file_ops_frame, text="↷ Ulangi", state=DISABLED, command=self.redo, bootstyle="secondary-outline", width=12)
+        self.btn_redo.pack(side=LEFT, padx=8)
+        self.root.bind("<Control-z>", lambda e: self.undo())
+        self.root.bind("<Control-y>", lambda e: self.redo())
         self.btn_save = ttk.Button(file_ops_frame, text="💾 Simpan Sebagai", state=DISABLED, command=self.save_pdf, bootstyle="success", width=15)
         self.btn_save.pack(side=RIGHT)
+        self.btn_quick_save = ttk.Button(file_ops_frame, text="💾 Simpan", state=DISABLED, command=self.quick_save, bootstyle="success-outline", width=12)
+        self.btn_quick_save.pack(side=RIGHT, padx=8)
         page_ops_frame = ttk.Frame(toolbar_frame)
         page_ops_frame.pack(fill=X)
         self.btn_add = ttk.Button(page_ops_frame, text="➕ Tambah Halaman", state=DISABLED, command=self.add_pages, bootstyle="info-outline", width=18)
@@ -68,12 +152,41 @@ class PDFEditorApp:
         self.btn_delete.pack(side=LEFT, padx=8)
         self.btn_delete_range = ttk.Button(page_ops_frame, text="🗂️ Hapus Rentang", state=DISABLED, command=self.delete_page_range, bootstyle="warning-outline", width=18)
         self.btn_delete_range.pack(side=LEFT, padx=8)
+        self.btn_split = ttk.Button(page_ops_frame, text="✂️ Pisah / Ekspor", state=DISABLED, command=self.split_pdf, bootstyle="secondary-outline", width=18)
+        self.btn_split.pack(side=LEFT, padx=8)
+        self.btn_move = ttk.Button(page_ops_frame, text="↕️ Pindah Rentang", state=DISABLED, command=self.move_page_range, bootstyle="secondary-outline", width=18)
+        self.btn_move.pack(side=LEFT, padx=8)
+        self.btn_cleanup = ttk.Button(page_ops_frame, text="🧹 Kosong / Duplikat", state=DISABLED, command=self.find_blank_and_duplicate_pages, bootstyle="secondary-outline", width=18)
+        self.btn_cleanup.pack(side=LEFT, padx=8)
+        selection_ops_frame = ttk.Frame(toolbar_frame)
+        selection_ops_frame.pack(fill=X, pady=(10, 0))
+        self.btn_select = ttk.Menubutton(selection_ops_frame, text="☑️ Pilih", state=DISABLED, bootstyle="secondary-outline", width=12)
+        select_menu = tk.Menu(self.btn_select, tearoff=0)
+        select_menu.add_command(label="Semua Halaman", command=lambda: self.select_pages(range(len(self.pdf_document))))
+        select_menu.add_command(label="Halaman Ganjil", command=lambda: self.select_pages(range(0, len(self.pdf_document), 2)))
+        select_menu.add_command(label="Halaman Genap", command=lambda: self.select_pages(range(1, len(self.pdf_document), 2)))
+        select_menu.add_separator()
+        select_menu.add_command(label="Batalkan Pilihan", command=lambda: self.select_pages(()))
+        self.btn_select.config(menu=select_menu)
+        self.btn_select.pack(side=LEFT, padx=(0, 8))
+        self.btn_rotate_left = ttk.Button(selection_ops_frame, text="↺ Putar Pilihan", state=DISABLED, command=lambda: self.rotate_selection(-90), bootstyle="secondary-outline", width=16)
+        self.btn_rotate_left.pack(side=LEFT, padx=8)
+        self.btn_rotate_right = ttk.Button(selection_ops_frame, text="Putar Pilihan ↻", state=DISABLED, command=lambda: self.rotate_selection(90), bootstyle="secondary-outline", width=16)
+        self.btn_rotate_right.pack(side=LEFT, padx=8)
+        ttk.Label(selection_ops_frame, text="Ctrl+klik / Shift+klik untuk memilih banyak halaman", font=("Segoe UI", 9), foreground="#7f8c8d").pack(side=LEFT, padx=8)
+        ttk.Button(selection_ops_frame, text="🐞 Diagnostik", command=self.show_diagnostics, bootstyle="link", width=12).pack(side=RIGHT)
+        self.root.bind("<Control-Shift-D>", lambda e: self.show_diagnostics())
         status_frame = ttk.Frame(main_frame)
         status_frame.pack(fill=X, pady=(0, 15))
         status_container = ttk.LabelFrame(status_frame, text="📊 Status Dokumen", padding=10)
         status_container.pack(fill=X)
-        self.info_label = ttk.Label(status_container, text="🎯 Buka file PDF atau buat PDF baru", font=("Segoe UI", 11), foreground="#34495e")
-        self.info_label.pack(fill=X)
+        info_row = ttk.Frame(status_container)
+        info_row.pack(fill=X)
+        self.info_label = ttk.Label(info_row, text="🎯 Buka file PDF atau buat PDF baru", font=("Segoe UI", 11), foreground="#34495e")
+        self.info_label.pack(side=LEFT, fill=X, expand=True)
+        self.memory_label = ttk.Label(info_row, text="", font=("Segoe UI", 9), foreground="#7f8c8d")
+        self.memory_label.pack(side=RIGHT)
+        self.task_progress = ttk.Progressbar(status_container, mode='determinate', bootstyle="striped-info")
         ttk.Separator(main_frame, orient=HORIZONTAL).pack(fill=X, pady=(0, 15))
         self.setup_pdf_mode(main_frame)
         
@@ -84,14 +197,27 @@ class PDFEditorApp:
         info_panel.pack(fill=X, pady=(0, 10))
         preview_info = ttk.Label(info_panel, text="💡 Klik halaman untuk memilih. Gunakan tombol untuk memutar.", font=("Segoe UI", 9), foreground="#7f8c8d")
         preview_info.pack(side=LEFT)
+        ttk.Label(info_panel, text="🔍", font=("Segoe UI", 9)).pack(side=LEFT, padx=(20, 4))
+        self.search_entry = ttk.Entry(info_panel, width=24)
+        self.search_entry.pack(side=LEFT)
+        self.search_entry.bind("<Return>", lambda e: self.search_text(1))
+        self.search_entry.bind("<Shift-Return>", lambda e: self.search_text(-1))
+        self.search_status = ttk.Label(info_panel, text="", font=("Segoe UI", 9), foreground="#7f8c8d")
+        self.search_status.pack(side=LEFT, padx=(6, 0))
+        self.root.bind("<Control-f>", lambda e: self.search_entry.focus_set())
+        self.zoom_var = tk.StringVar(value=DEFAULT_ZOOM)
+        for zoom_name in reversed(list(ZOOM_LEVELS)):
+            ttk.Radiobutton(info_panel, text=zoom_name, variable=self.zoom_var, value=zoom_name, command=self._on_zoom_change, bootstyle="secondary-outline-toolbutton").pack(side=RIGHT, padx=(4, 0))
+        ttk.Label(info_panel, text="🔎 Ukuran:", font=("Segoe UI", 9), foreground="#7f8c8d").pack(side=RIGHT, padx=(0, 4))
         canvas_container = ttk.Frame(self.pdf_frame)
         canvas_container.pack(fill=BOTH, expand=True)
         self.canvas = tk.Canvas(canvas_container, highlightthickness=0, bg="#ecf0f1", relief="flat")
         self.scrollbar = ttk.Scrollbar(canvas_container, orient=VERTICAL, command=self.canvas.yview, bootstyle="round-primary")
-        self.scrollable_frame = ttk.Frame(self.canvas)
-        self.scrollable_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="n")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.configure(yscrollcommand=self._on_canvas_scroll)
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
+        self.empty_frame = ttk.Frame(self.canvas)
+        ttk.Label(self.empty_frame, text="📁\n\nTidak ada dokumen PDF yang terbuka", font=("Segoe UI", 14), foreground="#bdc3c7", justify=CENTER).pack(expand=True, pady=50)
+        self.empty_window = self.canvas.create_window((0, 0), window=self.empty_frame, anchor=N)
         self.canvas.pack(side=LEFT, fill=BOTH, expand=True)
         self.scrollbar.pack(side=RIGHT, fill=Y)
         self.root.bind_all("<MouseWheel>", self._on_mousewheel)
@@ -121,6 +247,24 @@ class PDFEditorApp:
             self.saving_dialog.destroy()
             self.saving_dialog = None
 
+    def _show_task_progress(self, total):
+        """Progress bar di panel status untuk pekerjaan latar belakang yang tidak memblokir UI."""
+        self.task_progress.config(maximum=max(1, total), value=0)
+        self.task_progress.pack(fill=X, pady=(8, 0))
+
+    def _hide_task_progress(self):
+        self.task_progress.pack_forget()
+        self.update_info_label()
+
+    def _set_editing_enabled(self, enabled):
+        """Mengunci operasi yang mengubah struktur dokumen selama pekerjaan latar belakang berjalan."""
+        self._editing_locked = not enabled
+        state = NORMAL if enabled else DISABLED
+        for button in (self.btn_open, self.btn_new, self.btn_add, self.btn_save, self.btn_quick_save, self.btn_delete_range, self.btn_split, self.btn_move, self.btn_cleanup, self.btn_select): button.config(state=state)
+        if enabled: self.update_ui_after_load()
+        self._update_history_buttons()
+        self._update_selection_buttons()
+
     def show_loading_indicator(self, total_pages):
         self.hide_loading_indicator()
         self.is_loading = True
@@ -152,128 +296,505 @@ class PDFEditorApp:
     def _on_mousewheel(self, event):
         if not self.is_loading:
             self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-            
+
+    def _on_canvas_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._schedule_preview_refresh()
+
+    def _on_canvas_configure(self, event):
+        self.canvas.coords(self.empty_window, event.width // 2, 0)
+        self.canvas.itemconfigure(self.empty_window, width=event.width)
+        self._update_layout()
+        for slot in self._bound_slots.values():
+            self.canvas.coords(slot['window'], *self._slot_position(slot['page']))
+        self._schedule_preview_refresh()
+
+    def _on_zoom_change(self):
+        """Mengganti ukuran grid; thumbnail dirender ulang pada resolusi yang sesuai."""
+        first_visible = self._visible_page_range().start
+        self.thumbnails.clear()
+        self._reset_rendering()
+        self._update_layout()
+        for slot in self.preview_slots:
+            self.canvas.itemconfigure(slot['window'], width=self._slot_size[0], height=self._slot_size[1])
+        self._scroll_to_page(first_visible)
+        self._refresh_visible_previews(rebind=True)
+
     # --- Bagian Pratinjau dan Manipulasi UI ---
     def display_previews(self):
         self.is_loading = False
         self.hide_loading_indicator()
-        for widget in self.scrollable_frame.winfo_children(): widget.destroy()
-        self.previews.clear()
-        self.preview_frames.clear()
+        self._reset_rendering()
+        for slot in list(self._bound_slots.values()): self._release_slot(slot)
+        self.thumbnails.clear()
+        self.selection.clear()
+        self.canvas.yview_moveto(0)
+        self._window_start, self._scroll_forward = 0, True
+        self._update_layout()
         if not self.pdf_document:
-            empty_frame = ttk.Frame(self.scrollable_frame)
-            empty_frame.pack(expand=True, fill=BOTH, pady=50)
-            ttk.Label(empty_frame, text="📁\n\nTidak ada dokumen PDF yang terbuka", font=("Segoe UI", 14), foreground="#bdc3c7", justify=CENTER).pack(expand=True)
+            self.canvas.itemconfigure(self.empty_window, state=NORMAL)
             self.update_info_label()
             return
+        self.canvas.itemconfigure(self.empty_window, state=HIDDEN)
         page_count = len(self.pdf_document)
         self.update_info_label()
         if page_count > 0:
-            self.show_loading_indicator(page_count)
-            threading.Thread(target=self._load_pages_worker, daemon=True).start()
-            self.root.after(100, self._process_image_queue)
-        self.selected_page_index = None
-        self.btn_delete.config(state=DISABLED)
+            self.canvas.update_idletasks()
+            self._refresh_visible_previews()
+            window = {self.pages.uid(i) for i in self._visible_page_range(PREVIEW_OVERSCAN)}
+            self._initial_pages = {uid for uid, level in self._render_pending if uid in window}
+            if self._initial_pages: self.show_loading_indicator(len(self._initial_pages))
+        self._update_selection_buttons()
         self.btn_delete_range.config(state=NORMAL if page_count > 0 else DISABLED)
 
-    def _load_pages_worker(self):
-        if not self.pdf_document: return
-        for i, page in enumerate(self.pdf_document):
-            if not self.is_loading: break
-            pix = page.get_pixmap(dpi=96)
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-            img.thumbnail((280, 380))
-            self.image_queue.put((i, img))
-        self.image_queue.put(None)
-        
-    def _process_image_queue(self):
+    def _thumb_box(self, level=FULL):
+        box = ZOOM_LEVELS[self.zoom_var.get()]
+        return box if level == FULL else (box[0] // DRAFT_FACTOR, box[1] // DRAFT_FACTOR)
+
+    def _update_layout(self):
+        """Menghitung ukuran slot dan jumlah kolom grid dari level zoom dan lebar canvas."""
+        box = self._thumb_box()
+        self._slot_size = (box[0] + SLOT_PADDING[0], box[1] + SLOT_PADDING[1])
+        self._row_height = self._slot_size[1] + SLOT_GAP
+        self._columns = max(1, self.canvas.winfo_width() // (self._slot_size[0] + SLOT_GAP))
+        page_count = len(self.pdf_document) if self.pdf_document else 0
+        rows = -(-page_count // self._columns)
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), max(rows * self._row_height, 1)))
+
+    def _slot_position(self, index):
+        row, column = divmod(index, self._columns)
+        cell_width = self._slot_size[0] + SLOT_GAP
+        left = (self.canvas.winfo_width() - self._columns * cell_width) // 2
+        return left + column * cell_width + cell_width // 2, row * self._row_height + SLOT_GAP // 2
+
+    def _visible_page_range(self, overscan=0):
+        page_count = len(self.pdf_document) if self.pdf_document else 0
+        if page_count == 0: return range(0)
+        top = self.canvas.canvasy(0)
+        bottom = self.canvas.canvasy(self.canvas.winfo_height())
+        first_row = max(0, int(top // self._row_height) - overscan)
+        last_row = int(bottom // self._row_height) + overscan
+        return range(min(first_row * self._columns, page_count), min((last_row + 1) * self._columns, page_count))
+
+    def _scroll_to_page(self, index):
+        page_count = len(self.pdf_document) if self.pdf_document else 0
+        rows = -(-page_count // self._columns)
+        if rows: self.canvas.yview_moveto((index // self._columns) / rows)
+
+    def _schedule_preview_refresh(self):
+        if not self._refresh_scheduled:
+            self._refresh_scheduled = True
+            self.root.after_idle(self._refresh_visible_previews)
+
+    def _refresh_visible_previews(self, rebind=False):
+        """Mengikat slot widget hanya ke halaman di viewport (+ overscan) dan meminta thumbnail yang belum ada."""
+        self._refresh_scheduled = False
+        if self._merge and self._merge['busy']:
+            self._merge['refresh'] = self._merge.get('refresh', False) or rebind  # Menyusul setelah putaran penggabungan
+            return
+        visible = self._visible_page_range()
+        window = self._visible_page_range(PREVIEW_OVERSCAN)
+        window_uids = {self.pages.uid(index): index for index in window}
+        ahead = self._read_ahead_pages(window)
+        for uid, slot in list(self._bound_slots.items()):
+            if rebind or window_uids.get(uid) != slot['page']: self._release_slot(slot)
+        for uid, index in window_uids.items():
+            if uid not in self._bound_slots: self._bind_slot(self._acquire_slot(), index)
+        # Draf dan penyempurnaan untuk halaman yang sudah di-scroll keluar dibatalkan.
+        wanted_keys = {(uid, level) for uid in window_uids for level in (DRAFT, FULL)}
+        wanted_keys.update((self.pages.uid(index), level) for index in ahead for level in (DRAFT, FULL))
+        wanted_requests = {key + (token,) for key, token in self._render_pending.items() if key in wanted_keys}
+        for request in self.render_engine.retain(wanted_requests): self._finish_request(request)
+        for key in [key for key in self._memory_jobs if key not in wanted_keys]:
+            self._memory_jobs.pop(key).cancel()
+            self._render_pending.pop(key, None)
+        # Halaman yang benar-benar terlihat diminta lebih dulu, baru overscan, lalu read-ahead.
+        self._request_thumbnails([(i, 0 if i in visible else 1) for i in window] + [(i, 2) for i in ahead])
+
+    def _read_ahead_pages(self, window):
+        """Mode streaming: halaman di depan arah scroll terakhir yang ikut disiapkan."""
+        if not self.streaming or not window: return range(0)
+        if window.start != self._window_start: self._scroll_forward = window.start > self._window_start
+        self._window_start = window.start
+        return pdf_stream.read_ahead_range(window, self._scroll_forward, self.read_ahead, len(self.pages))
+
+    def _acquire_slot(self):
+        if self._free_slots: return self._free_slots.pop()
+        slot = self._create_preview_slot()
+        self.preview_slots.append(slot)
+        self._slot_by_frame[slot['frame']] = slot
+        return slot
+
+    def _release_slot(self, slot):
+        self._bound_slots.pop(slot['uid'], None)
+        slot['page'] = slot['uid'] = None
+        self.canvas.itemconfigure(slot['window'], state=HIDDEN)
+        self._free_slots.append(slot)
+
+    def _bind_slot(self, slot, index):
+        slot['page'], slot['uid'] = index, self.pages.uid(index)
+        self._bound_slots[slot['uid']] = slot
+        # Label dihitung saat slot diikat, jadi hanya halaman yang terlihat yang pernah diberi label.
+        slot['frame'].config(text=f"📃 Halaman {index + 1}", bootstyle="primary" if slot['uid'] in self.selection else "secondary")
+        self._show_thumbnail(slot)
+        self.canvas.coords(slot['window'], *self._slot_position(index))
+        self.canvas.itemconfigure(slot['window'], state=NORMAL)
+
+    def _show_thumbnail(self, slot):
+        entry = self.thumbnails.get(slot['uid'])
+        if entry is not None:
+            self.thumbnails.touch(slot['uid'])
+            slot['img_label'].config(image=entry[1], text="")
+        else:
+            slot['img_label'].config(image="", text="⏳ Memuat...")
+
+    def _store_thumbnail(self, uid, level, thumb, stale=False):
+        """Menyimpan thumbnail beserta samples mentahnya (dipakai untuk memutar tanpa render ulang)."""
+        current = self.thumbnails.get(uid)
+        if current is not None and not current[3] and current[0] > level: return  # Draf yang datang terlambat diabaikan
+        self.thumbnails[uid] = (level, self._photo_from_samples(thumb, level), thumb, stale)
+        # Buang thumbnail yang paling lama tidak dilihat, kecuali yang sedang tampil.
+        self.thumbnails.evict(keep=self._bound_slots)
+        slot = self._bound_slots.get(uid)
+        if slot: self._show_thumbnail(slot)
+
+    @staticmethod
+    def _thumbnail_bytes(entry):
+        photo = entry[1]
+        return len(entry[2][2]) + photo.width() * photo.height() * PHOTO_BYTES_PER_PIXEL
+
+    def _poll_memory(self):
+        """Memperbarui label memori di panel status dan menegakkan anggaran memori.
+
+        Bila memori proses melewati anggaran, cache dekode MuPDF dikosongkan sebagian dan
+        separuh thumbnail yang tidak tampil dibuang; keduanya dibuat ulang saat dibutuhkan.
+        """
+        rss = process_memory()
+        over_budget = rss is not None and rss > self.memory_budget
+        if over_budget:
+            shrink_decode_cache(50)
+            self.thumbnails.evict(keep=self._bound_slots, target=self.thumbnails.used // 2)
+        text = f"🧠 Thumbnail {format_bytes(self.thumbnails.used)}"
+        if rss is not None: text += f"  |  Memori {format_bytes(rss)} / {format_bytes(self.memory_budget)}"
+        self.memory_label.config(text=text, foreground="#c0392b" if over_budget else "#7f8c8d")
+        self._memory_poll = self.root.after(MEMORY_POLL_MS, self._poll_memory)
+
+    def _request_thumbnails(self, requests):
+        """requests berisi (index, prioritas). Draf murah diminta lebih dulu, lalu versi penuh untuk menyempurnakannya.
+
+        Halaman dari file dicari dulu di cache disk (di thread) lalu dirender di process pool, sisanya di thread.
+        Selama sidik jari file sumber masih dihitung hanya draf yang diminta; versi penuh menyusul.
+        """
+        for i, priority in requests:
+            uid = self.pages.uid(i)
+            current = self.thumbnails.get(uid)
+            if current is not None and current[0] == FULL and not current[3]: continue
+            source = self.pages.source(i)
+            rotation = self.pdf_document[i].rotation
+            cache_key = self._thumbnail_cache_key(source, rotation) if source else None
+            if cache_key:
+                self._submit_cache_read(i, source, rotation, priority, cache_key)
+                continue
+            if current is None: self._submit_render(i, DRAFT, source, rotation, priority * 2, visible=priority == 0)
+            if cache_key is not False: self._submit_render(i, FULL, source, rotation, priority * 2 + 1, visible=priority == 0)
+
+    def _start_request(self, key):
+        """Mencatat permintaan baru untuk key (uid, level); (uid, level, token) atau None bila key masih berjalan."""
+        if key in self._render_pending: return None
+        token = self._render_pending[key] = next(self._render_tokens)
+        return key + (token,)
+
+    def _finish_request(self, request):
+        """Menutup request bila masih yang terbaru untuk key-nya; False bila sudah dibatalkan atau digantikan."""
+        key = request[:2]
+        if self._render_pending.get(key) != request[2]: return False
+        del self._render_pending[key]
+        self._memory_jobs.pop(key, None)
+        return True
+
+    def _submit_cache_read(self, index, source, rotation, priority, cache_key):
+        key = (self.pages.uid(index), FULL)
+        request = self._start_request(key)
+        if request is None: return
+        self._memory_jobs[key] = self.jobs.submit(self._read_cached_thumbnail, cache_key, priority=priority * 2,
+                                                  on_done=lambda thumb: self._on_cache_read(request, thumb, source, rotation, priority, cache_key))
+
+    def _read_cached_thumbnail(self, job, cache_key):
+        return self.thumb_cache.get(cache_key)
+
+    def _on_cache_read(self, request, thumb, source, rotation, priority, cache_key):
+        if thumb:
+            self._on_thumbnail_rendered(request, thumb)
+            return
+        if not self._finish_request(request): return  # Dibatalkan atau digantikan selagi cache dibaca
+        index = self.pages.index_of(request[0])
+        if index is None: return
+        if self.thumbnails.get(request[0]) is None: self._submit_render(index, DRAFT, source, rotation, priority * 2, visible=priority == 0)
+        self._submit_render(index, FULL, source, rotation, priority * 2 + 1, cache_key, visible=priority == 0)
+
+    def _submit_render(self, index, level, source, rotation, priority, cache_key=None, visible=False):
+        key = (self.pages.uid(index), level)
+        request = self._start_request(key)
+        if request is None: return
+        size = self._thumb_box(level)
+        # Sebelum worker process siap, hanya halaman yang terlihat yang dirender dari dokumen di memori
+        # (satu per satu di thread dokumen); sisanya menunggu di antrean process pool.
+        if source and (self.jobs.processes_ready or not visible):
+            self.render_engine.submit(request, source[0], source[1], rotation, size, priority, cache_key)
+        else:
+            self._memory_jobs[key] = self.jobs.submit(self._render_memory_page, self.pdf_document, request, index, size, priority=priority, document=True,
+                                                      on_done=lambda result: self._on_thumbnail_rendered(*result))
+
+    def _thumbnail_cache_key(self, source, rotation):
+        """Kunci cache disk halaman; None bila tanpa cache, False selagi sidik jari file dihitung.
+
+        Sidik jari membaca beberapa MB dari file (lambat di share jaringan), jadi dihitung sekali per
+        file di thread dan diingat sampai file dibuka ulang atau disimpan.
+        """
+        if not self.thumb_cache: return None
+        path, pno, xref = source
+        if path not in self._fingerprints:
+            self._fingerprints[path] = False
+            self.jobs.submit(lambda job: file_fingerprint(path), priority=-1, generation=None,
+                             on_done=lambda fingerprint: self._on_fingerprint(path, fingerprint),
+                             on_error=lambda e: self._on_fingerprint(path, None))
+        fingerprint = self._fingerprints[path]
+        if not fingerprint: return fingerprint
+        return thumbnail_key(fingerprint, f"p{pno}" if xref is None else xref, rotation, self._thumb_box(), "gray" if self.render_engine.grayscale else "rgb")
+
+    def _on_fingerprint(self, path, fingerprint):
+        if self._fingerprints.get(path) is not False: return  # Sudah dilupakan (file dibuka ulang/disimpan)
+        self._fingerprints[path] = fingerprint
+        if self.pdf_document: self._refresh_visible_previews()
+
+    def _photo_from_samples(self, thumb, level):
+        photo = tk.PhotoImage(data=ppm_data(thumb))
+        if level == DRAFT:
+            # Draf diperbesar (nearest-neighbour) agar langsung mengisi ukuran kotak penuh.
+            box = self._thumb_box()
+            factor = max(1, min(box[0] // thumb[0], box[1] // thumb[1]))
+            if factor > 1: photo = photo.zoom(factor)
+        return photo
+
+    def _reset_rendering(self):
+        """Memulai generasi dokumen baru: semua render lama dibatalkan dan hasilnya diabaikan."""
+        self.jobs.new_generation()
+        self.render_engine.reset()
+        self._render_pending.clear()
+        self._memory_jobs.clear()
+
+    def _close_document(self):
+        """Membatalkan render dari dokumen saat ini lalu menutupnya setelah pekerjaan dokumen yang sedang berjalan selesai."""
+        self._reset_rendering()
+        with self.jobs.document_lock: self.pdf_document.close()
+
+    def _cancel_memory_renders(self):
+        """Render halaman tanpa file sumber memakai index saat dikirim, jadi dibatalkan bila urutan berubah."""
+        for key, job in self._memory_jobs.items():
+            job.cancel()
+            self._render_pending.pop(key, None)
+        self._memory_jobs.clear()
+
+    def _render_memory_page(self, job, doc, request, index, size):
+        """Merender halaman yang tidak punya file sumber (mis. hasil impor gambar), atau halaman mana pun
+        selama worker process belum siap (tepat setelah startup) agar halaman pertama langsung tampil.
+        Berjalan di thread dokumen, jadi tidak pernah bersamaan dengan perubahan dokumen."""
         try:
-            item = self.image_queue.get_nowait()
-            if item is None:
-                self.hide_loading_indicator()
-                return
-            page_index, img_data = item
-            new_widget_data = self._create_preview_widget(page=None, index=page_index, img_data=img_data)
-            new_widget_data['frame'].pack(pady=12, padx=15, fill=X)
-            self.previews.append(new_widget_data['photo'])
-            self.preview_frames.append({'frame': new_widget_data['frame'], 'img_label': new_widget_data['img_label']})
-            if self.loading_frame:
-                self.loading_progress['value'] = page_index + 1
-                self.loading_label.config(text=f"Memuat halaman {page_index + 1} dari {len(self.pdf_document)}...")
-        except queue.Empty:
-            pass
-        if self.is_loading:
-            self.root.after(50, self._process_image_queue)
+            return request, render_thumbnail(doc[index], size, grayscale=self.render_engine.grayscale)
+        except Exception as e:
+            # Halaman rusak ditampilkan kosong agar tidak dirender ulang terus-menerus.
+            print(f"Gagal merender halaman {index + 1}: {e}")
+            return request, blank_thumbnail()
+
+    def _on_thumbnail_rendered(self, request, thumb):
+        if not self._finish_request(request): return  # Sudah dibatalkan atau digantikan (mis. halaman diputar)
+        uid, level, _ = request
+        self._store_thumbnail(uid, level, thumb)
+        self._initial_pages.discard(uid)
+        self._preview_status_dirty = True
+        if self._startup and 'first_page' not in self._startup and self.pages.index_of(uid) == 0:
+            self._startup['first_page'] = True
+            self._startup['timer'].mark("halaman pertama tampil")
+
+    def _on_jobs_batch_end(self):
+        """Memperbarui indikator pemuatan sekali per batch hasil, bukan per halaman."""
+        if not self._preview_status_dirty: return
+        self._preview_status_dirty = False
+        if self.loading_frame:
+            done = self.loading_progress['maximum'] - len(self._initial_pages)
+            self.loading_progress['value'] = done
+            self.loading_label.config(text=f"Memuat halaman {done} dari {int(self.loading_progress['maximum'])}...")
+            if not self._initial_pages: self.hide_loading_indicator()
+        if not self._render_pending:
+            if self._startup and 'first_page' in self._startup:
+                self._startup['timer'].mark("thumbnail terlihat selesai")
+                self._finish_startup()
+            self.hide_loading_indicator()
+            if self.thumb_cache: self.jobs.submit(lambda job: self.thumb_cache.flush(), priority=10, generation=None)
 
     def _find_index_from_widget(self, frame_widget):
-        return next((i for i, item in enumerate(self.preview_frames) if item['frame'] == frame_widget), None)
+        slot = self._slot_by_frame.get(frame_widget)
+        return slot['page'] if slot else None
 
-    def handle_page_click(self, frame_widget):
+    def handle_page_click(self, frame_widget, event=None):
         index = self._find_index_from_widget(frame_widget)
-        if index is not None: self.select_page(index)
+        if index is None: return
+        state = event.state if event is not None else 0
+        mode = "range" if state & 0x0001 else "toggle" if state & 0x0004 else "single"  # Shift / Control
+        self.select_page(index, mode)
+        if mode == "single" and event is not None and not self._editing_locked: self._drag = {'index': index, 'x': event.x_root, 'y': event.y_root, 'active': False}
+
+    # --- Drag-and-drop urutan halaman ---
+    def _on_drag_motion(self, event):
+        drag = self._drag
+        if drag is None: return
+        if not drag['active']:
+            if abs(event.x_root - drag['x']) + abs(event.y_root - drag['y']) < DRAG_THRESHOLD: return
+            drag['active'] = True
+            self.canvas.config(cursor="fleur")
+        y = event.y_root - self.canvas.winfo_rooty()
+        if y < DRAG_SCROLL_MARGIN: self.canvas.yview_scroll(-1, "units")
+        elif y > self.canvas.winfo_height() - DRAG_SCROLL_MARGIN: self.canvas.yview_scroll(1, "units")
+        self._show_drop_marker(self._drop_index_at(event.x_root, event.y_root))
+
+    def _on_drag_release(self, event):
+        drag, self._drag = self._drag, None
+        if drag is None or not drag['active']: return
+        self.canvas.config(cursor="")
+        if self._drop_marker: self.canvas.itemconfigure(self._drop_marker, state=HIDDEN)
+        dest, index = self._drop_index_at(event.x_root, event.y_root), drag['index']
+        if dest not in (index, index + 1): self.move_pages(index, 1, dest if dest < index else dest - 1)
+
+    def _drop_index_at(self, x_root, y_root):
+        """Posisi sisip (sebelum halaman ke-n) di bawah kursor, dihitung dari geometri grid tanpa mencari widget."""
+        x = x_root - self.canvas.winfo_rootx()
+        y = self.canvas.canvasy(y_root - self.canvas.winfo_rooty())
+        cell_width = self._slot_size[0] + SLOT_GAP
+        left = (self.canvas.winfo_width() - self._columns * cell_width) // 2
+        column = min(max(int((x - left) // cell_width), 0), self._columns - 1)
+        after = (x - left) - column * cell_width > cell_width / 2
+        return min(max(int(y // self._row_height), 0) * self._columns + column + after, len(self.pdf_document))
+
+    def _show_drop_marker(self, dest):
+        if self._drop_marker is None:
+            self._drop_marker = self.canvas.create_line(0, 0, 0, 0, fill="#3498db", width=4)
+        at_end = dest > 0 and dest % self._columns == 0
+        x, y = self._slot_position(dest - 1 if at_end else dest)
+        x += (1 if at_end else -1) * (self._slot_size[0] + SLOT_GAP) // 2
+        self.canvas.coords(self._drop_marker, x, y, x, y + self._slot_size[1])
+        self.canvas.itemconfigure(self._drop_marker, state=NORMAL)
+        self.canvas.tag_raise(self._drop_marker)
+
+    def move_pages(self, start, count, to):
+        """Memindahkan blok halaman dengan satu panggilan select; thumbnail ikut berpindah tanpa dirender ulang."""
+        try:
+            self._apply_edit(MovePages(start, count, to))
+        except Exception as e:
+            messagebox.showerror("❌ Error", f"Gagal memindahkan halaman:\n\n{str(e)}", parent=self.root)
     
     def handle_rotate(self, frame_widget, angle):
         index = self._find_index_from_widget(frame_widget)
         if index is not None: self.rotate_page(index, angle)
 
-    def _create_preview_widget(self, page, index, img_data=None):
-        if img_data is None:
-            pix = page.get_pixmap(dpi=96)
-            img_data = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-            img_data.thumbnail((280, 380))
-        photo = ImageTk.PhotoImage(img_data)
-        page_frame = ttk.Labelframe(self.scrollable_frame, text=f"📃 Halaman {index + 1}", bootstyle="secondary", padding=12)
+    def _create_preview_slot(self):
+        """Membuat satu widget pratinjau kosong yang nantinya didaur ulang untuk halaman mana pun."""
+        page_frame = ttk.Labelframe(self.canvas, text="", bootstyle="secondary", padding=12)
         img_container = ttk.Frame(page_frame)
         img_container.pack()
-        img_label = ttk.Label(img_container, image=photo, cursor="hand2")
+        img_label = ttk.Label(img_container, text="⏳ Memuat...", cursor="hand2")
         img_label.pack(padx=8, pady=8)
         action_frame = ttk.Frame(page_frame)
-        action_frame.pack(fill=X, pady=(10, 0))
+        action_frame.pack(side=BOTTOM, fill=X, pady=(10, 0))
         btn_rotate_left = ttk.Button(action_frame, text="↺ Putar Kiri", bootstyle="secondary-outline", command=lambda f=page_frame: self.handle_rotate(f, -90))
         btn_rotate_left.pack(side=LEFT, expand=True, padx=5)
         btn_rotate_right = ttk.Button(action_frame, text="Putar Kanan ↻", bootstyle="secondary-outline", command=lambda f=page_frame: self.handle_rotate(f, 90))
         btn_rotate_right.pack(side=RIGHT, expand=True, padx=5)
         def create_hover_bindings(frame):
             def on_enter(e):
-                index = self._find_index_from_widget(frame)
-                if index != self.selected_page_index: frame.configure(bootstyle="info")
+                slot = self._slot_by_frame.get(frame)
+                if slot and slot['uid'] is not None and slot['uid'] not in self.selection: frame.configure(bootstyle="info")
             def on_leave(e):
-                index = self._find_index_from_widget(frame)
-                if index != self.selected_page_index: frame.configure(bootstyle="secondary")
+                slot = self._slot_by_frame.get(frame)
+                if slot and slot['uid'] is not None and slot['uid'] not in self.selection: frame.configure(bootstyle="secondary")
             frame.bind("<Enter>", on_enter)
             frame.bind("<Leave>", on_leave)
             for widget in [frame, img_container, img_label]:
-                widget.bind("<Button-1>", lambda e, f=frame: self.handle_page_click(f))
+                widget.bind("<Button-1>", lambda e, f=frame: self.handle_page_click(f, e))
+                widget.bind("<B1-Motion>", self._on_drag_motion)
+                widget.bind("<ButtonRelease-1>", self._on_drag_release)
         create_hover_bindings(page_frame)
-        return {'frame': page_frame, 'img_label': img_label, 'photo': photo}
+        window = self.canvas.create_window((0, 0), window=page_frame, anchor=N, width=self._slot_size[0], height=self._slot_size[1], state=HIDDEN)
+        return {'frame': page_frame, 'img_label': img_label, 'window': window, 'page': None, 'uid': None}
 
-    def _update_single_preview(self, index):
-        try:
-            page = self.pdf_document[index]
-            pix = page.get_pixmap(dpi=96)
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-            img.thumbnail((280, 380))
-            new_photo = ImageTk.PhotoImage(img)
-            target_label = self.preview_frames[index]['img_label']
-            target_label.config(image=new_photo)
-            self.previews[index] = new_photo
-        except Exception as e:
-            self.display_previews()
+    def _thumbnails_invalidated(self, indices, refresh=True):
+        """Thumbnail halaman yang berubah ditandai basi lalu dirender ulang di latar belakang.
 
-    def _remove_preview_at(self, index):
-        if not (0 <= index < len(self.preview_frames)): return
-        self.preview_frames[index]['frame'].destroy()
-        del self.preview_frames[index]
-        del self.previews[index]
-        self._renumber_previews_after(index)
-        self.selected_page_index = None
-        self.btn_delete.config(state=DISABLED)
-        self.update_info_label()
+        Gambar lama tetap tampil sampai hasil baru tiba; halaman di luar layar baru dirender
+        saat terlihat lagi. Satu refresh untuk semua halaman, berapa pun jumlahnya.
+        """
+        for index in indices:
+            uid = self.pages.uid(index)
+            self._cancel_thumbnail_requests(uid)
+            entry = self.thumbnails.get(uid)
+            if entry: self.thumbnails[uid] = entry[:3] + (True,)
+        if refresh: self._refresh_visible_previews()
+
+    def _cancel_thumbnail_requests(self, uid):
+        """Melepas permintaan thumbnail uid; token dilepas sehingga hasil lama yang masih di jalan ditolak saat tiba."""
+        for key in ((uid, DRAFT), (uid, FULL)):
+            token = self._render_pending.pop(key, None)
+            if token: self.render_engine.cancel([key + (token,)])
+            job = self._memory_jobs.pop(key, None)
+            if job: job.cancel()
 
-    def _renumber_previews_after(self, start_index):
-        for i in range(start_index, len(self.preview_frames)):
-            new_page_num = i + 1
-            self.preview_frames[i]['frame'].config(text=f"📃 Halaman {new_page_num}")
+    def _thumbnails_rotated(self, indices, angle):
+        """Thumbnail yang sudah ada diputar langsung di memori sehingga tampilan berubah seketika,
+        juga untuk halaman vektor berat yang lama dirender. Render ulang presisi menyusul di
+        latar belakang bila ROTATION_RERENDER aktif."""
+        self._thumbnails_invalidated(indices, refresh=False)
+        for index in indices:
+            uid = self.pages.uid(index)
+            entry = self.thumbnails.get(uid)
+            if entry is None: continue
+            level, _, thumb, _ = entry
+            rotated = rotate_thumbnail(thumb, angle, self._thumb_box(level))
+            self.thumbnails[uid] = (level, self._photo_from_samples(rotated, level), rotated, ROTATION_RERENDER)
+            slot = self._bound_slots.get(uid)
+            if slot: self._show_thumbnail(slot)
+        self._refresh_visible_previews()
+
+    def _pages_changed(self, start_index, inserted=0, removed=0, sources=None):
+        """Memperbarui model halaman setelah halaman disisipkan/dihapus mulai dari start_index."""
+        self._blocks_changed(removed=[(start_index, removed)] if removed else [],
+                             inserted=[(start_index, sources or [None] * inserted)] if inserted else [])
+
+    def _blocks_changed(self, removed=(), inserted=()):
+        """Menerapkan beberapa blok hapus/sisip ke model halaman lalu memperbarui pratinjau sekali.
+
+        removed berisi (start, count) dan inserted berisi (start, sources), keduanya urut naik.
+        Thumbnail dan render yang sedang berjalan dikunci dengan uid, jadi tetap berlaku;
+        hanya slot yang terlihat yang diikat ulang dan dilabeli ulang.
+        """
+        for start, count in reversed(removed):
+            for uid in self.pages.delete(start, count):
+                self.thumbnails.pop(uid, None)
+                self._render_pending.pop((uid, DRAFT), None)
+                self._render_pending.pop((uid, FULL), None)
+                self.selection.discard(uid)
+        for start, sources in inserted: self.pages.insert(start, sources)
+        self._search = None
+        self._cancel_memory_renders()
+        self._update_layout()
+        self._refresh_visible_previews(rebind=True)
+        self._selection_changed()
+
+    def _pages_moved(self, start, count, to):
+        """Urutan uid diputar ulang; thumbnail yang sudah ada tetap dipakai, hanya slot terlihat yang diikat ulang."""
+        self.pages.move(start, count, to)
+        self._search = None
+        self._cancel_memory_renders()
+        self._refresh_visible_previews(rebind=True)
+        self.update_info_label()
 
     def update_info_label(self, custom_message=None):
         if custom_message:
@@ -282,37 +803,101 @@ class PDFEditorApp:
         if self.pdf_document:
             page_count = len(self.pdf_document)
             file_name = os.path.basename(self.file_path) if self.file_path else "PDF Baru"
-            if self.selected_page_index is not None:
-                self.info_label.config(text=f"📁 {file_name}  |  📄 {page_count} hal.  |  ✅ Hal. {self.selected_page_index + 1} dipilih")
+            if self.streaming: file_name += " 📡"
+            if len(self.selection) > 1:
+                self.info_label.config(text=f"📁 {file_name}  |  📄 {page_count} hal.  |  ✅ {len(self.selection)} hal. dipilih")
+            elif self.selection:
+                self.info_label.config(text=f"📁 {file_name}  |  📄 {page_count} hal.  |  ✅ Hal. {self._selected_indices()[0] + 1} dipilih")
             else:
                 self.info_label.config(text=f"📁 {file_name}  |  📄 {page_count} hal.  |  ✨ Klik halaman untuk memilih")
         else:
             self.info_label.config(text="🎯 Buka file PDF atau buat PDF baru")
 
-    def select_page(self, index):
-        if self.selected_page_index is not None:
-            try:
-                self.preview_frames[self.selected_page_index]['frame'].config(bootstyle="secondary")
-            except (IndexError, KeyError): pass
-        self.selected_page_index = index
-        self.preview_frames[index]['frame'].config(bootstyle="primary")
-        self.btn_delete.config(state=NORMAL)
+    @property
+    def selected_page_index(self):
+        """Index halaman jangkar pilihan (klik terakhir), atau None."""
+        if self._anchor_uid not in self.selection: return None
+        return self.pages.index_of(self._anchor_uid)
+
+    def _selected_indices(self):
+        indices = (self.pages.index_of(uid) for uid in self.selection)
+        return sorted(index for index in indices if index is not None)
+
+    def select_page(self, index, mode="single"):
+        """mode: "single" (klik), "toggle" (Ctrl+klik) atau "range" (Shift+klik dari halaman jangkar)."""
+        uid = self.pages.uid(index)
+        anchor = self.selected_page_index
+        if mode == "range" and anchor is not None:
+            low, high = sorted((anchor, index))
+            self.selection = {self.pages.uid(i) for i in range(low, high + 1)}
+        else:
+            self.selection = self.selection ^ {uid} if mode == "toggle" else {uid}
+            self._anchor_uid = uid
+        self._selection_changed()
+
+    def select_pages(self, indices):
+        uids = [self.pages.uid(i) for i in indices]
+        self.selection = set(uids)
+        self._anchor_uid = uids[0] if uids else None
+        self._selection_changed()
+
+    def _selection_changed(self):
+        for uid, slot in self._bound_slots.items():
+            slot['frame'].config(bootstyle="primary" if uid in self.selection else "secondary")
+        self._update_selection_buttons()
         self.update_info_label()
 
+    def _update_selection_buttons(self):
+        state = NORMAL if self.selection and not self._editing_locked else DISABLED
+        for button in (self.btn_delete, self.btn_rotate_left, self.btn_rotate_right): button.config(state=state)
+
     # --- Bagian Aksi Utama (File, Halaman, dll) ---
+    def startup(self, path=None, timer=None, profile_dir=None, stream=None):
+        """Dipanggil sekali setelah jendela pertama kali tergambar: menyalakan worker lalu membuka file dari baris perintah."""
+        self._startup = {'timer': timer or pdf_startup.StartupTimer(), 'profile_dir': profile_dir}
+        self.jobs.warm_up()
+        if path:
+            self.load_pdf(path, notify=False, stream=stream)
+            self._startup['timer'].mark("dokumen dibuka")
+            if self.pdf_document and len(self.pdf_document): return  # Selesai saat thumbnail yang terlihat sudah tampil
+        self._finish_startup()
+
+    def _finish_startup(self):
+        startup, self._startup = self._startup, None
+        if not startup['profile_dir']: return
+        print(startup['timer'].report())
+        try:
+            os.makedirs(startup['profile_dir'], exist_ok=True)
+            for path in tracer.stop_profile(startup['profile_dir']): print(f"Profil startup: {path}")
+        except OSError as e:
+            print(f"Gagal menyimpan profil startup: {e}")
+
     def open_pdf(self):
         if self.is_loading:
             self.is_loading = False
             messagebox.showinfo("Proses Dibatalkan", "Proses pemuatan PDF sebelumnya telah dihentikan.", parent=self.root)
         path = filedialog.askopenfilename(title="Pilih File PDF", filetypes=[("PDF Files", "*.pdf")])
-        if not path: return
+        if path: self.load_pdf(path)
+
+    def load_pdf(self, path, notify=True, stream=None):
+        """Membuka path; stream None = mode streaming dipilih otomatis (file besar atau di share jaringan)."""
         try:
-            if self.pdf_document: self.pdf_document.close()
+            if self.pdf_document: self._close_document()
+            self._fingerprints.clear()  # File bisa saja berubah sejak terakhir dibuka
             self.file_path = path
-            self.pdf_document = fitz.open(self.file_path)
+            self.streaming = pdf_stream.should_stream(path) if stream is None else stream
+            with tracer.span("open", "open", file=os.path.basename(path), streaming=self.streaming) as trace:
+                self.pdf_document = pdf_core.open_document(self.file_path)
+                self.pages.reset(pdf_stream.page_sources(self.pdf_document, path, self.streaming))
+                trace["pages"] = len(self.pdf_document)
+            self._reset_history()
+            self._reset_text_index()
             self.update_ui_after_load()
             self.display_previews()
-            messagebox.showinfo("✅ Berhasil", f"PDF berhasil dibuka: {os.path.basename(path)}", parent=self.root)
+            self._update_text_index()
+            if notify:
+                mode = "\n\n📡 Mode streaming: halaman dibaca saat ditampilkan." if self.streaming else ""
+                messagebox.showinfo("✅ Berhasil", f"PDF berhasil dibuka: {os.path.basename(path)}{mode}", parent=self.root)
         except Exception as e:
             messagebox.showerror("❌ Error", f"Gagal membuka file PDF:\n\n{str(e)}", parent=self.root)
             self.reset_state()
@@ -321,7 +906,11 @@ class PDFEditorApp:
         if self.pdf_document and messagebox.askyesno("🤔 Konfirmasi", "Tutup PDF saat ini dan buat baru?", parent=self.root):
             self.reset_state()
         try:
-            self.pdf_document = fitz.open()
+            self.pdf_document = pdf_core.open_document()
+            self.streaming = False
+            self.pages.reset()
+            self._reset_history()
+            self._reset_text_index()
             self.file_path = "PDF_Baru.pdf"
             self.update_ui_after_load()
             self.display_previews()
@@ -336,30 +925,90 @@ class PDFEditorApp:
         else: self.add_pages_from_images()
 
     def add_pages_from_pdf(self):
-        add_path = filedialog.askopenfilename(title="📂 Pilih PDF untuk ditambahkan", filetypes=[("PDF Files", "*.pdf")])
-        if not add_path: return
-        try:
-            with fitz.open(add_path) as pdf_to_add:
-                pages_added_count = len(pdf_to_add)
-                insert_at = simpledialog.askinteger("📍 Posisi Penyisipan", f"Sisipkan setelah halaman ke:\n(0 = di awal, {len(self.pdf_document)} = di akhir)", minvalue=0, maxvalue=len(self.pdf_document), parent=self.root)
-                if insert_at is None: return
-                self.pdf_document.insert_pdf(pdf_to_add, start_at=insert_at)
-                sibling_widget = self.preview_frames[insert_at]['frame'] if insert_at < len(self.preview_frames) else None
-                for i in range(pages_added_count):
-                    current_index = insert_at + i
-                    page = self.pdf_document[current_index]
-                    new_widget_data = self._create_preview_widget(page, current_index)
-                    if sibling_widget:
-                        new_widget_data['frame'].pack(before=sibling_widget)
-                    else:
-                        new_widget_data['frame'].pack(pady=12, padx=15, fill=X)
-                    self.previews.insert(current_index, new_widget_data['photo'])
-                    self.preview_frames.insert(current_index, {'frame': new_widget_data['frame'], 'img_label': new_widget_data['img_label']})
-                self._renumber_previews_after(insert_at)
-                self.update_info_label()
-            messagebox.showinfo("✅ Berhasil", f"🎉 {pages_added_count} halaman berhasil ditambahkan!", parent=self.root)
-        except Exception as e:
-            messagebox.showerror("❌ Error", f"Gagal menambahkan halaman:\n\n{str(e)}", parent=self.root)
+        add_paths = filedialog.askopenfilenames(title="📂 Pilih PDF untuk ditambahkan", filetypes=[("PDF Files", "*.pdf")])
+        if not add_paths: return
+        insert_at = simpledialog.askinteger("📍 Posisi Penyisipan", f"Sisipkan setelah halaman ke:\n(0 = di awal, {len(self.pdf_document)} = di akhir)", minvalue=0, maxvalue=len(self.pdf_document), parent=self.root)
+        if insert_at is None: return
+        self._merge = {'paths': list(add_paths), 'start': insert_at, 'file': 0, 'src': None, 'page': 0, 'position': insert_at, 'chunk': 16, 'added': 0, 'failed': [],
+                       'busy': False}
+        self._set_editing_enabled(False)
+        self._show_task_progress(len(add_paths))
+        self.update_info_label(f"📎 Menggabungkan 0 dari {len(add_paths)} file...")
+        self.root.after(1, self._merge_step)
+
+    def _merge_step(self):
+        """Menjadwalkan satu putaran penggabungan di thread dokumen; model halaman dan UI diperbarui di
+        thread Tk setelah putaran selesai, lalu putaran berikutnya dikirim.
+
+        Selama putaran berjalan dokumen sudah berisi halaman yang belum ada di model halaman, jadi
+        refresh pratinjau (yang membaca dokumen) ditunda sampai putaran selesai. Thumbnail mengikuti
+        jalur lazy biasa.
+        """
+        state = self._merge
+        if state is None: return
+        state['busy'] = True
+        self.jobs.submit(self._merge_worker, self.pdf_document, state, priority=-1, document=True, generation=None,
+                         on_done=lambda result: self._on_merge_step(state, *result),
+                         on_error=lambda e: self._on_merge_step(state, state['position'], [], e))
+
+    def _merge_worker(self, job, doc, state):
+        """Menyisipkan halaman dalam anggaran waktu MERGE_BUDGET_MS (thread dokumen).
+
+        Hanya satu file sumber yang terbuka pada satu waktu. PyMuPDF memegang GIL selama insert_pdf,
+        jadi ukuran potongan disesuaikan agar tiap panggilan tetap singkat dan thread Tk tidak tertahan.
+        """
+        step_started = time.perf_counter()
+        deadline = step_started + MERGE_BUDGET_MS / 1000
+        start, sources = state['position'], []
+        while state['file'] < len(state['paths']) and time.perf_counter() < deadline:
+            path = state['paths'][state['file']]
+            try:
+                if state['src'] is None: state['src'] = pdf_core.open_document(path)
+                src = state['src']
+                first = state['page']
+                last = min(first + state['chunk'], len(src)) - 1
+                began = time.perf_counter()
+                if last >= first: sources += pdf_core.insert_pdf_pages(doc, src, path, first, last, start + len(sources))
+                # Potongan berikutnya diukur agar memakai sekitar separuh anggaran waktu.
+                rate = (last - first + 1) / max(time.perf_counter() - began, 1e-4)
+                state['chunk'] = max(1, min(MERGE_MAX_CHUNK, int(rate * MERGE_BUDGET_MS / 2000)))
+                state['page'] = last + 1
+                if state['page'] < len(src): continue
+            except Exception as e:
+                state['failed'].append(f"{os.path.basename(path)}: {e}")
+            if state['src'] is not None: state['src'].close()
+            state['src'], state['page'] = None, 0
+            state['file'] += 1
+        tracer.add("merge_step", step_started, time.perf_counter() - step_started, "import", pages=len(sources))
+        return start, sources
+
+    def _on_merge_step(self, state, start, sources, error=None):
+        if error is not None:
+            # Kegagalan di luar penanganan per file: sisa file dilewati.
+            state['failed'].append(str(error))
+            if state['src'] is not None: state['src'].close()
+            state['src'], state['file'] = None, len(state['paths'])
+        state['busy'] = False
+        state['position'] = start + len(sources)
+        state['added'] += len(sources)
+        rebind = state.pop('refresh', None)
+        if sources: self._pages_changed(start, inserted=len(sources), sources=sources)
+        elif rebind is not None: self._refresh_visible_previews(rebind=rebind)
+        total = len(state['paths'])
+        self.task_progress.config(value=state['file'])
+        if state['file'] < total:
+            self.update_info_label(f"📎 Menggabungkan {state['file']} dari {total} file ({state['added']} halaman)...")
+            self.root.after(1, self._merge_step)
+            return
+        self._merge = None
+        if state['added']: self._record_edit(RemovePages(range(state['start'], state['start'] + state['added'])))
+        self._hide_task_progress()
+        self._set_editing_enabled(True)
+        self._update_text_index()
+        if state['failed']:
+            messagebox.showwarning("⚠️ Sebagian Gagal", f"{state['added']} halaman ditambahkan.\n\nGagal:\n" + "\n".join(state['failed'][:5]), parent=self.root)
+        else:
+            messagebox.showinfo("✅ Berhasil", f"🎉 {state['added']} halaman dari {total} file berhasil ditambahkan!", parent=self.root)
 
     def _ask_paper_size_for_images(self):
         dialog = tk.Toplevel(self.root)
@@ -376,9 +1025,14 @@ class PDFEditorApp:
         for size_name in PAPER_SIZES.keys():
             size_info = f" ({PAPER_SIZES[size_name][0]}x{PAPER_SIZES[size_name][1]} pt)" if PAPER_SIZES[size_name] else " (Sesuai ukuran asli)"
             ttk.Radiobutton(option_frame, text=size_name + size_info, variable=result, value=size_name, bootstyle="primary").pack(anchor='w', pady=3)
+        quality = tk.StringVar(value=pdf_core.DEFAULT_IMAGE_QUALITY)
+        quality_frame = ttk.LabelFrame(main_frame, text="Kualitas Gambar", padding=15)
+        quality_frame.pack(fill=X, pady=(0, 15))
+        for quality_name in pdf_core.IMAGE_QUALITY_PRESETS:
+            ttk.Radiobutton(quality_frame, text=quality_name, variable=quality, value=quality_name, bootstyle="primary").pack(anchor='w', pady=3)
         final_choice = [None]
         def on_ok():
-            final_choice[0] = result.get()
+            final_choice[0] = (result.get(), quality.get())
             dialog.destroy()
         btn_frame = ttk.Frame(main_frame, padding=(0, 10, 0, 0))
         btn_frame.pack(fill=X, side=BOTTOM)
@@ -389,74 +1043,92 @@ class PDFEditorApp:
         return final_choice[0]
 
     def add_pages_from_images(self):
-        selected_paper_size_name = self._ask_paper_size_for_images()
-        if not selected_paper_size_name: return
+        choice = self._ask_paper_size_for_images()
+        if not choice: return
+        paper_size_name, quality_name = choice
         image_paths = filedialog.askopenfilenames(title="🖼️ Pilih Gambar", filetypes=[("Image Files", "*.png *.jpg *.jpeg *.gif *.bmp *.tiff")])
         if not image_paths: return
+        insert_at = simpledialog.askinteger("📍 Posisi Penyisipan", f"Sisipkan setelah halaman ke:\n(0 = di awal, {len(self.pdf_document)} = di akhir)", minvalue=0, maxvalue=len(self.pdf_document), parent=self.root)
+        if insert_at is None: return
+        self._start_image_import(list(image_paths), insert_at, PAPER_SIZES[paper_size_name], pdf_core.IMAGE_QUALITY_PRESETS[quality_name])
+
+    def _start_image_import(self, image_paths, insert_at, page_dim, preset):
+        """Gambar didekode dan diperkecil paralel di process pool. Halaman disisipkan di thread Tk
+        sesuai urutan pilihan, sekali per batch event, sehingga main loop tetap responsif."""
+        dpi, quality = preset or (None, 85)
+        state = self._image_import = {'paths': image_paths, 'ready': {}, 'next': 0, 'start': insert_at, 'position': insert_at, 'failed': []}
+        for i, img_path in enumerate(image_paths):
+            # Tidak terikat generasi: ganti zoom tidak boleh membatalkan impor.
+            self.jobs.submit(pdf_core.prepare_image, img_path, page_dim, dpi, quality, process=True, generation=None,
+                             on_done=lambda prepared, i=i: self._on_image_prepared(state, i, prepared),
+                             on_error=lambda e, i=i: self._on_image_prepared(state, i, None, e))
+        self._set_editing_enabled(False)
+        self._show_task_progress(len(image_paths))
+        self.update_info_label(f"🖼️ Mengimpor 0 dari {len(image_paths)} gambar...")
+
+    def _on_image_prepared(self, state, index, prepared, error=None):
+        if state is not self._image_import: return
+        if error is not None: state['failed'].append(f"{os.path.basename(state['paths'][index])}: {error}")
+        state['ready'][index] = prepared
+
+    def _flush_image_import(self):
+        """Menyisipkan gambar yang sudah siap secara berurutan lalu memperbarui pratinjau sekali saja."""
+        state = self._image_import
+        if state is None: return
+        start = state['position']
+        while state['next'] in state['ready']:
+            prepared = state['ready'].pop(state['next'])
+            name = os.path.basename(state['paths'][state['next']])
+            state['next'] += 1
+            if prepared is None: continue
+            try:
+                with self.jobs.document_lock: pdf_core.insert_prepared_image(self.pdf_document, state['position'], prepared)
+                state['position'] += 1
+            except Exception as e:
+                state['failed'].append(f"{name}: {e}")
+        if state['position'] > start: self._pages_changed(start, inserted=state['position'] - start)
+        total = len(state['paths'])
+        self.task_progress.config(value=state['next'])
+        if state['next'] < total:
+            self.update_info_label(f"🖼️ Mengimpor {state['next']} dari {total} gambar...")
+            return
+        self._image_import = None
+        if state['position'] > state['start']: self._record_edit(RemovePages(range(state['start'], state['position'])))
+        self._hide_task_progress()
+        self._set_editing_enabled(True)
+        added = total - len(state['failed'])
+        if state['failed']:
+            details = "\n".join(state['failed'][:5]) + ("\n..." if len(state['failed']) > 5 else "")
+            messagebox.showwarning("⚠️ Sebagian Gagal", f"{added} dari {total} gambar ditambahkan.\n\nGagal:\n{details}", parent=self.root)
+        else:
+            messagebox.showinfo("✅ Berhasil", f"🎉 {added} gambar ditambahkan!", parent=self.root)
+
+    def rotate_page(self, page_index, angle):
+        if self._editing_locked or not self.pdf_document or not (0 <= page_index < len(self.pdf_document)): return
         try:
-            insert_at = simpledialog.askinteger("📍 Posisi Penyisipan", f"Sisipkan setelah halaman ke:\n(0 = di awal, {len(self.pdf_document)} = di akhir)", minvalue=0, maxvalue=len(self.pdf_document), parent=self.root)
-            if insert_at is None: return
-            page_dim = PAPER_SIZES[selected_paper_size_name]
-            sibling_widget = self.preview_frames[insert_at]['frame'] if insert_at < len(self.preview_frames) else None
-            for i, img_path in enumerate(image_paths):
-                current_index = insert_at + i
-                with Image.open(img_path) as img:
-                    if img.mode in ('RGBA', 'LA'):
-                        background = Image.new('RGB', img.size, (255, 255, 255))
-                        background.paste(img, (0, 0), img)
-                        processed_img = background
-                    else:
-                        processed_img = img.convert('RGB')
-                    if page_dim:
-                        pw, ph = page_dim
-                        page = self.pdf_document.new_page(pno=current_index, width=pw, height=ph)
-                        iw, ih = processed_img.size
-                        r_img, r_page = iw / ih, pw / ph
-                        if r_img > r_page:
-                            rw, rh = pw * 0.95, (pw * 0.95) / r_img
-                        else:
-                            rw, rh = (ph * 0.95) * r_img, ph * 0.95
-                        x, y = (pw - rw) / 2, (ph - rh) / 2
-                        img_rect = fitz.Rect(x, y, x + rw, y + rh)
-                    else:
-                        pw, ph = processed_img.size
-                        page = self.pdf_document.new_page(pno=current_index, width=pw, height=ph)
-                        img_rect = fitz.Rect(0, 0, pw, ph)
-                    page.insert_image(img_rect, filename=img_path)
-                    new_widget_data = self._create_preview_widget(page, current_index)
-                    if sibling_widget:
-                        new_widget_data['frame'].pack(before=sibling_widget)
-                    else:
-                        new_widget_data['frame'].pack(pady=12, padx=15, fill=X)
-                    self.previews.insert(current_index, new_widget_data['photo'])
-                    self.preview_frames.insert(current_index, {'frame': new_widget_data['frame'], 'img_label': new_widget_data['img_label']})
-            self._renumber_previews_after(insert_at)
-            self.update_info_label()
-            messagebox.showinfo("✅ Berhasil", f"🎉 {len(image_paths)} gambar ditambahkan!", parent=self.root)
+            self._apply_edit(RotatePages([page_index], angle))
         except Exception as e:
-            messagebox.showerror("❌ Error", f"Gagal menambahkan gambar:\n\n{str(e)}", parent=self.root)
+            messagebox.showerror("❌ Error", f"Gagal memutar halaman:\n\n{str(e)}", parent=self.root)
 
-    def rotate_page(self, page_index, angle):
-        if not self.pdf_document or not (0 <= page_index < len(self.pdf_document)): return
+    def rotate_selection(self, angle):
+        """Memutar semua halaman terpilih dalam satu operasi; hanya thumbnail yang terlihat yang dirender ulang."""
+        indices = self._selected_indices()
+        if self._editing_locked or not indices: return
         try:
-            page = self.pdf_document[page_index]
-            new_rotation = (page.rotation + angle) % 360
-            page.set_rotation(new_rotation)
-            self._update_single_preview(page_index)
+            self._apply_edit(RotatePages(indices, angle))
         except Exception as e:
             messagebox.showerror("❌ Error", f"Gagal memutar halaman:\n\n{str(e)}", parent=self.root)
 
     def delete_page(self):
-        if self.selected_page_index is None:
+        indices = self._selected_indices()
+        if not indices:
             messagebox.showwarning("⚠️ Peringatan", "Pilih halaman yang ingin dihapus.", parent=self.root)
             return
-        page_num_to_delete = self.selected_page_index + 1
-        if messagebox.askyesno("🗑️ Konfirmasi Hapus", f"Yakin ingin menghapus Halaman {page_num_to_delete}?", parent=self.root):
+        description = f"Halaman {indices[0] + 1}" if len(indices) == 1 else f"{len(indices)} halaman terpilih"
+        if messagebox.askyesno("🗑️ Konfirmasi Hapus", f"Yakin ingin menghapus {description}?", parent=self.root):
             try:
-                index_to_delete = self.selected_page_index
-                self.pdf_document.delete_page(index_to_delete)
-                self._remove_preview_at(index_to_delete)
-                messagebox.showinfo("✅ Berhasil", f"Halaman {page_num_to_delete} berhasil dihapus.", parent=self.root)
+                self._apply_edit(RemovePages(indices))
+                messagebox.showinfo("✅ Berhasil", f"{description} berhasil dihapus.", parent=self.root)
             except Exception as e:
                 messagebox.showerror("❌ Error", f"Gagal menghapus halaman:\n\n{str(e)}", parent=self.root)
 
@@ -471,19 +1143,356 @@ class PDFEditorApp:
         num_to_delete = (end_index - start_index) + 1
         if messagebox.askyesno("🗑️ Konfirmasi", f"Hapus halaman {start_page} hingga {end_page} ({num_to_delete} halaman)?", parent=self.root):
             try:
-                self.pdf_document.delete_pages(range(start_index, end_index + 1))
-                for i in range(end_index, start_index - 1, -1):
-                    self.preview_frames[i]['frame'].destroy()
-                    del self.preview_frames[i]
-                    del self.previews[i]
-                self._renumber_previews_after(start_index)
-                self.selected_page_index = None
-                self.btn_delete.config(state=DISABLED)
-                self.update_info_label()
+                self._apply_edit(RemovePages(range(start_index, end_index + 1)))
                 messagebox.showinfo("✅ Berhasil", f"🎉 {num_to_delete} halaman dihapus!", parent=self.root)
             except Exception as e:
                 messagebox.showerror("❌ Error", f"Gagal menghapus rentang:\n\n{str(e)}", parent=self.root)
 
+    # --- Indeks Teks dan Pencarian ---
+    def _reset_text_index(self):
+        self.text_indexes.clear()
+        self._indexing.clear()  # Hasil pengindeksan yang masih berjalan akan diabaikan
+        self._search = None
+        self.search_status.config(text="")
+
+    def _update_text_index(self, force=False):
+        """Mengindeks teks file sumber yang belum terindeks (atau sudah berubah) di latar belakang.
+
+        Indeks dimuat dari disk bila file yang sama pernah diindeks. Ekstraksi baru dikirim ke
+        process pool sedikit demi sedikit agar render thumbnail tidak ikut mengantre di belakangnya.
+        Dalam mode streaming pengindeksan baru dimulai oleh pencarian pertama (force).
+        """
+        if not self.pdf_document: return
+        if self.streaming and not force and not (self.text_indexes or self._indexing): return
+        paths = set()
+        for i in range(len(self.pages)):
+            source = self.pages.source(i)
+            if source: paths.add(source[0])
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            stat = (st.st_mtime, st.st_size)
+            current, running = self.text_indexes.get(path), self._indexing.get(path)
+            if (current and current[0] == stat) or (running and running['stat'] == stat): continue
+            state = self._indexing[path] = {'path': path, 'stat': stat, 'chunks': [], 'next': 0, 'pages': {}, 'in_flight': 0}
+            self.jobs.submit(self._load_text_index, path, priority=5, generation=None,
+                             on_done=lambda result, s=state: self._on_text_index_loaded(s, *result),
+                             on_error=lambda e, s=state: self._on_text_index_failed(s, e))
+        self._update_search_status()
+
+    def _load_text_index(self, job, path):
+        fingerprint = file_fingerprint(path)
+        index = TextIndex.load(os.path.join(default_index_dir(), f"{fingerprint}.idx"))
+        if index: return fingerprint, index, len(index.pages)
+        with pdf_core.open_document(path) as doc: return fingerprint, None, len(doc)
+
+    def _on_text_index_loaded(self, state, fingerprint, index, page_count):
+        if self._indexing.get(state['path']) is not state: return
+        state['fingerprint'] = fingerprint
+        state['chunks'] = [] if index else page_chunks(page_count)
+        if not state['chunks']:
+            self._finish_text_index(state, index or TextIndex([]), save=False)
+            return
+        state['started'] = time.perf_counter()
+        self._submit_text_chunks(state)
+
+    def _submit_text_chunks(self, state):
+        limit = max(1, self.jobs.process_workers // 2)
+        while state['next'] < len(state['chunks']) and state['in_flight'] < limit:
+            first, last = state['chunks'][state['next']]
+            state['next'] += 1
+            state['in_flight'] += 1
+            self.jobs.submit(extract_words, state['path'], first, last, process=True, generation=None,
+                             on_done=lambda words, s=state, f=first: self._on_text_chunk(s, f, words),
+                             on_error=lambda e, s=state, f=first, l=last: self._on_text_chunk(s, f, [""] * (l - f + 1), e))
+
+    def _on_text_chunk(self, state, first, words, error=None):
+        if error is not None: print(f"Gagal mengekstrak teks {os.path.basename(state['path'])} mulai hal. {first + 1}: {error}")
+        if self._indexing.get(state['path']) is not state: return
+        state['in_flight'] -= 1
+        state['pages'][first] = words
+        if len(state['pages']) < len(state['chunks']):
+            self._submit_text_chunks(state)
+            self._update_search_status()
+            return
+        pages = [text for start in sorted(state['pages']) for text in state['pages'][start]]
+        tracer.add("text_index", state['started'], time.perf_counter() - state['started'], "index", pages=len(pages))
+        self._finish_text_index(state, TextIndex(pages), save=True)
+
+    def _on_text_index_failed(self, state, error):
+        print(f"Gagal mengindeks teks {os.path.basename(state['path'])}: {error}")
+        if self._indexing.get(state['path']) is state: del self._indexing[state['path']]
+        self._update_search_status()
+
+    def _finish_text_index(self, state, index, save):
+        del self._indexing[state['path']]
+        self.text_indexes[state['path']] = (state['stat'], index)
+        self._search = None
+        if save:
+            index_path = os.path.join(default_index_dir(), f"{state['fingerprint']}.idx")
+            self.jobs.submit(self._save_text_index, index, index_path, priority=10, generation=None,
+                             on_error=lambda e: print(f"Gagal menyimpan indeks teks: {e}"))
+        self._update_search_status()
+
+    def _save_text_index(self, job, index, index_path):
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        index.save(index_path)
+
+    def _update_search_status(self, text=None):
+        if text is None and self._indexing:
+            done = sum(len(state['pages']) for state in self._indexing.values())
+            total = sum(len(state['chunks']) for state in self._indexing.values())
+            text = f"⏳ Mengindeks teks {done * 100 // max(1, total)}%"
+        self.search_status.config(text=text or "")
+
+    def search_text(self, step=1):
+        """Mencari kata di indeks teks; Enter berulang melompat ke hasil berikutnya, Shift+Enter ke sebelumnya."""
+        query = self.search_entry.get().strip()
+        if not self.pdf_document or not query: return
+        if self.streaming and not (self.text_indexes or self._indexing): self._update_text_index(force=True)
+        if self._search is None or self._search[0] != query:
+            with tracer.span("search", "search") as trace:
+                hits = {path: set(entry[1].search(query)) for path, entry in self.text_indexes.items()}
+                matches = []
+                for i in range(len(self.pages)):
+                    source = self.pages.source(i)
+                    if source and source[1] in hits.get(source[0], ()): matches.append(i)
+                trace["matches"] = len(matches)
+            self._search = [query, matches, -1 if step > 0 else 0]
+        _, matches, position = self._search
+        pending = " (indeks belum lengkap)" if self._indexing else ""
+        if not matches:
+            self._update_search_status(f"❌ Tidak ditemukan{pending}")
+            return
+        position = (position + step) % len(matches)
+        self._search[2] = position
+        self._jump_to_page(matches[position])
+        self._update_search_status(f"Hal. {matches[position] + 1}  ({position + 1}/{len(matches)}){pending}")
+
+    def _jump_to_page(self, index):
+        """Scroll ke halaman index dan memilihnya; thumbnail halaman itu diminta sebelum halaman lain."""
+        self._scroll_to_page(index)
+        self._request_thumbnails([(index, -1)])
+        self._refresh_visible_previews()
+        self.select_page(index)
+
+    # --- Halaman Kosong dan Duplikat ---
+    def find_blank_and_duplicate_pages(self):
+        """Menganalisis semua halaman paralel (render kecil + NumPy) lalu menawarkan penghapusan sekaligus."""
+        if not self.pdf_document or self._editing_locked or len(self.pdf_document) == 0: return
+        page_count = len(self.pdf_document)
+        by_source, memory_pages = {}, []
+        for i in range(page_count):
+            source = self.pages.source(i)
+            if source: by_source.setdefault(source[0], []).append((i, source[1], self.pdf_document[i].rotation))
+            else: memory_pages.append(i)
+        state = {'signatures': [None] * page_count, 'done': 0, 'remaining': 0, 'started': time.perf_counter()}
+        self._set_editing_enabled(False)
+        self._show_task_progress(page_count)
+        self.update_info_label(f"🧹 Menganalisis 0 dari {page_count} halaman...")
+        for path, tasks in by_source.items():
+            for start in range(0, len(tasks), pdf_analysis.CHUNK_PAGES):
+                chunk = tasks[start:start + pdf_analysis.CHUNK_PAGES]
+                state['remaining'] += 1
+                self.jobs.submit(pdf_analysis.analyze_pages, path, [(pno, rotation) for _, pno, rotation in chunk], process=True, generation=None,
+                                 on_done=lambda results, s=state, c=chunk: self._on_pages_analyzed(s, [i for i, *_ in c], results),
+                                 on_error=lambda e, s=state, c=chunk: self._on_pages_analyzed(s, [i for i, *_ in c], [None] * len(c), e))
+        if memory_pages: self._submit_memory_analysis(state, memory_pages)
+
+    def _submit_memory_analysis(self, state, indices):
+        """Halaman tanpa file sumber (mis. hasil impor gambar) dianalisis dari dokumen di memori, satu potongan
+        MEMORY_CHUNK_PAGES per tugas thread dokumen. Potongan berikutnya baru dikirim setelah hasilnya tiba di
+        thread Tk, jadi antarmuka dan render thumbnail sempat berjalan di antaranya."""
+        chunk, rest = indices[:pdf_analysis.MEMORY_CHUNK_PAGES], indices[pdf_analysis.MEMORY_CHUNK_PAGES:]
+        state['remaining'] += 1
+        self.jobs.submit(self._analyze_memory_pages, self.pdf_document, chunk, document=True, generation=None,
+                         on_done=lambda results: self._on_memory_pages_analyzed(state, chunk, rest, results),
+                         on_error=lambda e: self._on_memory_pages_analyzed(state, chunk, rest, [None] * len(chunk), e))
+
+    def _analyze_memory_pages(self, job, doc, indices):
+        results = []
+        for i in indices:
+            if job.cancelled: break  # Aplikasi ditutup
+            results.append(pdf_analysis.page_signature(doc[i]))
+        return results
+
+    def _on_memory_pages_analyzed(self, state, chunk, rest, results, error=None):
+        if rest: self._submit_memory_analysis(state, rest)  # Dikirim dulu agar 'remaining' tidak sempat nol
+        self._on_pages_analyzed(state, chunk, results, error)
+
+    def _on_pages_analyzed(self, state, indices, results, error=None):
+        if error is not None: print(f"Gagal menganalisis {len(indices)} halaman: {error}")
+        for index, signature in zip(indices, results): state['signatures'][index] = signature
+        state['done'] += len(indices)
+        state['remaining'] -= 1
+        self.task_progress.config(value=state['done'])
+        self.update_info_label(f"🧹 Menganalisis {state['done']} dari {len(state['signatures'])} halaman...")
+        if state['remaining'] == 0:
+            self.jobs.submit(self._classify_pages, state['signatures'], generation=None,
+                             on_done=lambda result, s=state: self._on_pages_classified(s, *result),
+                             on_error=lambda e, s=state: self._on_pages_classified(s, [], {}, e))
+
+    def _classify_pages(self, job, signatures):
+        return pdf_analysis.find_blank_and_duplicates(signatures)
+
+    def _on_pages_classified(self, state, blank, duplicates, error=None):
+        tracer.add("find_blank_and_duplicates", state['started'], time.perf_counter() - state['started'], "analysis",
+                   pages=len(state['signatures']), blank=len(blank), duplicates=len(duplicates))
+        self._hide_task_progress()
+        self._set_editing_enabled(True)
+        if error is not None:
+            messagebox.showerror("❌ Error", f"Gagal menganalisis halaman:\n\n{str(error)}", parent=self.root)
+            return
+        if not blank and not duplicates:
+            messagebox.showinfo("✅ Selesai", "Tidak ada halaman kosong atau duplikat.", parent=self.root)
+            return
+        indices = self._ask_cleanup(blank, duplicates)
+        if not indices: return
+        if len(indices) >= len(self.pdf_document):
+            messagebox.showwarning("⚠️ Peringatan", "Tidak bisa menghapus semua halaman.", parent=self.root)
+            return
+        try:
+            self._apply_edit(RemovePages(indices))
+            messagebox.showinfo("✅ Berhasil", f"{len(indices)} halaman dihapus. Gunakan Urungkan untuk mengembalikan.", parent=self.root)
+        except Exception as e:
+            messagebox.showerror("❌ Error", f"Gagal menghapus halaman:\n\n{str(e)}", parent=self.root)
+
+    @staticmethod
+    def _format_pages(indices, limit=12):
+        """Nomor halaman (berbasis 1) sebagai rentang ringkas, mis. "3-5, 9, 12"."""
+        runs = [f"{a + 1}-{b + 1}" if b > a else f"{a + 1}" for a, b in pdf_core.page_runs(sorted(indices))]
+        return ", ".join(runs[:limit]) + (", ..." if len(runs) > limit else "")
+
+    def _ask_cleanup(self, blank, duplicates):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("🧹 Halaman Kosong / Duplikat")
+        dialog.resizable(False, False)
+        main_frame = ttk.Frame(dialog, padding=20)
+        main_frame.pack(fill=BOTH, expand=True)
+        ttk.Label(main_frame, text="🧹 Hasil Analisis Halaman", font=("Segoe UI", 16, "bold")).pack(anchor=W, pady=(0, 15))
+        remove_blank, remove_duplicates = tk.BooleanVar(value=bool(blank)), tk.BooleanVar(value=bool(duplicates))
+        ttk.Checkbutton(main_frame, text=f"Hapus {len(blank)} halaman kosong", variable=remove_blank,
+                        state=NORMAL if blank else DISABLED).pack(anchor=W)
+        if blank: ttk.Label(main_frame, text=f"Hal. {self._format_pages(blank)}", font=("Segoe UI", 9), foreground="#7f8c8d").pack(anchor=W, padx=(24, 0), pady=(0, 10))
+        ttk.Checkbutton(main_frame, text=f"Hapus {len(duplicates)} halaman duplikat (halaman pertama tetap disimpan)", variable=remove_duplicates,
+                        state=NORMAL if duplicates else DISABLED).pack(anchor=W, pady=(10 if not blank else 0, 0))
+        if duplicates:
+            pairs = ", ".join(f"{j + 1}={i + 1}" for j, i in sorted(duplicates.items())[:12]) + (", ..." if len(duplicates) > 12 else "")
+            ttk.Label(main_frame, text=f"Hal. {pairs}", font=("Segoe UI", 9), foreground="#7f8c8d").pack(anchor=W, padx=(24, 0))
+        result = [None]
+        def on_ok():
+            result[0] = sorted((set(blank) if remove_blank.get() else set()) | (set(duplicates) if remove_duplicates.get() else set()))
+            dialog.destroy()
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(fill=X, pady=(20, 0))
+        ttk.Button(btn_frame, text="❌ Batal", command=dialog.destroy, bootstyle="secondary-outline").pack(side=RIGHT)
+        ttk.Button(btn_frame, text="🗑️ Hapus", command=on_ok, bootstyle="danger").pack(side=RIGHT, padx=(0, 10))
+        self._center_dialog(dialog)
+        self.root.wait_window(dialog)
+        return result[0]
+
+    # --- Urungkan / Ulangi ---
+    def _apply_edit(self, op):
+        """Menerapkan operasi pengguna lewat log riwayat sehingga bisa diurungkan."""
+        with tracer.span(type(op).__name__, "edit"), self.jobs.document_lock:
+            inverse, change = op.apply(self.pdf_document, self.stash, self.pages)
+        self._record_edit(inverse)
+        self._apply_change(change)
+
+    def _record_edit(self, inverse):
+        self.history.record(inverse)
+        self._update_history_buttons()
+
+    def _apply_change(self, change):
+        """Memperbarui pratinjau hanya untuk halaman yang disentuh operasi."""
+        with tracer.span("update_previews", "tk", change=change[0]): self._apply_change_previews(change)
+
+    def _apply_change_previews(self, change):
+        if change[0] == "rotated":
+            self._thumbnails_rotated(change[1], change[2])
+        elif change[0] == "moved":
+            self._pages_moved(*change[1:])
+        elif change[0] == "removed":
+            self._blocks_changed(removed=change[1])
+        elif change[0] == "inserted":
+            self._blocks_changed(inserted=change[1])
+
+    def undo(self):
+        self._step_history(self.history.can_undo, self.history.undo, "urungkan")
+
+    def redo(self):
+        self._step_history(self.history.can_redo, self.history.redo, "ulangi")
+
+    def _step_history(self, available, step, action):
+        if not self.pdf_document or self._editing_locked or not available(): return
+        try:
+            with tracer.span(f"history:{action}", "edit"), self.jobs.document_lock: change = step(self.pdf_document, self.stash, self.pages)
+            self._apply_change(change)
+        except Exception as e:
+            messagebox.showerror("❌ Error", f"Gagal meng{action}:\n\n{str(e)}", parent=self.root)
+        self._update_history_buttons()
+        self.btn_delete_range.config(state=NORMAL if len(self.pdf_document) > 1 else DISABLED)
+
+    def _update_history_buttons(self):
+        enabled = self.pdf_document is not None and not self._editing_locked
+        self.btn_undo.config(state=NORMAL if enabled and self.history.can_undo() else DISABLED)
+        self.btn_redo.config(state=NORMAL if enabled and self.history.can_redo() else DISABLED)
+
+    def _reset_history(self):
+        self.history.clear()
+        if self.stash: self.stash.close()
+        self.stash = pdf_core.open_document() if self.pdf_document else None
+        self._update_history_buttons()
+
+    def move_page_range(self):
+        if not self.pdf_document or len(self.pdf_document) < 2: return
+        dialog_result = self._ask_move_range()
+        if dialog_result is None: return
+        start_page, end_page, after_page = dialog_result
+        count = end_page - start_page + 1
+        self.move_pages(start_page - 1, count, after_page if after_page < start_page else after_page - count)
+
+    def _ask_move_range(self):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("↕️ Pindah Rentang Halaman")
+        main_frame = ttk.Frame(dialog, padding=20)
+        main_frame.pack(fill=BOTH, expand=True)
+        total_pages = len(self.pdf_document)
+        ttk.Label(main_frame, text="↕️ Pindah Rentang Halaman", font=("Segoe UI", 16, "bold")).pack(anchor=W)
+        ttk.Label(main_frame, text=f"📊 Total halaman: {total_pages}", font=("Segoe UI", 10)).pack(anchor=W, pady=(0, 15))
+        input_frame = ttk.LabelFrame(main_frame, text="Pilih Rentang dan Tujuan", padding=15)
+        input_frame.pack(fill=X, pady=(0, 15))
+        entries = []
+        for row, (label, default) in enumerate([("Dari:", "1"), ("Hingga:", "1"), ("Letakkan setelah halaman:", str(total_pages))]):
+            ttk.Label(input_frame, text=label, font=("Segoe UI", 10)).grid(row=row, column=0, sticky=W)
+            entry = ttk.Entry(input_frame, width=8, font=("Segoe UI", 12))
+            entry.grid(row=row, column=1, padx=5, pady=5)
+            entry.insert(0, default)
+            entries.append(entry)
+        selected = self._selected_indices()
+        if selected:
+            for entry, index in zip(entries[:2], (selected[0], selected[-1])):
+                entry.delete(0, END)
+                entry.insert(0, str(index + 1))
+        result = [None]
+        def on_ok():
+            try:
+                start, end, after = (int(entry.get()) for entry in entries)
+                if not (1 <= start <= end <= total_pages and 0 <= after <= total_pages) or start <= after < end: raise ValueError
+                result[0] = (start, end, after)
+                dialog.destroy()
+            except ValueError:
+                messagebox.showerror("❌ Input Tidak Valid", f"Rentang tidak valid. Pastikan Awal ≤ Akhir (1-{total_pages}) dan tujuan tidak berada di dalam rentang.", parent=dialog)
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(fill=X, side=BOTTOM)
+        ttk.Button(btn_frame, text="❌ Batal", command=dialog.destroy, bootstyle="secondary-outline").pack(side=RIGHT)
+        ttk.Button(btn_frame, text="↕️ Pindah", command=on_ok, bootstyle="primary").pack(side=RIGHT, padx=(0, 10))
+        self._center_dialog(dialog)
+        self.root.wait_window(dialog)
+        return result[0]
+
     def _ask_delete_range(self):
         dialog = tk.Toplevel(self.root)
         dialog.title("🗂️ Hapus Rentang Halaman")
@@ -547,6 +1556,15 @@ class PDFEditorApp:
         ttk.Label(range_input_frame, text="Hingga:").pack(side=LEFT)
         entry_to = ttk.Entry(range_input_frame, width=6, state=DISABLED)
         entry_to.pack(side=LEFT, padx=5)
+        optimize = tk.BooleanVar(value=False)
+        image_dpi = tk.StringVar(value=next(iter(pdf_optimize.DPI_PRESETS)))
+        ttk.Checkbutton(main_frame, text="🧹 Optimalkan ukuran file (lebih lambat)", variable=optimize, bootstyle="round-toggle",
+                        command=lambda: dpi_box.config(state="readonly" if optimize.get() else DISABLED)).pack(anchor=W)
+        dpi_frame = ttk.Frame(main_frame)
+        dpi_frame.pack(fill=X, padx=(25, 0), pady=(5, 0))
+        ttk.Label(dpi_frame, text="Resolusi gambar:").pack(side=LEFT)
+        dpi_box = ttk.Combobox(dpi_frame, textvariable=image_dpi, values=list(pdf_optimize.DPI_PRESETS), state=DISABLED, width=24)
+        dpi_box.pack(side=LEFT, padx=5)
         def on_ok():
             start_page, end_page = None, None
             if save_option.get() == "range":
@@ -557,73 +1575,401 @@ class PDFEditorApp:
                     messagebox.showerror("❌ Error", f"Rentang tidak valid (1-{len(self.pdf_document)}).", parent=dialog)
                     return
             dialog.destroy()
-            self._execute_save(start_page, end_page)
+            self._execute_save(start_page, end_page, optimize.get(), image_dpi=pdf_optimize.DPI_PRESETS[image_dpi.get()])
         btn_frame = ttk.Frame(main_frame)
         btn_frame.pack(fill=X, side=BOTTOM, pady=(10, 0))
         ttk.Button(btn_frame, text="❌ Batal", command=dialog.destroy, bootstyle="secondary-outline").pack(side=RIGHT)
         ttk.Button(btn_frame, text="💾 Simpan", command=on_ok, bootstyle="success").pack(side=RIGHT, padx=(0, 10))
 
-    def _execute_save(self, start_page=None, end_page=None):
-        save_path = filedialog.asksaveasfilename(title="💾 Simpan PDF Sebagai", defaultextension=".pdf", filetypes=[("PDF Files", "*.pdf")])
+    def quick_save(self):
+        """Menyimpan perubahan ke file asal secara inkremental; waktu simpan sebanding dengan besar perubahan."""
+        if not self.pdf_document or not self.pdf_document.name: return
+        if not pdf_core.can_save_incrementally(self.pdf_document, self.pdf_document.name):
+            messagebox.showwarning("⚠️ Peringatan", "Dokumen ini tidak bisa disimpan cepat ke file asalnya.\nGunakan 💾 Simpan Sebagai.", parent=self.root)
+            return
+        self._execute_save(save_path=self.pdf_document.name)
+
+    def _execute_save(self, start_page=None, end_page=None, optimize=False, save_path=None, image_dpi=None):
+        save_path = save_path or filedialog.asksaveasfilename(title="💾 Simpan PDF Sebagai", defaultextension=".pdf", filetypes=[("PDF Files", "*.pdf")])
         if not save_path: return
+        self._detach_history(save_path)
+        if optimize: return self._start_optimized_save(save_path, start_page, end_page, image_dpi)
         self._show_saving_indicator()
-        threading.Thread(
-            target=self._save_worker,
-            args=(save_path, start_page, end_page),
-            daemon=True
-        ).start()
-        self.root.after(100, self._process_save_queue)
-
-    def _save_worker(self, save_path, start_page=None, end_page=None):
+        self.jobs.submit(self._save_worker, self.pdf_document, save_path, start_page, end_page, optimize, priority=-1, document=True, generation=None,
+                         on_done=self._on_save_done, on_error=self._on_save_error)
+
+    def _detach_history(self, save_path):
+        """Halaman terhapus yang masih dirujuk dari file yang akan ditimpa disalin ke stash agar tetap bisa diurungkan."""
+        if not os.path.exists(save_path): return
         try:
-            if start_page is None:
-                self.pdf_document.save(save_path, garbage=4, deflate=True, clean=True)
-                pages_saved = len(self.pdf_document)
-            else:
-                start_index, end_index = start_page - 1, end_page - 1
-                new_doc = fitz.open()
-                new_doc.insert_pdf(self.pdf_document, from_page=start_index, to_page=end_index)
-                new_doc.save(save_path, garbage=4, deflate=True, clean=True)
-                new_doc.close()
-                pages_saved = (end_index - start_index) + 1
-            self.save_queue.put(('success', save_path, pages_saved))
+            self.history.detach_file(save_path, self.stash)
         except Exception as e:
-            self.save_queue.put(('error', e))
+            self.history.clear()
+            self._update_history_buttons()
+            messagebox.showwarning("⚠️ Riwayat Dihapus", f"Riwayat urungkan tidak bisa dipertahankan setelah menyimpan:\n\n{e}", parent=self.root)
+
+    def _save_worker(self, job, doc, save_path, start_page=None, end_page=None, optimize=False):
+        incremental = start_page is None and not optimize and pdf_core.can_save_incrementally(doc, save_path)
+        size_before = os.path.getsize(save_path) if incremental else 0
+        with tracer.span("save", "save", incremental=incremental, optimize=optimize) as trace:
+            started = time.perf_counter()
+            if start_page is None: pages_saved = pdf_core.save_document(doc, save_path, optimize=optimize)
+            else: pages_saved = pdf_core.save_document(doc, save_path, start_page - 1, end_page - 1, optimize=optimize)
+            trace["bytes"] = os.path.getsize(save_path) - size_before
+            trace["mb_per_s"] = round(trace["bytes"] / 1e6 / max(time.perf_counter() - started, 1e-9), 2)
+        return save_path, pages_saved, incremental, start_page is None
+
+    def _on_save_done(self, result):
+        self._hide_saving_indicator()
+        save_path, pages_saved, incremental, whole_document = result
+        self._fingerprints.pop(save_path, None)
+        if incremental:
+            # File asal sekarang berisi urutan halaman terbaru: sumber render proses diarahkan ke sana.
+            self.pages.set_sources(pdf_stream.page_sources(self.pdf_document, save_path, self.streaming))
+            self.render_engine.retain(())
+            self._render_pending = {key: token for key, token in self._render_pending.items() if key in self._memory_jobs}
+            self._refresh_visible_previews()
+            self._update_text_index()
+            self.update_info_label(f"💾 Perubahan disimpan ke {os.path.basename(save_path)}")
+            return
+        self._sources_overwritten(save_path, whole_document)
+        messagebox.showinfo("✅ Berhasil", f"🎉 File berhasil disimpan!\nLokasi: {os.path.basename(save_path)}\nHalaman: {pages_saved}", parent=self.root)
+
+    def _sources_overwritten(self, save_path, whole_document):
+        """Halaman yang sumbernya file save_path (baru saja ditimpa) tidak lagi cocok dengan isi file itu.
+
+        Bila seluruh dokumen disimpan ke sana, halaman diarahkan ke posisinya di file baru (tanpa xref,
+        karena simpan penuh menomori ulang objek); bila hanya sebagian, halaman dilepas dari file dan
+        dirender dari dokumen di memori, seperti `History.detach_file` untuk halaman terhapus.
+        """
+        sources, affected = [], []
+        for i in range(len(self.pages)):
+            source = self.pages.source(i)
+            if source and pdf_core.same_path(source[0], save_path):
+                self._fingerprints.pop(source[0], None)
+                source = (save_path, i, None) if whole_document else None
+                affected.append(self.pages.uid(i))
+            sources.append(source)
+        if not affected: return
+        self.pages.set_sources(sources)
+        for uid in affected: self._cancel_thumbnail_requests(uid)
+        self._search = None
+        self._refresh_visible_previews()
+        self._update_text_index()
+
+    def _on_save_error(self, error_exception):
+        self._hide_saving_indicator()
+        messagebox.showerror("❌ Error", f"Gagal menyimpan file:\n\n{str(error_exception)}", parent=self.root)
+
+    # --- Simpan dengan Optimasi Ukuran ---
+    def _start_optimized_save(self, save_path, start_page, end_page, dpi):
+        """Snapshot dokumen ditulis ke file sementara, gambar diukur dan dikodekan ulang paralel di
+        process pool, lalu hasilnya diterapkan ke snapshot dan disimpan ke save_path."""
+        doc = self.pdf_document
+        if doc.name and pdf_core.same_path(save_path, doc.name):
+            messagebox.showerror("❌ Error", "File yang sedang dibuka tidak bisa ditulis ulang penuh; simpan ke file lain.", parent=self.root)
+            return
+        fd, snapshot = tempfile.mkstemp(suffix=".pdf")
+        os.close(fd)
+        state = {'save_path': save_path, 'snapshot': snapshot, 'dpi': dpi, 'sizes': {}, 'results': [], 'remaining': 0, 'done': 0,
+                 'whole_document': start_page is None, 'started': time.perf_counter()}
+        self._set_editing_enabled(False)
+        self._show_task_progress(1)
+        self.update_info_label("🧹 Menyiapkan optimasi...")
+        first, last = (None, None) if start_page is None else (start_page - 1, end_page - 1)
+        self.jobs.submit(lambda job: (pdf_core.save_document(doc, snapshot, first, last), os.path.getsize(snapshot)), priority=-1, document=True, generation=None,
+                         on_done=lambda result: self._measure_for_optimize(state, *result),
+                         on_error=lambda e: self._finish_optimized_save(state, error=e))
+
+    def _measure_for_optimize(self, state, page_count, size):
+        state['before'] = size
+        chunks = page_chunks(page_count, pdf_optimize.MEASURE_CHUNK)
+        state['remaining'] = len(chunks)
+        self._show_task_progress(page_count)
+        self.update_info_label(f"🧹 Memeriksa gambar di {page_count} halaman...")
+        for first, last in chunks:
+            self.jobs.submit(pdf_optimize.measure_pages, state['snapshot'], first, last, process=True, generation=None,
+                             on_done=lambda sizes, n=last - first + 1: self._on_images_measured(state, sizes, n),
+                             on_error=lambda e: self._finish_optimized_save(state, error=e))
+
+    def _on_images_measured(self, state, sizes, pages):
+        if 'error' in state: return
+        pdf_optimize.merge_measurements(state['sizes'], sizes)
+        state['remaining'] -= 1
+        state['done'] += pages
+        self.task_progress.config(value=state['done'])
+        if state['remaining']: return
+        tasks = pdf_optimize.image_tasks(state['sizes'])
+        if not tasks: return self._write_optimized(state)
+        state['remaining'], state['done'] = len(tasks), 0
+        self._show_task_progress(len(state['sizes']))
+        self.update_info_label(f"🧹 Mengompres ulang 0 dari {len(state['sizes'])} gambar...")
+        for chunk in tasks:
+            self.jobs.submit(pdf_optimize.recompress_images, state['snapshot'], chunk, state['dpi'], process=True, generation=None,
+                             on_done=lambda results: self._on_images_recompressed(state, results),
+                             on_error=lambda e: self._finish_optimized_save(state, error=e))
+
+    def _on_images_recompressed(self, state, results):
+        if 'error' in state: return
+        state['results'].extend(results)
+        state['remaining'] -= 1
+        state['done'] += len(results)
+        self.task_progress.config(value=state['done'])
+        self.update_info_label(f"🧹 Mengompres ulang {state['done']} dari {len(state['sizes'])} gambar...")
+        if state['remaining'] == 0: self._write_optimized(state)
+
+    def _write_optimized(self, state):
+        self.update_info_label("🧹 Menulis file hasil optimasi...")
+        self.jobs.submit(self._optimized_save_worker, state, priority=-1, generation=None,
+                         on_done=lambda stats: self._finish_optimized_save(state, stats),
+                         on_error=lambda e: self._finish_optimized_save(state, error=e))
+
+    def _optimized_save_worker(self, job, state):
+        with tracer.span("save_optimized", "save", images=len(state['results'])) as trace, pdf_core.open_document(state['snapshot']) as doc:
+            stats = pdf_optimize.apply_results(doc, state['results'])
+            doc.save(state['save_path'], **pdf_optimize.SAVE_OPTIONS)
+            stats['pages'] = len(doc)
+            trace.update(stats)
+        return stats
+
+    def _finish_optimized_save(self, state, stats=None, error=None):
+        if 'error' in state: return  # Kegagalan tugas lain sudah dilaporkan
+        state['error'] = error
+        self._fingerprints.pop(state['save_path'], None)
+        try: os.remove(state['snapshot'])
+        except OSError as e: print(f"Gagal menghapus snapshot sementara: {e}")
+        self._hide_task_progress()
+        self._set_editing_enabled(True)
+        if error is not None:
+            messagebox.showerror("❌ Error", f"Gagal menyimpan file:\n\n{str(error)}", parent=self.root)
+            return
+        self._sources_overwritten(state['save_path'], state['whole_document'])
+        before, after = state['before'], os.path.getsize(state['save_path'])
+        elapsed = time.perf_counter() - state['started']
+        messagebox.showinfo("✅ Berhasil", f"🎉 File berhasil disimpan!\nLokasi: {os.path.basename(state['save_path'])}\nHalaman: {stats['pages']}\n\n"
+                            f"📦 Ukuran: {before / 1e6:.2f} MB → {after / 1e6:.2f} MB ({(1 - after / max(before, 1)) * 100:.0f}% lebih kecil)\n"
+                            f"🖼️ {stats['recompressed']} gambar dikompres ulang ({stats['bilevel']} hitam-putih), "
+                            f"{stats['duplicates']} duplikat digabung\n⏱️ {elapsed:.1f} detik", parent=self.root)
+
+    def split_pdf(self):
+        if not self.pdf_document or len(self.pdf_document) < 2: return
+        plan = self._ask_split_plan()
+        if not plan: return
+        folder = filedialog.askdirectory(title="📁 Pilih Folder Hasil")
+        if not folder: return
+        base = os.path.splitext(os.path.basename(self.file_path or "PDF_Baru.pdf"))[0]
+        parts = [(indices, os.path.join(folder, f"{base}_{label}.pdf")) for indices, label in plan]
+        doc = self.pdf_document
+        self._set_editing_enabled(False)
+        self._show_task_progress(len(parts))
+        self.update_info_label(f"✂️ Mengekspor 0 dari {len(parts)} file...")
+        if doc.name and not doc.is_dirty:
+            self._submit_split_parts(doc.name, parts, None)
+        else:
+            # Worker membuka file sumber sendiri, jadi perubahan yang belum disimpan ditulis dulu ke snapshot sementara.
+            fd, snapshot = tempfile.mkstemp(suffix=".pdf")
+            os.close(fd)
+            self.jobs.submit(lambda job: pdf_core.save_document(doc, snapshot), priority=-1, document=True, generation=None,
+                             on_done=lambda _: self._submit_split_parts(snapshot, parts, snapshot),
+                             on_error=lambda e: self._finish_split({'snapshot': snapshot, 'failed': [str(e)], 'files': 0}))
+
+    def _submit_split_parts(self, src_path, parts, snapshot):
+        """Bagian-bagian dibagi ke beberapa tugas process; tiap worker membuka sumber sekali untuk satu tugas."""
+        chunks = pdf_core.chunk_parts(parts, self.jobs.process_workers)
+        state = {'snapshot': snapshot, 'total': len(parts), 'remaining': len(chunks), 'files': 0, 'pages': 0, 'bytes': 0,
+                 'failed': [], 'started': time.perf_counter()}
+        for chunk in chunks:
+            self.jobs.submit(pdf_core.export_parts, src_path, chunk, process=True, generation=None,
+                             on_done=lambda results: self._on_split_chunk_done(state, results),
+                             on_error=lambda e, c=chunk: self._on_split_chunk_done(state, [], [f"{os.path.basename(c[0][1])}: {e}"]))
+
+    def _on_split_chunk_done(self, state, results, errors=()):
+        state['remaining'] -= 1
+        state['failed'].extend(errors)
+        for _, pages, size in results:
+            state['files'] += 1
+            state['pages'] += pages
+            state['bytes'] += size
+        self.task_progress.config(value=state['files'])
+        self.update_info_label(f"✂️ Mengekspor {state['files']} dari {state['total']} file...")
+        if state['remaining'] == 0: self._finish_split(state)
 
-    def _process_save_queue(self):
+    def _finish_split(self, state):
+        if state['snapshot']:
+            try: os.remove(state['snapshot'])
+            except OSError as e: print(f"Gagal menghapus snapshot sementara: {e}")
+        self._hide_task_progress()
+        self._set_editing_enabled(True)
+        if state['failed']:
+            messagebox.showerror("❌ Error", f"{state['files']} file berhasil diekspor.\n\nGagal:\n" + "\n".join(state['failed'][:5]), parent=self.root)
+            return
+        elapsed = max(time.perf_counter() - state['started'], 1e-9)
+        messagebox.showinfo("✅ Berhasil", f"🎉 {state['files']} file diekspor ({state['pages']} halaman) dalam {elapsed:.1f} detik.\n"
+                            f"⚡ {state['pages'] / elapsed:.0f} hal/s  |  {state['bytes'] / 1e6 / elapsed:.1f} MB/s", parent=self.root)
+
+    def _ask_split_plan(self):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("✂️ Pisah / Ekspor Halaman")
+        main_frame = ttk.Frame(dialog, padding=20)
+        main_frame.pack(fill=BOTH, expand=True)
+        total_pages = len(self.pdf_document)
+        has_bookmarks = bool(self.pdf_document.get_toc(simple=True))
+        ttk.Label(main_frame, text="✂️ Pisah Menjadi Beberapa File", font=("Segoe UI", 16, "bold")).pack(anchor=W)
+        ttk.Label(main_frame, text=f"📊 Total halaman: {total_pages}", font=("Segoe UI", 10)).pack(anchor=W, pady=(0, 15))
+        mode = tk.StringVar(value="every")
+        options_frame = ttk.LabelFrame(main_frame, text="Cara Memisah", padding=15)
+        options_frame.pack(fill=X, pady=(0, 15))
+        every_frame = ttk.Frame(options_frame)
+        every_frame.pack(fill=X)
+        ttk.Radiobutton(every_frame, text="Setiap", variable=mode, value="every").pack(side=LEFT)
+        entry_every = ttk.Entry(every_frame, width=6)
+        entry_every.pack(side=LEFT, padx=5)
+        entry_every.insert(0, "10")
+        ttk.Label(every_frame, text="halaman").pack(side=LEFT)
+        ttk.Radiobutton(options_frame, text="Di setiap bookmark" + ("" if has_bookmarks else " (tidak ada bookmark)"), variable=mode, value="bookmarks",
+                        state=NORMAL if has_bookmarks else DISABLED).pack(anchor=W, pady=(8, 0))
+        ranges_frame = ttk.Frame(options_frame)
+        ranges_frame.pack(fill=X, pady=(8, 0))
+        ttk.Radiobutton(ranges_frame, text="Rentang:", variable=mode, value="ranges").pack(side=LEFT)
+        entry_ranges = ttk.Entry(ranges_frame, width=24)
+        entry_ranges.pack(side=LEFT, padx=5)
+        entry_ranges.insert(0, "1-3; 4-6")
+        ttk.Label(options_frame, text="Pisahkan file hasil dengan ';', mis. 1-3; 4-9,12", font=("Segoe UI", 9), foreground="#7f8c8d").pack(anchor=W, pady=(5, 0))
+        result = [None]
+        def on_ok():
+            try:
+                if mode.get() == "every":
+                    n = int(entry_every.get())
+                    if n < 1: raise ValueError("Jumlah halaman per file minimal 1.")
+                    result[0] = pdf_core.split_every(total_pages, n)
+                elif mode.get() == "bookmarks":
+                    result[0] = pdf_core.split_at_bookmarks(self.pdf_document)
+                else:
+                    result[0] = pdf_core.split_by_ranges([spec for spec in entry_ranges.get().split(";") if spec.strip()], total_pages)
+                if not result[0]: raise ValueError("Tidak ada halaman yang dipilih.")
+                dialog.destroy()
+            except ValueError as e:
+                messagebox.showerror("❌ Input Tidak Valid", str(e) or "Input tidak valid.", parent=dialog)
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(fill=X, side=BOTTOM)
+        ttk.Button(btn_frame, text="❌ Batal", command=dialog.destroy, bootstyle="secondary-outline").pack(side=RIGHT)
+        ttk.Button(btn_frame, text="✂️ Pisah", command=on_ok, bootstyle="primary").pack(side=RIGHT, padx=(0, 10))
+        self._center_dialog(dialog)
+        self.root.wait_window(dialog)
+        return result[0]
+
+    # --- Diagnostik ---
+    def show_diagnostics(self):
+        """Panel diagnostik: ringkasan span tracer, ekspor Chrome trace, dan mode profil cProfile/tracemalloc."""
+        if self._diagnostics and self._diagnostics.winfo_exists():
+            self._diagnostics.lift()
+            return
+        dialog = self._diagnostics = tk.Toplevel(self.root)
+        dialog.title("🐞 Diagnostik Kinerja")
+        dialog.geometry("780x480")
+        main_frame = ttk.Frame(dialog, padding=20)
+        main_frame.pack(fill=BOTH, expand=True)
+        ttk.Label(main_frame, text="Waktu per operasi sejak aplikasi dibuka (render di worker, antrean, thread Tk, simpan, impor, edit)",
+                  font=("Segoe UI", 9), foreground="#7f8c8d").pack(anchor=W, pady=(0, 10))
+        columns = ("cat", "count", "total", "p50", "p95", "max")
+        tree = ttk.Treeview(main_frame, columns=columns, height=14)
+        tree.heading("#0", text="Operasi")
+        tree.column("#0", width=220)
+        for column, title in zip(columns, ("Kategori", "Jumlah", "Total (ms)", "p50 (ms)", "p95 (ms)", "Maks (ms)")):
+            tree.heading(column, text=title)
+            tree.column(column, width=85, anchor=E)
+        tree.pack(fill=BOTH, expand=True)
+        def refresh():
+            tree.delete(*tree.get_children())
+            for name, cat, count, total, p50, p95, peak in tracer.summary():
+                tree.insert("", END, text=name, values=(cat, count, f"{total * 1000:.1f}", f"{p50 * 1000:.2f}", f"{p95 * 1000:.2f}", f"{peak * 1000:.2f}"))
+        def toggle_profile():
+            if not tracer.profiling:
+                tracer.start_profile()
+                btn_profile.config(text="⏹️ Stop Profil")
+                return
+            folder = filedialog.askdirectory(title="📁 Simpan Hasil Profil", parent=dialog)
+            if not folder: return
+            try:
+                paths = tracer.stop_profile(folder)
+                messagebox.showinfo("✅ Profil Disimpan", "\n".join(os.path.basename(p) for p in paths), parent=dialog)
+            except Exception as e:
+                messagebox.showerror("❌ Error", f"Gagal menyimpan profil:\n\n{str(e)}", parent=dialog)
+            btn_profile.config(text="⏺️ Mulai Profil")
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(fill=X, pady=(10, 0))
+        ttk.Button(btn_frame, text="🔄 Segarkan", command=refresh, bootstyle="secondary-outline").pack(side=LEFT)
+        ttk.Button(btn_frame, text="🧹 Kosongkan", command=lambda: (tracer.clear(), refresh()), bootstyle="secondary-outline").pack(side=LEFT, padx=8)
+        btn_profile = ttk.Button(btn_frame, text="⏹️ Stop Profil" if tracer.profiling else "⏺️ Mulai Profil", command=toggle_profile, bootstyle="warning-outline")
+        btn_profile.pack(side=LEFT)
+        ttk.Button(btn_frame, text="📤 Ekspor Trace", command=lambda: self._export_trace(dialog), bootstyle="primary").pack(side=RIGHT)
+        refresh()
+
+    def _export_trace(self, parent):
+        path = filedialog.asksaveasfilename(title="📤 Ekspor Trace", defaultextension=".json", initialfile="trace_pdf_editor.json",
+                                            filetypes=[("Chrome Trace", "*.json")], parent=parent)
+        if not path: return
         try:
-            item = self.save_queue.get_nowait()
-            self._hide_saving_indicator()
-            status, data = item[0], item[1:]
-            if status == 'success':
-                save_path, pages_saved = data
-                messagebox.showinfo("✅ Berhasil", f"🎉 File berhasil disimpan!\nLokasi: {os.path.basename(save_path)}\nHalaman: {pages_saved}", parent=self.root)
-            else:
-                error_exception = data[0]
-                messagebox.showerror("❌ Error", f"Gagal menyimpan file:\n\n{str(error_exception)}", parent=self.root)
-        except queue.Empty:
-            self.root.after(100, self._process_save_queue)
+            count = tracer.export_chrome(path)
+            messagebox.showinfo("✅ Berhasil", f"{count} span diekspor ke {os.path.basename(path)}.\nBuka di chrome://tracing atau ui.perfetto.dev.", parent=parent)
+        except Exception as e:
+            messagebox.showerror("❌ Error", f"Gagal mengekspor trace:\n\n{str(e)}", parent=parent)
 
     def update_ui_after_load(self):
         self.btn_add.config(state=NORMAL)
         self.btn_save.config(state=NORMAL)
+        # Simpan cepat hanya untuk dokumen yang dibuka dari file (bisa ditulis inkremental).
+        self.btn_quick_save.config(state=NORMAL if self.pdf_document and self.pdf_document.name else DISABLED)
         self.btn_delete.config(state=DISABLED)
         self.btn_delete_range.config(state=NORMAL if self.pdf_document and len(self.pdf_document) > 0 else DISABLED)
+        self.btn_split.config(state=NORMAL if self.pdf_document and len(self.pdf_document) > 1 else DISABLED)
+        self.btn_move.config(state=NORMAL if self.pdf_document and len(self.pdf_document) > 1 else DISABLED)
+        self.btn_cleanup.config(state=NORMAL if self.pdf_document and len(self.pdf_document) > 0 else DISABLED)
+        self.btn_select.config(state=NORMAL if self.pdf_document else DISABLED)
     
     def reset_state(self):
         self.is_loading = False
-        if self.pdf_document: self.pdf_document.close()
-        self.pdf_document, self.file_path, self.selected_page_index = None, None, None
-        self.previews.clear()
-        self.preview_frames.clear()
+        if self.pdf_document: self._close_document()
+        self.pdf_document, self.file_path = None, None
+        self.streaming = False
+        self.selection.clear()
+        self.pages.reset()
+        self._reset_history()
+        self._reset_text_index()
+        self.thumbnails.clear()
         self.btn_add.config(state=DISABLED)
         self.btn_save.config(state=DISABLED) 
+        self.btn_quick_save.config(state=DISABLED)
         self.btn_delete.config(state=DISABLED)
         self.btn_delete_range.config(state=DISABLED)
+        self.btn_split.config(state=DISABLED)
+        self.btn_move.config(state=DISABLED)
+        self.btn_cleanup.config(state=DISABLED)
+        self.btn_select.config(state=DISABLED)
         self.update_info_label()
         self.display_previews()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="PDF Editor Pro")
+    parser.add_argument("file", nargs="?", help="File PDF yang langsung dibuka")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Cetak waktu startup sampai halaman pertama tampil dan simpan profil cProfile-nya")
+    parser.add_argument("--startup-profile-dir", default=".", metavar="FOLDER", help="Folder profil startup (default: folder saat ini)")
+    parser.add_argument("--stream", action="store_true", default=None,
+                        help="Buka file dalam mode streaming walau kecil/lokal (default: otomatis untuk file besar dan share jaringan)")
+    parser.add_argument("--read-ahead", type=int, metavar="N",
+                        help=f"Halaman di depan arah scroll yang disiapkan dalam mode streaming (default: {pdf_stream.DEFAULT_READ_AHEAD})")
+    args = parser.parse_args()
+    timer = pdf_startup.StartupTimer()
+    timer.mark("impor modul")
+    if args.startup_profile: tracer.start_profile(memory=False)
     root = ttk.Window(themename="litera")
+    timer.mark("jendela dibuat")
     app = PDFEditorApp(root)
+    if args.read_ahead is not None: app.read_ahead = max(0, args.read_ahead)
+    timer.mark("UI dibangun")
+    root.update()  # Jendela digambar sebelum dokumen dibuka dan pustaka render dimuat
+    timer.mark("tergambar pertama")
+    app.startup(args.file and os.path.abspath(args.file), timer, args.startup_profile and args.startup_profile_dir, args.stream)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""Mesin render thumbnail paralel berbasis process pool.
+
+Setiap proses worker membuka handle `fitz` sendiri untuk file sumber dan merender
+sekelompok halaman sekaligus. Hasilnya dikirim balik sebagai buffer byte RGB yang
+ringkas sehingga thread Tk hanya perlu membungkusnya menjadi PhotoImage.
+"""
+import os
+import time
+import heapq
+import itertools
+from collections import OrderedDict
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+from pdf_trace import tracer
+
+THUMB_SIZE = (280, 380)
+MAX_ZOOM = 96 / 72       # Halaman kecil tidak diperbesar melebihi 96 DPI
+BATCH_SIZE = 4           # Jumlah halaman per tugas yang dikirim ke satu worker
+MAX_OPEN_DOCUMENTS = 4   # Handle dokumen yang disimpan per proses worker
+
+_open_documents = OrderedDict()
+
+
+def blank_thumbnail():
+    """Thumbnail putih pengganti untuk halaman yang gagal dirender."""
+    return (THUMB_SIZE[0], THUMB_SIZE[1], b"\xff" * (THUMB_SIZE[0] * THUMB_SIZE[1] * 3))
+
+
+def render_thumbnail(page, size=THUMB_SIZE, grayscale=False):
+    """Merender halaman langsung ke dalam kotak `size` (tanpa render besar lalu diperkecil).
+
+    Matriks dihitung dari `page.rect` (sudah memperhitungkan rotasi) dan pixmap dibuat tanpa
+    kanal alpha. Hasil: (width, height, samples) dengan 3 byte/piksel, atau 1 bila grayscale.
+    """
+    rect = page.rect
+    zoom = min(size[0] / rect.width, size[1] / rect.height, MAX_ZOOM)
+    colorspace = fitz.csGRAY if grayscale else fitz.csRGB
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=colorspace, alpha=False)
+    return pix.width, pix.height, pix.samples
+
+
+def rotate_thumbnail(thumb, angle, box=None):
+    """Memutar thumbnail yang sudah dirender sebesar kelipatan 90° searah jarum jam (seperti rotasi halaman PDF).
+
+    Jauh lebih murah daripada merender ulang halaman. Bila box diisi, hasil diperkecil agar muat di kotak.
+    """
+    width, height, samples = thumb
+    mode = "L" if len(samples) == width * height else "RGB"
+    img = Image.frombuffer(mode, (width, height), samples, "raw", mode, 0, 1)
+    turns = (angle // 90) % 4
+    if turns: img = img.transpose((None, Image.Transpose.ROTATE_270, Image.Transpose.ROTATE_180, Image.Transpose.ROTATE_90)[turns])
+    if box and (img.width > box[0] or img.height > box[1]): img.thumbnail(box, Image.BILINEAR)
+    return img.width, img.height, img.tobytes()
+
+
+def ppm_data(thumb):
+    """Membungkus samples thumbnail sebagai PPM/PGM biner yang bisa langsung dibaca tk.PhotoImage."""
+    width, height, samples = thumb
+    magic = b"P5" if len(samples) == width * height else b"P6"
+    return b"%s %d %d 255\n" % (magic, width, height) + samples
+
+
+def get_worker_document(path):
+    """Mengembalikan handle `fitz` milik proses ini untuk path, dibuka ulang bila file berubah."""
+    key = (path, os.path.getmtime(path))
+    doc = _open_documents.get(key)
+    if doc is None:
+        doc = _open_documents[key] = fitz.open(path)
+        while len(_open_documents) > MAX_OPEN_DOCUMENTS:
+            _open_documents.popitem(last=False)[1].close()
+    _open_documents.move_to_end(key)
+    return doc
+
+
+def render_page_range(path, tasks, grayscale=False):
+    """Dijalankan di proses worker. `tasks` berisi (key, pno, rotation, size).
+
+    Hasil: (pid, [(key, (w, h, samples), mulai, durasi), ...]); waktu dipakai tracer di proses GUI.
+    Halaman yang gagal dirender menghasilkan thumb None.
+    """
+    doc = get_worker_document(path)
+    results = []
+    for key, pno, rotation, size in tasks:
+        started = time.perf_counter()
+        try:
+            page = doc[pno]
+            if page.rotation != rotation: page.set_rotation(rotation)
+            thumb = render_thumbnail(page, size, grayscale=grayscale)
+        except Exception as e:
+            print(f"Gagal merender halaman {pno + 1} dari {os.path.basename(path)}: {e}")
+            thumb = None
+        results.append((key, thumb, started, time.perf_counter() - started))
+    return os.getpid(), results
+
+
+class ThumbnailEngine:
+    """Antrean prioritas tugas render yang dibagikan ke process pool milik `JobScheduler`.
+
+    Setiap tugas diidentifikasi oleh `key` bebas milik pemanggil (mis. (uid, level)).
+    Tugas dengan prioritas terkecil dikirim lebih dulu, paling banyak dua batch per worker
+    sekaligus, sehingga tugas yang dibatalkan lewat `retain()` belum sempat dikerjakan.
+    Hasil diteruskan ke `on_result(key, thumb)` di thread Tk; bila `cache` diisi, hasil
+    yang punya cache_key juga ditulis ke cache lewat pekerjaan thread.
+    """
+
+    def __init__(self, scheduler, on_result, batch_size=BATCH_SIZE, cache=None, grayscale=False):
+        self.scheduler = scheduler
+        self.on_result = on_result
+        self.batch_size = batch_size
+        self.cache = cache
+        self.grayscale = grayscale
+        self._heap = []
+        self._queued = {}
+        self._counter = itertools.count()
+        self._in_flight = 0
+
+    def reset(self):
+        """Membuang semua tugas yang tertunda. Hasil yang masih di jalan dibuang oleh scheduler
+        karena generasinya sudah diganti pemanggil."""
+        self._heap.clear()
+        self._queued.clear()
+        self._in_flight = 0
+
+    def submit(self, key, path, pno, rotation, size=THUMB_SIZE, priority=0, cache_key=None):
+        previous = self._queued.get(key)
+        if previous: previous[2] = None  # Tugas lama dengan key sama (mis. sebelum diputar) digantikan
+        entry = [priority, next(self._counter), key, path, pno, rotation, size, cache_key]
+        self._queued[key] = entry
+        heapq.heappush(self._heap, entry)
+        self._dispatch()
+
+    def retain(self, keys):
+        """Membatalkan tugas tertunda yang key-nya tidak ada di keys; mengembalikan key yang dibatalkan."""
+        dropped = [key for key in self._queued if key not in keys]
+        for key in dropped:
+            self._queued.pop(key)[2] = None  # Ditandai batal, dibuang saat dikeluarkan dari heap
+        return dropped
+
+    def cancel(self, keys):
+        """Membatalkan tugas tertunda untuk keys; hasil tugas yang sudah dikirim ke worker tetap diteruskan."""
+        for key in keys:
+            entry = self._queued.pop(key, None)
+            if entry: entry[2] = None
+
+    def _dispatch(self):
+        while self._heap and self._in_flight < self.scheduler.process_workers * 2:
+            batches = {}
+            keys = {}
+            taken = 0
+            while self._heap and taken < self.batch_size:
+                _, _, key, path, pno, rotation, size, cache_key = heapq.heappop(self._heap)
+                if key is None: continue
+                del self._queued[key]
+                batches.setdefault(path, []).append((key, pno, rotation, size))
+                keys[key] = cache_key
+                taken += 1
+            for path, tasks in batches.items():
+                self._in_flight += 1
+                self.scheduler.submit(render_page_range, path, tasks, self.grayscale, process=True,
+                                      on_done=lambda batch, k=keys: self._on_done(batch, k),
+                                      on_error=lambda e, t=tasks: self._on_done((None, [(task[0], None, 0, 0) for task in t]), {}, e))
+
+    def _on_done(self, batch, keys, error=None):
+        if error is not None: print(f"Worker render gagal: {error}")
+        self._in_flight = max(0, self._in_flight - 1)
+        pid, results = batch
+        if pid:
+            for key, thumb, started, seconds in results: tracer.add("render_page", started, seconds, "render", pid=pid, ok=thumb is not None)
+        if self.cache:
+            entries = [(keys[key], thumb) for key, thumb, *_ in results if thumb and keys.get(key)]
+            if entries: self.scheduler.submit(self._store_in_cache, entries, priority=10, generation=None)
+        for key, thumb, *_ in results: self.on_result(key, thumb or blank_thumbnail())
+        self._dispatch()
+
+    def _store_in_cache(self, job, entries):
+        for cache_key, thumb in entries: self.cache.put(cache_key, *thumb)
@@ -0,0 +1,84 @@
+"""Startup cepat PDF Editor Pro.
+
+Modul ini diimpor paling awal oleh `pdf_pro` agar waktu startup bisa diukur sejak skrip
+mulai berjalan. Pustaka render (PyMuPDF) dan modul analisis berbasis NumPy didaftarkan
+sebagai modul lazy: `import fitz` langsung kembali, dan impor sebenarnya baru terjadi saat
+atributnya pertama kali dipakai (membuka dokumen, merender). Jendela jadi bisa tergambar
+sebelum pustaka berat dimuat, dan proses worker yang di-spawn ulang juga ikut lebih ringan.
+
+`StartupTimer` mencatat titik-titik startup (impor, jendela, UI, gambar pertama, halaman
+pertama tampil) sebagai span di `pdf_trace.tracer` dan mencetak ringkasannya untuk opsi
+--startup-profile.
+"""
+import sys
+import time
+import types
+import threading
+import importlib
+import importlib.util
+
+STARTED = time.perf_counter()
+
+# Modul yang diimpor lazy; harus didaftarkan sebelum modul lain mengimpornya.
+LAZY_MODULES = ("fitz", "pdf_analysis", "pdf_optimize")
+
+
+_lock = threading.RLock()
+
+
+class _LazyModule(types.ModuleType):
+    """Pengganti modul di sys.modules sampai atribut pertamanya dipakai.
+
+    Berbeda dengan importlib.util.LazyLoader, pernyataan `import x` berikutnya (yang membaca
+    __spec__) tidak memicu impor; hanya atribut yang belum ada yang memicunya.
+    """
+
+    def __getattr__(self, attr):
+        with _lock:
+            if sys.modules.get(self.__name__) is self:
+                del sys.modules[self.__name__]
+                try:
+                    module = importlib.import_module(self.__name__)
+                except BaseException:
+                    sys.modules[self.__name__] = self
+                    raise
+                self.__dict__.update(module.__dict__)  # Modul yang sudah memegang pengganti ini ikut lengkap
+        return getattr(sys.modules[self.__name__], attr)
+
+
+def lazy_import(name):
+    """Modul `name` yang baru dieksekusi saat atributnya pertama kali diakses."""
+    if name in sys.modules: return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None: raise ImportError(f"Modul {name} tidak ditemukan", name=name)
+    module = _LazyModule(name)
+    module.__spec__, module.__loader__ = spec, spec.loader
+    sys.modules[name] = module
+    return module
+
+
+def install_lazy_modules():
+    for name in LAZY_MODULES: lazy_import(name)
+
+
+class StartupTimer:
+    def __init__(self, started=STARTED):
+        self.started = started
+        self.marks = []          # (label, detik sejak mulai)
+        self.finished = False
+        self._last = started
+
+    def mark(self, label):
+        """Mencatat titik startup; durasi sejak titik sebelumnya masuk tracer sebagai span."""
+        from pdf_trace import tracer
+        now = time.perf_counter()
+        tracer.add(f"startup:{label}", self._last, now - self._last, "startup")
+        self.marks.append((label, now - self.started))
+        self._last = now
+
+    def report(self):
+        lines, previous = [], 0.0
+        for label, elapsed in self.marks:
+            lines.append(f"{elapsed * 1000:8.1f} ms  (+{(elapsed - previous) * 1000:7.1f})  {label}")
+            previous = elapsed
+        return "Startup PDF Editor Pro (sejak skrip mulai):\n" + "\n".join(lines)
@@ -0,0 +1,88 @@
+"""Mode streaming untuk PDF yang sangat besar atau berada di share jaringan.
+
+MuPDF sudah membaca file lewat stream yang bisa di-seek: saat dibuka hanya trailer, tabel
+xref dan akar pohon halaman yang dibaca, isi halaman baru dibaca saat halaman dimuat.
+Yang membuat pembukaan file besar tetap lambat adalah langkah aplikasi yang menyentuh
+semua halaman sekaligus. Dalam mode streaming:
+
+- sumber halaman dicatat tanpa xref (`page_sources`), jadi pohon halaman tidak dijelajahi
+  seluruhnya; thumbnail di cache disk diberi kunci nomor halaman sebagai gantinya;
+- pengindeksan teks seluruh file baru dimulai saat pengguna pertama kali mencari;
+- halaman di depan arah scroll disiapkan lebih dulu (`read_ahead_range`), sebanyak
+  PDF_EDITOR_READ_AHEAD halaman, agar scroll di share jaringan tidak menunggu.
+
+Jadi jumlah data yang dibaca sebanding dengan halaman yang dilihat. File sengaja tidak
+di-mmap: pemetaan yang tetap terbuka menghalangi simpan cepat ke file yang sama di Windows,
+dan baca acak MuPDF lewat file biasa sudah hanya mengambil bagian yang diperlukan.
+
+Mode streaming dipakai otomatis untuk file sebesar PDF_EDITOR_STREAM_MB atau lebih dan
+file di share jaringan (path UNC, drive jaringan, mount NFS/SMB).
+"""
+import os
+
+DEFAULT_STREAM_MB = 256
+DEFAULT_READ_AHEAD = 12     # Halaman di depan arah scroll yang dirender lebih dulu
+DRIVE_REMOTE = 4            # GetDriveTypeW
+NETWORK_FILESYSTEMS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "afs", "fuse.sshfs"}
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def stream_threshold_bytes():
+    """Ukuran file minimum untuk mode streaming (PDF_EDITOR_STREAM_MB, default DEFAULT_STREAM_MB)."""
+    return max(1, _env_int("PDF_EDITOR_STREAM_MB", DEFAULT_STREAM_MB)) * 1024 * 1024
+
+
+def read_ahead_pages():
+    """Jumlah halaman read-ahead (PDF_EDITOR_READ_AHEAD, default DEFAULT_READ_AHEAD; 0 = mati)."""
+    return max(0, _env_int("PDF_EDITOR_READ_AHEAD", DEFAULT_READ_AHEAD))
+
+
+def _mount_type(path):
+    """Jenis file system mount terdalam yang memuat path (Linux), None bila tidak diketahui."""
+    try:
+        with open("/proc/mounts", encoding="utf-8") as f:
+            mounts = [line.split()[1:3] for line in f]
+    except OSError:
+        return None
+    best, kind = "", None
+    for point, fstype in mounts:
+        point = point.replace("\\040", " ")
+        if (path == point or path.startswith(point.rstrip("/") + "/")) and len(point) > len(best):
+            best, kind = point, fstype
+    return kind
+
+
+def is_network_path(path):
+    if path.startswith(("\\\\", "//")): return True  # UNC, diperiksa sebelum abspath
+    path = os.path.abspath(path)
+    if os.name == "nt":
+        import ctypes
+        drive = os.path.splitdrive(path)[0]
+        return bool(drive) and ctypes.windll.kernel32.GetDriveTypeW(drive + "\\") == DRIVE_REMOTE
+    return _mount_type(path) in NETWORK_FILESYSTEMS
+
+
+def should_stream(path):
+    try:
+        if os.path.getsize(path) >= stream_threshold_bytes(): return True
+    except OSError:
+        return False
+    return is_network_path(path)
+
+
+def page_sources(doc, path, streaming=False):
+    """Sumber (path, pno, xref) semua halaman doc; dalam mode streaming xref None agar pohon halaman tidak dibaca."""
+    if streaming: return [(path, i, None) for i in range(len(doc))]
+    return [(path, i, doc.page_xref(i)) for i in range(len(doc))]
+
+
+def read_ahead_range(window, forward, count, page_count):
+    """Halaman sebanyak count tepat sesudah (forward) atau sebelum window."""
+    if forward: return range(window.stop, min(window.stop + count, page_count))
+    return range(max(0, window.start - count), window.start)
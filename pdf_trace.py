@@ -0,0 +1,110 @@
+"""Instrumentasi waktu dan profil untuk diagnosis dokumen yang lambat.
+
+`tracer` mencatat span per operasi (render per halaman, waktu tunggu antrean, waktu di
+thread Tk, simpan, impor, edit) ke ring buffer berukuran tetap, jadi selalu aktif tanpa
+membebani memori. Waktu memakai `time.perf_counter()` yang berlaku se-sistem (QPC di
+Windows, CLOCK_MONOTONIC di Linux), sehingga span dari proses worker bisa digabung ke
+timeline yang sama.
+
+Span bisa diringkas untuk panel diagnostik atau diekspor sebagai Chrome trace JSON
+(buka di chrome://tracing atau https://ui.perfetto.dev). Mode profil opsional menyalakan
+cProfile (thread Tk) dan tracemalloc lalu menulis hasilnya ke folder pilihan pengguna.
+"""
+import os
+import json
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+TRACE_LIMIT = 50000   # Span terakhir yang disimpan
+PROFILE_TOP = 40      # Baris teratas pada laporan teks cProfile/tracemalloc
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+class Tracer:
+    def __init__(self, limit=TRACE_LIMIT):
+        self._spans = deque(maxlen=limit)  # (nama, kategori, mulai, durasi, pid, tid, args)
+        self._profiler = None
+        self._profile_started = None
+
+    @contextmanager
+    def span(self, name, cat="app", **args):
+        """Mencatat durasi blok with. Dict args yang di-yield boleh ditambah di dalam blok (mis. jumlah byte)."""
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.add(name, start, time.perf_counter() - start, cat, **args)
+
+    def add(self, name, start, duration, cat="app", pid=None, tid=None, **args):
+        """Mencatat span yang diukur di tempat lain (mis. di proses worker). Aman dipanggil dari thread mana pun."""
+        self._spans.append((name, cat, start, duration, pid or os.getpid(), tid or threading.get_ident(), args))
+
+    def clear(self):
+        self._spans.clear()
+
+    def summary(self):
+        """Ringkasan per nama span: (nama, kategori, jumlah, total s, p50 s, p95 s, maks s), terbesar dulu."""
+        groups = {}
+        for name, cat, _, duration, *_ in list(self._spans):
+            groups.setdefault((name, cat), []).append(duration)
+        rows = []
+        for (name, cat), durations in groups.items():
+            durations.sort()
+            rows.append((name, cat, len(durations), sum(durations), _percentile(durations, 50), _percentile(durations, 95), durations[-1]))
+        return sorted(rows, key=lambda row: row[3], reverse=True)
+
+    def export_chrome(self, path):
+        """Menulis semua span sebagai Chrome trace JSON; mengembalikan jumlah span."""
+        spans = list(self._spans)
+        events = [{"name": name, "cat": cat, "ph": "X", "ts": round(start * 1e6, 1), "dur": round(duration * 1e6, 1),
+                   "pid": pid, "tid": tid, "args": args} for name, cat, start, duration, pid, tid, args in spans]
+        own_pid = os.getpid()
+        for pid in {span[4] for span in spans}:
+            events.append({"name": "process_name", "ph": "M", "pid": pid,
+                           "args": {"name": "PDF Editor Pro" if pid == own_pid else f"Worker {pid}"}})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(spans)
+
+    @property
+    def profiling(self):
+        return self._profiler is not None
+
+    def start_profile(self, memory=True):
+        """Menyalakan cProfile untuk thread pemanggil (thread Tk) dan, bila memory, tracemalloc."""
+        if self._profiler: return
+        if memory and not tracemalloc.is_tracing(): tracemalloc.start(25)
+        self._profiler = cProfile.Profile()
+        self._profile_started = time.strftime("%Y%m%d_%H%M%S")
+        self._profiler.enable()
+
+    def stop_profile(self, directory):
+        """Mematikan profil dan menulis .prof, ringkasan teks dan snapshot memori ke directory; mengembalikan path yang ditulis."""
+        if not self._profiler: return []
+        self._profiler.disable()
+        profiler, self._profiler = self._profiler, None
+        base = os.path.join(directory, f"profil_{self._profile_started}")
+        paths = [base + ".prof", base + ".txt"]
+        profiler.dump_stats(paths[0])
+        with open(paths[1], "w", encoding="utf-8") as f:
+            pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(PROFILE_TOP)
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            paths.append(base + "_memori.txt")
+            with open(paths[2], "w", encoding="utf-8") as f:
+                f.write(f"Alokasi Python saat ini: {current / 1e6:.1f} MB, puncak: {peak / 1e6:.1f} MB\n\n")
+                for stat in snapshot.statistics("lineno")[:PROFILE_TOP]: f.write(f"{stat}\n")
+        return paths
+
+
+tracer = Tracer()
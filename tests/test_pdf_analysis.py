@@ -0,0 +1,46 @@
+import fitz
+import numpy as np
+
+import pdf_analysis
+
+
+def _signatures(doc):
+    return [pdf_analysis.page_signature(page) for page in doc]
+
+
+def _vector_page(doc, seed):
+    page = doc.new_page()
+    rng = np.random.default_rng(seed)
+    for _ in range(12):
+        x, y = rng.uniform(50, 500), rng.uniform(50, 750)
+        page.draw_rect(fitz.Rect(x, y, x + rng.uniform(20, 90), y + rng.uniform(20, 90)), fill=(0, 0, 0))
+    return page
+
+
+def test_document_without_duplicates():
+    doc = fitz.open()
+    for seed in range(6): _vector_page(doc, seed)
+    assert pdf_analysis.find_blank_and_duplicates(_signatures(doc)) == ([], {})
+
+
+def test_blank_and_duplicate_pages():
+    doc = fitz.open()
+    for seed in (1, 2, 1, None, 3, 2):
+        if seed is None: doc.new_page()
+        else: _vector_page(doc, seed)
+    blank, duplicates = pdf_analysis.find_blank_and_duplicates(_signatures(doc))
+    assert blank == [3]
+    assert duplicates == {2: 0, 5: 1}
+
+
+def test_duplicate_pairs_empty_and_missing_signatures():
+    coarse = pdf_analysis._as_words([b"\x00" * 18, b"\xff" * 18])
+    detail = pdf_analysis._as_words([b"\x00" * 128, b"\xff" * 128])
+    a, b = pdf_analysis._duplicate_pairs(coarse, detail, pdf_analysis.DUPLICATE_BITS, pdf_analysis.DETAIL_BITS)
+    assert len(a) == len(b) == 0
+    assert pdf_analysis.find_blank_and_duplicates([None, None]) == ([], {})
+
+
+def test_groups_point_to_first_page():
+    same = (0.1, b"\x0f" * 18, b"\x0f" * 128)
+    assert pdf_analysis.find_blank_and_duplicates([same, same, same])[1] == {1: 0, 2: 0}
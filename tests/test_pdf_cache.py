@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+from pdf_cache import ThumbnailCache, file_fingerprint, thumbnail_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ThumbnailCache(str(tmp_path), max_bytes=10_000)
+    yield cache
+    cache.close()
+
+
+def test_put_get_roundtrip(cache):
+    cache.put("a", 2, 1, b"\x01\x02\x03\x04\x05\x06")
+    assert cache.get("a") == (2, 1, b"\x01\x02\x03\x04\x05\x06")
+    assert cache.get("b") is None
+
+
+def test_evicts_least_recently_used(cache):
+    for key in "abc":
+        cache.put(key, 1, 1, os.urandom(4000))  # Tidak bisa dikompres: 4000 byte per entri
+    assert cache.get("a") is None
+    assert cache.get("b") is not None and cache.get("c") is not None
+
+
+def test_get_refreshes_lru_order(cache):
+    cache.put("a", 1, 1, os.urandom(4000))
+    cache.put("b", 1, 1, os.urandom(4000))
+    cache.get("a")
+    cache.put("c", 1, 1, os.urandom(4000))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+
+def test_index_survives_reopen(tmp_path):
+    cache = ThumbnailCache(str(tmp_path))
+    cache.put("a", 1, 1, b"abc")
+    cache.close()
+    reopened = ThumbnailCache(str(tmp_path))
+    assert reopened.get("a") == (1, 1, b"abc")
+    reopened.close()
+
+
+def test_corrupt_entry_is_a_miss(cache):
+    cache.put("a", 1, 1, b"abc" * 100)
+    cache._pack.seek(0)
+    cache._pack.truncate(0)
+    cache._pack.write(b"x" * 1000)
+    cache._pack.flush()
+    assert cache.get("a") is None
+    assert cache.get("a") is None
+
+
+def test_second_instance_uses_own_pack(tmp_path):
+    first = ThumbnailCache(str(tmp_path))
+    second = ThumbnailCache(str(tmp_path))
+    try:
+        assert first.pack_path != second.pack_path
+    finally:
+        first.close()
+        second.close()
+
+
+def test_fingerprint_and_key(tmp_path):
+    path = tmp_path / "a.bin"
+    path.write_bytes(b"x" * 5000)
+    same = tmp_path / "b.bin"
+    same.write_bytes(b"x" * 5000)
+    assert file_fingerprint(str(path)) == file_fingerprint(str(same))
+    same.write_bytes(b"y" * 5000)
+    assert file_fingerprint(str(path)) != file_fingerprint(str(same))
+    assert thumbnail_key("f", 12, 90, (140, 190)) == "f:12:90:140x190:rgb"
@@ -0,0 +1,32 @@
+import fitz
+
+import pdf_cli
+
+
+def _doc(pages=4):
+    doc = fitz.open()
+    for _ in range(pages): doc.new_page()
+    return doc
+
+
+def test_operations_keep_command_line_order():
+    args = pdf_cli.build_parser().parse_args(["a.pdf", "--delete", "2", "--rotate", "90:1", "--keep", "1-2"])
+    assert args.ops == [("delete", "2"), ("rotate", "90:1"), ("keep", "1-2")]
+
+
+def test_negative_rotation_with_equals_and_positive_equivalent():
+    parser = pdf_cli.build_parser()
+    assert parser.parse_args(["a.pdf", "--rotate=-90:1-3,5"]).ops == [("rotate", "-90:1-3,5")]
+    for value in ("-90:1-3", "270:1-3"):
+        doc = _doc()
+        pdf_cli.apply_operation(doc, "rotate", value, {})
+        assert [page.rotation for page in doc] == [270, 270, 270, 0]
+
+
+def test_delete_and_keep():
+    doc = _doc(6)
+    for i, page in enumerate(doc): page.insert_text((72, 72), f"hal{i}")
+    pdf_cli.apply_operation(doc, "delete", "2,4-5", {})
+    assert [page.get_text().strip() for page in doc] == ["hal0", "hal2", "hal5"]
+    pdf_cli.apply_operation(doc, "keep", "3,1", {})
+    assert [page.get_text().strip() for page in doc] == ["hal5", "hal0"]
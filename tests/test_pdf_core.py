@@ -0,0 +1,39 @@
+import fitz
+import pytest
+
+import pdf_core
+
+
+def test_parse_page_ranges():
+    assert pdf_core.parse_page_ranges("1-3,5", 10) == [0, 1, 2, 4]
+    assert pdf_core.parse_page_ranges(" 8- , -2", 10) == [7, 8, 9, 0, 1]
+    assert pdf_core.parse_page_ranges("", 10) == []
+
+
+@pytest.mark.parametrize("spec", ["0", "11", "5-3", "1-12", "x"])
+def test_parse_page_ranges_rejects_invalid(spec):
+    with pytest.raises(ValueError):
+        pdf_core.parse_page_ranges(spec, 10)
+
+
+def test_split_every():
+    assert pdf_core.split_every(7, 3) == [([0, 1, 2], "001"), ([3, 4, 5], "002"), ([6], "003")]
+
+
+def test_split_by_ranges():
+    assert pdf_core.split_by_ranges(["1-2", "4,6"], 6) == [([0, 1], "001"), ([3, 5], "002")]
+
+
+def test_split_at_bookmarks():
+    doc = fitz.open()
+    for _ in range(6): doc.new_page()
+    doc.set_toc([[1, "Bab 1", 2], [2, "Sub", 3], [1, "Bab 2/Akhir", 5]])
+    assert pdf_core.split_at_bookmarks(doc) == [([0], "001"), ([1, 2, 3], "002_Bab 1"), ([4, 5], "003_Bab 2_Akhir")]
+    assert [indices for indices, _ in pdf_core.split_at_bookmarks(doc, 2)] == [[0], [1], [2, 3], [4, 5]]
+
+
+def test_page_runs_and_chunk_parts():
+    assert pdf_core.page_runs([0, 1, 2, 5, 7, 8]) == [[0, 2], [5, 5], [7, 8]]
+    parts = list(range(10))
+    chunks = pdf_core.chunk_parts(parts, 2, per_worker=2)
+    assert sum(chunks, []) == parts and len(chunks) == 4
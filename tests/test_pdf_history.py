@@ -0,0 +1,90 @@
+import fitz
+import pytest
+
+from pdf_history import History, MovePages, RemovePages, RotatePages
+from pdf_model import PageModel
+
+
+def _texts(doc):
+    return [page.get_text().strip() for page in doc]
+
+
+def _apply(pages, change):
+    """Menerapkan perubahan ke model halaman seperti GUI (_blocks_changed/_pages_moved)."""
+    if change[0] == "removed":
+        for start, count in reversed(change[1]): pages.delete(start, count)
+    elif change[0] == "inserted":
+        for start, sources in change[1]: pages.insert(start, sources)
+    elif change[0] == "moved":
+        pages.move(*change[1:])
+
+
+@pytest.fixture
+def opened(tmp_path):
+    path = str(tmp_path / "sumber.pdf")
+    src = fitz.open()
+    for i in range(6): src.new_page().insert_text((72, 72), f"hal{i}")
+    src.save(path)
+    doc = fitz.open(path)
+    pages = PageModel([(path, i, doc.page_xref(i)) for i in range(len(doc))])
+    yield path, doc, pages, fitz.open(), History()
+    doc.close()
+
+
+def _do(history, op, doc, stash, pages):
+    inverse, change = op.apply(doc, stash, pages)
+    history.record(inverse)
+    _apply(pages, change)
+
+
+def test_remove_undo_redo(opened):
+    path, doc, pages, stash, history = opened
+    _do(history, RemovePages([1, 2, 4]), doc, stash, pages)
+    assert _texts(doc) == ["hal0", "hal3", "hal5"]
+    _apply(pages, history.undo(doc, stash, pages))
+    assert _texts(doc) == [f"hal{i}" for i in range(6)]
+    assert [pages.source(i)[1] for i in range(6)] == list(range(6))
+    _apply(pages, history.redo(doc, stash, pages))
+    assert _texts(doc) == ["hal0", "hal3", "hal5"]
+
+
+def test_rotate_and_move_are_inverted(opened):
+    path, doc, pages, stash, history = opened
+    _do(history, RotatePages([0, 2], 90), doc, stash, pages)
+    _do(history, MovePages(0, 2, 3), doc, stash, pages)
+    assert _texts(doc) == ["hal2", "hal3", "hal4", "hal0", "hal1", "hal5"]
+    _apply(pages, history.undo(doc, stash, pages))
+    _apply(pages, history.undo(doc, stash, pages))
+    assert _texts(doc) == [f"hal{i}" for i in range(6)]
+    assert [page.rotation for page in doc] == [0] * 6
+
+
+def test_memory_pages_are_restored_from_stash(opened):
+    path, doc, pages, stash, history = opened
+    doc.new_page().insert_text((72, 72), "memori")
+    pages.insert(6, [None])
+    _do(history, RemovePages([5, 6]), doc, stash, pages)
+    _apply(pages, history.undo(doc, stash, pages))
+    assert _texts(doc)[5:] == ["hal5", "memori"]
+    assert pages.source(6) is None
+
+
+def test_changed_source_file_fails_without_losing_the_entry(opened):
+    path, doc, pages, stash, history = opened
+    _do(history, RemovePages([0]), doc, stash, pages)
+    doc.save(path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+    with pytest.raises(ValueError):
+        history.undo(doc, stash, pages)
+    assert history.can_undo()
+
+
+def test_undo_after_quick_save_uses_detached_copies(opened):
+    path, doc, pages, stash, history = opened
+    doc[3].set_rotation(90)
+    _do(history, RemovePages([1, 3]), doc, stash, pages)
+    history.detach_file(path, stash)
+    doc.save(path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+    _apply(pages, history.undo(doc, stash, pages))
+    assert _texts(doc) == [f"hal{i}" for i in range(6)]
+    assert doc[3].rotation == 90
+    assert pages.source(1) is None and pages.source(0) is not None
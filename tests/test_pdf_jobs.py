@@ -0,0 +1,73 @@
+import time
+import threading
+
+from pdf_jobs import JobScheduler
+
+
+class FakeRoot:
+    """Pengganti Tk root: callback after() dijalankan oleh run() di thread tes."""
+
+    def __init__(self):
+        self.calls = []
+
+    def after(self, ms, fn, *args):
+        self.calls.append((fn, args))
+
+    def run(self, until, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not until() and time.monotonic() < deadline:
+            if self.calls:
+                fn, args = self.calls.pop(0)
+                fn(*args)
+            else:
+                time.sleep(0.001)
+        assert until()
+
+
+def test_thread_job_result_reaches_callback():
+    root = FakeRoot()
+    jobs = JobScheduler(root)
+    results = []
+    jobs.submit(lambda job, x: x * 2, 21, on_done=results.append)
+    root.run(lambda: results)
+    assert results == [42]
+
+
+def test_document_jobs_run_one_at_a_time_under_lock():
+    root = FakeRoot()
+    jobs = JobScheduler(root)
+    running, overlaps, done = [0], [], []
+
+    def work(job):
+        assert jobs.document_lock._is_owned()
+        running[0] += 1
+        overlaps.append(running[0])
+        time.sleep(0.005)
+        running[0] -= 1
+
+    for _ in range(8): jobs.submit(work, document=True, on_done=done.append)
+    root.run(lambda: len(done) == 8)
+    assert max(overlaps) == 1
+
+
+def test_document_job_waits_for_tk_side_mutation():
+    root = FakeRoot()
+    jobs = JobScheduler(root)
+    done = []
+    with jobs.document_lock:
+        jobs.submit(lambda job: "render", document=True, on_done=done.append)
+        time.sleep(0.05)
+        assert not done and jobs._events.empty()
+    root.run(lambda: done)
+
+
+def test_new_generation_cancels_queued_jobs():
+    root = FakeRoot()
+    jobs = JobScheduler(root)
+    done, started = [], threading.Event()
+    with jobs.document_lock:
+        jobs.submit(lambda job: started.set(), document=True, on_done=done.append)
+        jobs.new_generation()
+    jobs.submit(lambda job: "baru", document=True, on_done=done.append)
+    root.run(lambda: done)
+    assert done == ["baru"] and not started.is_set()
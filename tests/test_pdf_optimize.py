@@ -0,0 +1,71 @@
+import io
+
+import fitz
+import numpy as np
+from PIL import Image
+
+import pdf_cli
+import pdf_optimize
+
+
+def _photo(seed, size=1200):
+    """JPEG berkualitas tinggi yang jauh lebih besar dari ukuran tampilnya."""
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 255, (12, 12, 3), dtype=np.uint8)
+    image = Image.fromarray(base).resize((size, size), Image.BICUBIC)
+    out = io.BytesIO()
+    image.save(out, "JPEG", quality=98)
+    return out.getvalue()
+
+
+def _image_doc(images):
+    doc = fitz.open()
+    for data in images:
+        doc.new_page().insert_image(fitz.Rect(72, 72, 216, 216), stream=data)
+    return doc
+
+
+def _image_xrefs(doc):
+    return sorted({image[0] for page in doc for image in page.get_images(full=True)})
+
+
+def test_large_image_is_downsampled(tmp_path):
+    doc = _image_doc([_photo(1)])
+    out = str(tmp_path / "kecil.pdf")
+    stats = pdf_optimize.optimize_document(doc, out, dpi=150)
+    assert stats["recompressed"] == 1 and stats["saved"] > 0
+    with fitz.open(out) as result:
+        width = result.extract_image(_image_xrefs(result)[0])["width"]
+    assert width <= 2 * 150 * 1.25  # 2 inci pada 150 DPI, ditambah margin
+
+
+def test_identical_images_from_different_streams_are_merged(tmp_path):
+    data = _photo(2, 300)
+    doc = fitz.open()
+    for _ in range(2):
+        part = _image_doc([data])  # Dua dokumen: gambar yang sama menjadi dua objek terpisah
+        doc.insert_pdf(part)
+    assert len(_image_xrefs(doc)) == 2
+    out = str(tmp_path / "gabung.pdf")
+    stats = pdf_optimize.optimize_document(doc, out, dpi=None)
+    assert stats["duplicates"] == 1
+    with fitz.open(out) as result:
+        assert len(_image_xrefs(result)) == 1
+        assert [len(page.get_images()) for page in result] == [1, 1]
+
+
+def test_image_tasks_chunks_sorted_items():
+    sizes = {5: (1, 1), 2: (3, 3), 9: (2, 2)}
+    assert pdf_optimize.image_tasks(sizes, chunk=2) == [[(2, (3, 3)), (5, (1, 1))], [(9, (2, 2))]]
+
+
+def test_split_with_optimize_recompresses_parts(tmp_path):
+    src = str(tmp_path / "scan.pdf")
+    _image_doc([_photo(3), _photo(4)]).save(src)
+    args = [src, "--split-every", "1", "--optimize", "-o", str(tmp_path / "hasil"), "-j", "1"]
+    assert pdf_cli.main(args) == 0
+    parts = sorted((tmp_path / "hasil").iterdir())
+    assert len(parts) == 2
+    for part in parts:
+        with fitz.open(str(part)) as doc:
+            assert doc.extract_image(_image_xrefs(doc)[0])["width"] < 1200
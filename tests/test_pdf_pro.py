@@ -0,0 +1,149 @@
+import itertools
+import time
+from types import SimpleNamespace
+
+import fitz
+import pytest
+
+import pdf_analysis
+import pdf_pro
+from pdf_jobs import JobScheduler
+from pdf_model import PageModel
+from pdf_render import ThumbnailEngine
+from pdf_pro import DRAFT, FULL
+
+
+class FakeScheduler:
+    """Scheduler tanpa worker: tugas ThumbnailEngine tetap di antrean sampai tes mengirim hasilnya."""
+    process_workers = 0
+    processes_ready = True
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted.append((fn, args, kwargs))
+        return SimpleNamespace(cancel=lambda: None)
+
+
+@pytest.fixture
+def app():
+    """PDFEditorApp tanpa jendela Tk, cukup untuk jalur permintaan thumbnail."""
+    doc = fitz.open()
+    for _ in range(2): doc.new_page()
+    app = pdf_pro.PDFEditorApp.__new__(pdf_pro.PDFEditorApp)
+    app.__dict__.update(pdf_document=doc, pages=PageModel([("a.pdf", i, doc.page_xref(i)) for i in range(2)]),
+                        jobs=FakeScheduler(), thumb_cache=None, thumbnails={}, _render_pending={}, _render_tokens=itertools.count(1),
+                        _memory_jobs={}, _initial_pages=set(), _bound_slots={}, _startup=None, _preview_status_dirty=False,
+                        zoom_var=SimpleNamespace(get=lambda: pdf_pro.DEFAULT_ZOOM))
+    app.render_engine = ThumbnailEngine(app.jobs, app._on_thumbnail_rendered)
+    app._store_thumbnail = lambda uid, level, thumb: app.thumbnails.__setitem__(uid, (level, None, thumb, False))
+    app._refresh_visible_previews = lambda: app._request_thumbnails([(0, 0)])
+    return app
+
+
+def test_rotate_while_render_outstanding_rejects_old_result(app):
+    app._request_thumbnails([(0, 0)])
+    old = {request[1]: request for request in app.render_engine._queued}
+    assert set(old) == {DRAFT, FULL}
+    app.pdf_document[0].set_rotation(90)
+    app._thumbnails_rotated([0], 90)
+    new = {request[1]: request for request in app.render_engine._queued}
+    assert set(new) == {DRAFT, FULL} and not set(old.values()) & set(new.values())
+    # Hasil render sebelum diputar tiba belakangan (sudah di worker saat diputar) dan harus ditolak.
+    app.render_engine.on_result(old[FULL], (1, 1, b"lama"))
+    assert app.thumbnails == {}
+    app.render_engine.on_result(new[FULL], (1, 1, b"baru"))
+    assert app.thumbnails[app.pages.uid(0)][2] == (1, 1, b"baru")
+    assert (app.pages.uid(0), FULL) not in app._render_pending
+
+
+def test_rotate_while_cache_read_outstanding_rejects_old_read(app):
+    app.thumb_cache, app._fingerprints = object(), {"a.pdf": "sidik"}
+    app._request_thumbnails([(0, 0)])
+    (_, _, old), = app.jobs.submitted
+    app.pdf_document[0].set_rotation(90)
+    app._thumbnails_rotated([0], 90)
+    assert len(app.jobs.submitted) == 2
+    # Hasil baca cache untuk rotasi lama tiba belakangan: miss tidak boleh melepas permintaan baru,
+    # hit tidak boleh disimpan.
+    pending = dict(app._render_pending)
+    old["on_done"](None)
+    assert app._render_pending == pending and not app.render_engine._queued
+    old["on_done"]((1, 1, b"lama"))
+    assert app.thumbnails == {}
+    app.jobs.submitted[-1][2]["on_done"](None)
+    assert {request[1] for request in app.render_engine._queued} == {DRAFT, FULL}
+
+
+@pytest.mark.parametrize("whole_document", [True, False])
+def test_save_over_source_file_repoints_or_detaches_pages(app, whole_document):
+    app.pages.set_sources([("a.pdf", 0, 10), ("b.pdf", 0, 20)])
+    app._fingerprints, app._search, app._update_text_index = {"a.pdf": "sidik", "b.pdf": "lain"}, object(), lambda: None
+    app._refresh_visible_previews = lambda: app._request_thumbnails([(0, 0), (1, 0)])
+    app._request_thumbnails([(0, 0), (1, 0)])
+    before = set(app.render_engine._queued)
+    app._sources_overwritten("b.pdf", whole_document)
+    assert app.pages.source(0) == ("a.pdf", 0, 10)
+    assert app.pages.source(1) == (("b.pdf", 1, None) if whole_document else None)
+    assert app._fingerprints == {"a.pdf": "sidik"} and app._search is None
+    # Render yang masih membaca isi lama b.pdf dibatalkan lalu diminta ulang dari sumber barunya.
+    page1 = {request: tuple(entry[3:5]) for request, entry in app.render_engine._queued.items() if request[0] == app.pages.uid(1)}
+    assert not set(page1) & before
+    assert list(page1.values()) == ([("b.pdf", 1)] * 2 if whole_document else [])
+    assert {key[0] for key in app._memory_jobs} == (set() if whole_document else {app.pages.uid(1)})
+
+
+def test_memory_analysis_runs_in_chained_chunks(app):
+    state, analyzed = {'remaining': 0}, []
+    app._on_pages_analyzed = lambda s, indices, results, error=None: (s.__setitem__('remaining', s['remaining'] - 1), analyzed.append(indices))
+    indices = list(range(pdf_analysis.MEMORY_CHUNK_PAGES * 2 + 3))
+    app._submit_memory_analysis(state, indices)
+    while len(app.jobs.submitted) > len(analyzed):
+        _, args, kwargs = app.jobs.submitted[len(analyzed)]
+        assert kwargs['document'] and len(args[1]) <= pdf_analysis.MEMORY_CHUNK_PAGES
+        assert len(app.jobs.submitted) == len(analyzed) + 1  # Potongan berikutnya menunggu hasil potongan ini
+        kwargs['on_done']([None] * len(args[1]))
+        assert state['remaining'] == (len(app.jobs.submitted) > len(analyzed))
+    assert [i for chunk in analyzed for i in chunk] == indices and len(analyzed) == 3
+
+
+def test_merge_inserts_on_document_thread_and_defers_refresh(app, tmp_path, monkeypatch):
+    paths = []
+    for name, count in (("x.pdf", 3), ("y.pdf", 2)):
+        with fitz.open() as src:
+            for i in range(count): src.new_page().insert_text((50, 50), f"{name} {i}")
+            src.save(tmp_path / name)
+        paths.append(str(tmp_path / name))
+    calls = []
+    root = SimpleNamespace(after=lambda ms, fn, *args: calls.append((fn, args)))
+    refreshed, changed = [], []
+    monkeypatch.setattr(pdf_pro.messagebox, "showinfo", lambda *args, **kwargs: None)
+    app.__dict__.update(root=root, jobs=JobScheduler(root), task_progress=SimpleNamespace(config=lambda **kwargs: None),
+                        _merge={'paths': paths, 'start': 1, 'file': 0, 'src': None, 'page': 0, 'position': 1, 'chunk': 1, 'added': 0, 'failed': [], 'busy': False})
+    for name in ("update_info_label", "_record_edit", "_hide_task_progress", "_set_editing_enabled", "_update_text_index"):
+        setattr(app, name, lambda *args, **kwargs: None)
+    app._pages_changed = lambda start, inserted, sources: (app.pages.insert(start, sources), changed.append(inserted))
+    app._refresh_visible_previews = lambda rebind=False: refreshed.append(rebind)
+    app._merge_step()
+    assert app._merge['busy']
+    pdf_pro.PDFEditorApp._refresh_visible_previews(app, rebind=True)  # Mis. zoom diganti selagi putaran berjalan
+    assert app._merge['refresh'] and not refreshed
+    deadline = time.monotonic() + 10
+    while app._merge is not None and time.monotonic() < deadline:
+        if calls:
+            fn, args = calls.pop(0)
+            fn(*args)
+        else: time.sleep(0.001)
+    assert app._merge is None and sum(changed) == 5
+    assert len(app.pdf_document) == len(app.pages) == 7
+    assert [app.pages.source(i)[0] for i in range(1, 6)] == [paths[0]] * 3 + [paths[1]] * 2
+    assert app.pdf_document[3].get_text().strip() == "x.pdf 2"
+
+
+def test_engine_cancel_drops_queued_task():
+    engine = ThumbnailEngine(FakeScheduler(), lambda key, thumb: None)
+    engine.submit("a", "a.pdf", 0, 0)
+    engine.submit("b", "a.pdf", 1, 0)
+    engine.cancel(["a", "x"])
+    assert list(engine._queued) == ["b"]
@@ -0,0 +1,37 @@
+import fitz
+
+import pdf_stream
+
+
+def test_read_ahead_range():
+    assert pdf_stream.read_ahead_range(range(10, 16), True, 4, 100) == range(16, 20)
+    assert pdf_stream.read_ahead_range(range(10, 16), False, 4, 100) == range(6, 10)
+    assert pdf_stream.read_ahead_range(range(96, 100), True, 4, 100) == range(100, 100)
+    assert pdf_stream.read_ahead_range(range(2, 8), False, 4, 100) == range(0, 2)
+    assert len(pdf_stream.read_ahead_range(range(2, 8), True, 0, 100)) == 0
+
+
+def test_page_sources():
+    doc = fitz.open()
+    for _ in range(3): doc.new_page()
+    assert pdf_stream.page_sources(doc, "a.pdf", streaming=True) == [("a.pdf", i, None) for i in range(3)]
+    assert [xref for _, _, xref in pdf_stream.page_sources(doc, "a.pdf")] == [doc.page_xref(i) for i in range(3)]
+
+
+def test_should_stream_by_size(tmp_path, monkeypatch):
+    path = tmp_path / "besar.pdf"
+    path.write_bytes(b"x" * (2 * 1024 * 1024))
+    monkeypatch.setenv("PDF_EDITOR_STREAM_MB", "1")
+    assert pdf_stream.should_stream(str(path))
+    monkeypatch.setenv("PDF_EDITOR_STREAM_MB", "3")
+    assert pdf_stream.should_stream(str(path)) == pdf_stream.is_network_path(str(path))
+    assert not pdf_stream.should_stream(str(tmp_path / "tidak_ada.pdf"))
+
+
+def test_network_paths_and_settings(monkeypatch):
+    assert pdf_stream.is_network_path("\\\\server\\arsip\\a.pdf")
+    assert pdf_stream.is_network_path("//server/arsip/a.pdf")
+    monkeypatch.setenv("PDF_EDITOR_READ_AHEAD", "bukan angka")
+    assert pdf_stream.read_ahead_pages() == pdf_stream.DEFAULT_READ_AHEAD
+    monkeypatch.setenv("PDF_EDITOR_READ_AHEAD", "-3")
+    assert pdf_stream.read_ahead_pages() == 0